@@ -5,18 +5,43 @@ This package provides tools for registering and verifying intellectual property
 on the Ethereum blockchain.
 """
 
-from .core import ProveIt
-from .hash import hash_file, hash_content
-from .models import RegistrationResult, VerificationResult, NetworkType
-from .certificate import generate_certificate
+import importlib
 
 __version__ = "0.1.0"
 __all__ = [
     "ProveIt",
     "hash_file",
     "hash_content",
+    "Hash32",
     "RegistrationResult",
     "VerificationResult",
     "NetworkType",
     "generate_certificate",
 ]
+
+# The public names are imported on first use, so that the daemon client can
+# forward a command without importing web3 and reportlab
+_LAZY_ATTRIBUTES = {
+    "ProveIt": ".core",
+    "hash_file": ".hash",
+    "hash_content": ".hash",
+    "Hash32": ".hash",
+    "RegistrationResult": ".models",
+    "VerificationResult": ".models",
+    "NetworkType": ".models",
+    "generate_certificate": ".certificate",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,89 @@
+"""
+Admission control for the ProveIt package.
+
+This module bounds the number of concurrent calls to an RPC endpoint. When the
+endpoint slows down, callers beyond the concurrency limit wait in a short
+queue, and callers beyond the queue limit are rejected immediately instead of
+piling up.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class RPCOverloadedError(Exception):
+    """Raised when an RPC call is rejected because too many calls are in flight."""
+    
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    """
+    Concurrency limit with a bounded wait queue.
+    """
+    
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        max_queue: int = 32,
+        queue_timeout: float = 2.0,
+        retry_after: int = 5
+    ):
+        """
+        Initialize the admission gate.
+        
+        Args:
+            max_concurrent: Maximum number of calls in flight (default: 8)
+            max_queue: Maximum number of calls waiting for a slot (default: 32)
+            queue_timeout: Maximum number of seconds a call waits for a slot (default: 2)
+            retry_after: Seconds clients are told to wait after a rejection (default: 5)
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._waiting = 0
+    
+    @contextmanager
+    def admit(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        Hold a slot for the duration of the block.
+        
+        Args:
+            timeout: Maximum number of seconds to wait for a slot (default: queue_timeout)
+        
+        Raises:
+            RPCOverloadedError: If the queue is full or no slot frees up in time
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self._waiting >= self.max_queue:
+                    raise RPCOverloadedError("Too many pending RPC calls", self.retry_after)
+                self._waiting += 1
+            
+            wait = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+            
+            try:
+                acquired = self._slots.acquire(timeout=max(wait, 0))
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+            
+            if not acquired:
+                raise RPCOverloadedError("Timed out waiting for an RPC slot", self.retry_after)
+        
+        try:
+            yield
+        finally:
+            self._slots.release()
+    
+    @property
+    def waiting(self) -> int:
+        """Number of calls currently waiting for a slot."""
+        with self._lock:
+            return self._waiting
@@ -0,0 +1,194 @@
+"""
+Incremental archive audits for the ProveIt package.
+
+An audit proves that an archive still matches what was registered. The audit
+manifest remembers the size, modification time, hash and registration of
+every file, so a later audit only rehashes the files whose stat changed and
+only looks up the hashes that were not registered yet: registrations on the
+ProveIt contract can never be removed, so a confirmed one stays confirmed.
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .hash import expand_paths, hash_files
+from .models import AuditReport
+
+# Version of the manifest file format
+MANIFEST_VERSION = 1
+
+
+class AuditManifest:
+    """
+    Per-file state of an audited archive, stored as a JSON document.
+    """
+    
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open a manifest, loading it if it exists.
+        
+        Args:
+            path: Path of the manifest file
+        
+        Raises:
+            ValueError: If the file is not an audit manifest
+        """
+        self.path = Path(path)
+        self.network: Optional[str] = None
+        self.roots: List[str] = []
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.audited_at: Optional[str] = None
+        
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+                raise ValueError(f"Not a ProveIt audit manifest: {self.path}")
+            
+            self.network = data.get("network")
+            self.roots = data.get("roots", [])
+            self.entries = data.get("entries", {})
+            self.audited_at = data.get("audited_at")
+    
+    def save(self) -> None:
+        """Write the manifest, replacing the previous version atomically."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "network": self.network,
+            "roots": self.roots,
+            "audited_at": self.audited_at,
+            "entries": self.entries
+        }
+        
+        directory = self.path.parent
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=str(directory), prefix=self.path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def audit(
+    prover,
+    manifest: AuditManifest,
+    inputs: Iterable[str] = (),
+    workers: Optional[int] = None,
+    batch_size: int = 100,
+    rehash: bool = False,
+    recheck: bool = False
+) -> AuditReport:
+    """
+    Audit an archive against its manifest, then update the manifest.
+    
+    Files whose size and modification time match the manifest keep their
+    recorded hash, and files whose registration is recorded are not looked
+    up again. The report lists the differences with the previous audit,
+    plus every file that is still not registered.
+    
+    Args:
+        prover: ProveIt instance used to look up the registrations
+        manifest: Manifest of the previous audit; updated and saved in place
+        inputs: Files, directories or glob patterns to audit (default: those of the previous audit)
+        workers: Number of hashing threads (default: number of CPUs)
+        batch_size: Number of hashes looked up per bulk query (default: 100)
+        rehash: Rehash every file, even those whose stat did not change
+        recheck: Look up every registration, even those already confirmed
+    
+    Returns:
+        AuditReport listing the differences
+    
+    Raises:
+        ValueError: If no inputs are given and the manifest has none recorded
+    """
+    roots = [os.path.abspath(entry) for entry in inputs] or manifest.roots
+    if not roots:
+        raise ValueError("Nothing to audit: give the files to audit on the first run")
+    
+    network = prover.blockchain.network.value
+    if manifest.network != network:
+        # Registrations recorded on another network say nothing about this one
+        recheck = True
+    
+    report = AuditReport()
+    previous = manifest.entries
+    current: Dict[str, Dict[str, Any]] = {}
+    to_hash = []
+    
+    for path in expand_paths(roots):
+        key = str(path)
+        stat = path.stat()
+        entry = previous.get(key)
+        report.files += 1
+        
+        if not rehash and entry is not None and (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+            current[key] = dict(entry)
+            report.unchanged += 1
+        else:
+            # Stat before hashing, so a file written to meanwhile is rehashed next time
+            current[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": None, "registration": None}
+            to_hash.append(path)
+    
+    for path, file_hash in hash_files(to_hash, workers):
+        key = str(path)
+        entry = current[key]
+        entry["hash"] = file_hash
+        report.rehashed += 1
+        
+        old = previous.get(key)
+        if old is None:
+            report.added.append(key)
+        elif old["hash"] != file_hash:
+            report.modified.append(key)
+        else:
+            entry["registration"] = old["registration"]
+    
+    report.missing = sorted(key for key in previous if key not in current)
+    
+    pending = [key for key, entry in current.items() if recheck or entry["registration"] is None]
+    registrations = _look_up(prover, {current[key]["hash"] for key in pending}, batch_size)
+    report.queried = len(registrations)
+    
+    for key in pending:
+        entry = current[key]
+        registration = registrations[entry["hash"]]
+        if registration is None:
+            report.unregistered.append(key)
+        elif entry["registration"] is None and key in previous:
+            report.newly_registered.append(key)
+        entry["registration"] = registration
+    
+    manifest.network = network
+    manifest.roots = roots
+    manifest.entries = current
+    manifest.audited_at = datetime.now().isoformat()
+    manifest.save()
+    
+    return report
+
+
+def _look_up(prover, file_hashes: Iterable[str], batch_size: int) -> Dict[str, Optional[Dict[str, Any]]]:
+    registrations: Dict[str, Optional[Dict[str, Any]]] = {}
+    hashes = iter(sorted(file_hashes))
+    
+    while True:
+        batch = list(islice(hashes, batch_size))
+        if not batch:
+            return registrations
+        
+        for file_hash, result in zip(batch, prover.verify_hashes(batch)):
+            registrations[file_hash] = {
+                "owner": result.owner,
+                "timestamp": result.timestamp.isoformat() if result.timestamp else None,
+                "metadata": result.metadata
+            } if result.is_registered else None
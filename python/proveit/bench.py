@@ -0,0 +1,413 @@
+"""
+Benchmarks for the ProveIt package.
+
+This module measures the performance of ProveIt on the current host: hashing
+throughput, RPC round trips, certificate rendering and web endpoint latency.
+Results are plain dictionaries that serialize to JSON, so they can be stored
+and compared across releases.
+"""
+
+import os
+import platform
+import secrets
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from . import __version__
+from .hash import hash_content, hash_file
+
+# Version of the layout of the benchmark report
+BENCH_SCHEMA_VERSION = 1
+
+# Sections run by default; "register" sends real transactions and must be asked for
+BENCH_SECTIONS = ("hash", "rpc", "certificates", "web")
+
+DEFAULT_FILE_SIZES = (64 * 1024, 1024 * 1024, 64 * 1024 * 1024)
+DEFAULT_CHUNK_SIZES = (8 * 1024, 64 * 1024, 1024 * 1024)
+DEFAULT_CONTENT_SIZES = (32, 1024, 64 * 1024)
+
+
+def run_benchmarks(
+    sections: Iterable[str] = BENCH_SECTIONS,
+    prover=None,
+    network: Optional[str] = None,
+    duration: float = 1.0,
+    samples: int = 20,
+    file_sizes: Iterable[int] = DEFAULT_FILE_SIZES,
+    chunk_sizes: Iterable[int] = DEFAULT_CHUNK_SIZES,
+    progress: Callable[[str], None] = lambda section: None
+) -> Dict[str, Any]:
+    """
+    Run a set of benchmarks.
+    
+    Args:
+        sections: Benchmarks to run, among "hash", "rpc", "register", "certificates"
+            and "web" (default: all but "register")
+        prover: ProveIt instance used by the "rpc" and "register" benchmarks
+        network: Network the web benchmark verifies hashes on (default: no verification)
+        duration: Seconds spent measuring each throughput (default: 1)
+        samples: Number of requests timed for each latency (default: 20)
+        file_sizes: File sizes hashed by the "hash" benchmark, in bytes
+        chunk_sizes: Chunk sizes hashed with by the "hash" benchmark, in bytes
+        progress: Called with the name of each section before it runs
+    
+    Returns:
+        Report with the host description and one entry per section
+    
+    Raises:
+        ValueError: If a section is unknown, or an RPC section is requested without a prover
+    """
+    sections = list(sections)
+    unknown = set(sections) - set(BENCH_SECTIONS) - {"register"}
+    if unknown:
+        raise ValueError(f"Unknown benchmark sections: {', '.join(sorted(unknown))}")
+    
+    if prover is None and ("rpc" in sections or "register" in sections):
+        raise ValueError("The rpc and register benchmarks need a ProveIt instance")
+    
+    report: Dict[str, Any] = {
+        "schema": BENCH_SCHEMA_VERSION,
+        "proveit_version": __version__,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "cpu_count": os.cpu_count()
+        },
+        "results": {}
+    }
+    results = report["results"]
+    
+    for section in sections:
+        progress(section)
+        if section == "hash":
+            results["hash_file"] = bench_hash_file(file_sizes, chunk_sizes, duration)
+            results["hash_content"] = bench_hash_content(DEFAULT_CONTENT_SIZES, duration)
+        elif section == "rpc":
+            results["rpc"] = bench_rpc(prover, samples)
+        elif section == "register":
+            results["register"] = bench_register(prover, max(1, samples // 10))
+        elif section == "certificates":
+            results["certificates"] = bench_certificates(duration)
+        elif section == "web":
+            results["web"] = bench_web(samples, network)
+    
+    return report
+
+
+def bench_hash_file(file_sizes: Iterable[int], chunk_sizes: Iterable[int], duration: float = 1.0) -> List[Dict[str, Any]]:
+    """
+    Measure the throughput of hash_file.
+    
+    Files are written to a temporary directory and read back from the page
+    cache, so the figures measure hashing rather than the disk.
+    
+    Args:
+        file_sizes: File sizes to hash, in bytes
+        chunk_sizes: Chunk sizes to read the files with, in bytes
+        duration: Seconds spent on each combination (default: 1)
+    
+    Returns:
+        One entry per file and chunk size, with the throughput in MB/s
+    """
+    results = []
+    
+    with tempfile.TemporaryDirectory(prefix="proveit-bench-") as directory:
+        for file_size in file_sizes:
+            path = os.path.join(directory, f"{file_size}.bin")
+            with open(path, "wb") as f:
+                remaining = file_size
+                while remaining:
+                    block = os.urandom(min(remaining, 1024 * 1024))
+                    f.write(block)
+                    remaining -= len(block)
+            
+            for chunk_size in chunk_sizes:
+                runs, elapsed = _repeat(lambda: hash_file(path, chunk_size), duration)
+                results.append({
+                    "file_size": file_size,
+                    "chunk_size": chunk_size,
+                    "runs": runs,
+                    "mb_per_s": round(file_size * runs / elapsed / 1e6, 1)
+                })
+    
+    return results
+
+
+def bench_hash_content(sizes: Iterable[int], duration: float = 1.0) -> List[Dict[str, Any]]:
+    """
+    Measure the rate of hash_content calls.
+    
+    Args:
+        sizes: Content sizes to hash, in bytes
+        duration: Seconds spent on each size (default: 1)
+    
+    Returns:
+        One entry per size, with the number of calls per second
+    """
+    results = []
+    
+    for size in sizes:
+        content = os.urandom(size)
+        runs, elapsed = _repeat(lambda: hash_content(content), duration)
+        results.append({"size": size, "runs": runs, "ops_per_s": round(runs / elapsed)})
+    
+    return results
+
+
+def bench_rpc(prover, samples: int = 20) -> Dict[str, Any]:
+    """
+    Measure RPC round trips against the prover's node.
+    
+    Random hashes are looked up so that no cache answers for the node.
+    
+    Args:
+        prover: ProveIt instance connected to the node
+        samples: Number of lookups to time (default: 20)
+    
+    Returns:
+        Latency of a single verification, and of a bulk verification of 100 hashes
+    """
+    connector = prover.blockchain
+    
+    single = _time_calls(lambda: connector.verify(_random_hash()), samples)
+    bulk = _time_calls(lambda: connector.verify_many([_random_hash() for _ in range(100)]), max(1, samples // 4))
+    
+    return {
+        "network": _network_name(prover),
+        "verify": _latency_stats(single),
+        "verify_many_100": _latency_stats(bulk)
+    }
+
+
+def bench_register(prover, samples: int = 2) -> Dict[str, Any]:
+    """
+    Measure registrations against the prover's node.
+    
+    Each sample registers a new random hash, so this spends gas: run it
+    against a local or test network.
+    
+    Args:
+        prover: ProveIt instance with a signing account
+        samples: Number of registrations to time (default: 2)
+    
+    Returns:
+        Latency of signing, sending and confirming a registration
+    """
+    connector = prover.blockchain
+    timings: Dict[str, List[float]] = {"sign": [], "send": [], "confirm": [], "total": []}
+    
+    for _ in range(samples):
+        start = time.perf_counter()
+        signed_tx = connector.sign_registration(_random_hash(), "proveit bench")
+        signed = time.perf_counter()
+        tx_hash = connector.send_registration(signed_tx)
+        sent = time.perf_counter()
+        connector.wait_for_registration(tx_hash)
+        confirmed = time.perf_counter()
+        
+        timings["sign"].append(signed - start)
+        timings["send"].append(sent - signed)
+        timings["confirm"].append(confirmed - sent)
+        timings["total"].append(confirmed - start)
+    
+    result: Dict[str, Any] = {"network": _network_name(prover)}
+    result.update((step, _latency_stats(values)) for step, values in timings.items())
+    return result
+
+
+def bench_certificates(duration: float = 1.0) -> Dict[str, Any]:
+    """
+    Measure the certificate rendering rate.
+    
+    Args:
+        duration: Seconds spent on each format (default: 1)
+    
+    Returns:
+        Renders per second for each available format, plus PDF renders per
+        second when the layout is rebuilt for each certificate
+    """
+    from .certificate import REPORTLAB_AVAILABLE, _layouts, render_certificate
+    from .models import Certificate, NetworkType
+    
+    certificate = Certificate(
+        hash=_random_hash(),
+        owner="0x" + "11" * 20,
+        timestamp=datetime(2024, 1, 1, 12, 0, 0),
+        tx_hash=_random_hash(),
+        network=NetworkType.POLYGON,
+        metadata="proveit bench",
+        file_name="bench.pdf"
+    )
+    
+    results: Dict[str, Optional[Dict[str, Any]]] = {}
+    for format_type in ("pdf", "json"):
+        if format_type == "pdf" and not REPORTLAB_AVAILABLE:
+            results[format_type] = None
+            continue
+        
+        runs, elapsed = _repeat(lambda: render_certificate(certificate, format_type), duration)
+        results[format_type] = {"runs": runs, "renders_per_s": round(runs / elapsed, 1)}
+    
+    if REPORTLAB_AVAILABLE:
+        # Rebuilding the layout for every render shows what reusing it saves
+        def render_with_fresh_layout():
+            _layouts.layout = None
+            render_certificate(certificate, "pdf")
+        
+        runs, elapsed = _repeat(render_with_fresh_layout, duration)
+        results["pdf_fresh_layout"] = {"runs": runs, "renders_per_s": round(runs / elapsed, 1)}
+    else:
+        results["pdf_fresh_layout"] = None
+    
+    return results
+
+
+def bench_web(samples: int = 20, network: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Measure web endpoint latency with an in-process client.
+    
+    The figures cover the application itself, not the HTTP server in front of it.
+    
+    Args:
+        samples: Number of requests timed per endpoint (default: 20)
+        network: Network to verify random hashes on (default: skip /api/verify)
+    
+    Returns:
+        Latency of each endpoint
+    """
+    import io
+    from .web import create_app
+    
+    app = create_app({"TESTING": True})
+    client = app.test_client()
+    upload = os.urandom(64 * 1024)
+    
+    requests = {
+        "GET /": lambda: client.get("/"),
+        "GET /api/networks": lambda: client.get("/api/networks"),
+        "POST /api/hash (64 KiB)": lambda: client.post(
+            "/api/hash",
+            data={"file": (io.BytesIO(upload), "bench.bin")},
+            content_type="multipart/form-data"
+        ),
+    }
+    if network:
+        requests["GET /api/verify/<hash>"] = lambda: client.get(
+            f"/api/verify/{_random_hash()}", query_string={"network": network}
+        )
+    
+    results = {}
+    for name, send in requests.items():
+        send()  # Warm up templates, assets and connectors
+        results[name] = _latency_stats(_time_calls(send, samples))
+    
+    return results
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Format a benchmark report as human-readable text.
+    
+    Args:
+        report: Report returned by run_benchmarks
+    
+    Returns:
+        Multi-line summary of the report
+    """
+    host = report["host"]
+    lines = [
+        f"ProveIt {report['proveit_version']} on {host['platform']}, "
+        f"Python {host['python']}, {host['cpu_count']} CPUs"
+    ]
+    results = report["results"]
+    
+    if "hash_file" in results:
+        lines.append("hash_file:")
+        for entry in results["hash_file"]:
+            lines.append(
+                f"  {_size(entry['file_size']):>8} file, {_size(entry['chunk_size']):>8} chunks: "
+                f"{entry['mb_per_s']:>8.1f} MB/s"
+            )
+    if "hash_content" in results:
+        lines.append("hash_content:")
+        for entry in results["hash_content"]:
+            lines.append(f"  {_size(entry['size']):>8}: {entry['ops_per_s']:>10,} ops/s")
+    
+    for section in ("rpc", "register", "web"):
+        if section not in results:
+            continue
+        lines.append(f"{section}:")
+        for name, stats in results[section].items():
+            if isinstance(stats, dict):
+                lines.append(
+                    f"  {name}: p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms, "
+                    f"mean {stats['mean_ms']} ms ({stats['samples']} samples)"
+                )
+            else:
+                lines.append(f"  {name}: {stats}")
+    
+    if "certificates" in results:
+        lines.append("certificates:")
+        for format_type, stats in results["certificates"].items():
+            rate = f"{stats['renders_per_s']} renders/s" if stats else "unavailable"
+            lines.append(f"  {format_type}: {rate}")
+    
+    return "\n".join(lines)
+
+
+def _repeat(function: Callable[[], Any], duration: float):
+    # Call at least once, then until the duration has passed
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        function()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= duration:
+            return runs, elapsed
+
+
+def _time_calls(function: Callable[[], Any], samples: int) -> List[float]:
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _latency_stats(timings: List[float]) -> Dict[str, Any]:
+    ordered = sorted(timings)
+    return {
+        "samples": len(ordered),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+        "p50_ms": round(_percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(_percentile(ordered, 95) * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3)
+    }
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _random_hash() -> str:
+    return "0x" + secrets.token_hex(32)
+
+
+def _network_name(prover) -> str:
+    return getattr(prover.network, "value", prover.network)
+
+
+def _size(size: int) -> str:
+    for unit, scale in (("MiB", 1024 * 1024), ("KiB", 1024)):
+        if size >= scale and size % scale == 0:
+            return f"{size // scale} {unit}"
+    return f"{size} B"
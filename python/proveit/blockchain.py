@@ -7,20 +7,132 @@ and the ProveIt smart contract.
 
 import json
 import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple, Union
+from typing import Dict, Any, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import requests
 
 # Use a more modern approach with web3.py
-from web3 import Web3
-from web3.exceptions import ContractLogicError
+from eth_typing import HexStr
+from web3 import HTTPProvider, Web3
+from web3.exceptions import ContractLogicError, TransactionNotFound
 
+from .admission import AdmissionGate, RPCOverloadedError
+from .cache import BlockTimestampIndex, TransactionCache
+from .hash import Hash32
 from .models import NetworkType
+from .proof import HASH_REGISTERED_TOPIC, create_proof_certificate
+
+# Deadline of the RPC calls made by the current thread
+_deadline = threading.local()
+
+
+class RPCDeadlineExceededError(TimeoutError):
+    """Raised when an RPC call cannot complete before the current deadline."""
+
+
+@contextmanager
+def rpc_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound the RPC calls made by the current thread within the block.
+    
+    Every HTTP request to the RPC endpoint gets a timeout no longer than the
+    time left until the deadline, and calls made after the deadline has passed
+    fail immediately. Nested deadlines can only shorten the outer one.
+    
+    Args:
+        seconds: Number of seconds the calls may take in total, or None for no deadline
+    """
+    previous = getattr(_deadline, "at", None)
+    
+    if seconds is not None:
+        at = time.monotonic() + seconds
+        _deadline.at = at if previous is None else min(at, previous)
+    
+    try:
+        yield
+    finally:
+        _deadline.at = previous
+
+
+def remaining_deadline() -> Optional[float]:
+    """
+    Get the time left until the current thread's RPC deadline.
+    
+    Returns:
+        Number of seconds left, or None if no deadline is set
+    """
+    at = getattr(_deadline, "at", None)
+    return None if at is None else at - time.monotonic()
+
+
+class _DeadlineHTTPProvider(HTTPProvider):
+    """HTTP provider that bounds each request by the calling thread's RPC deadline."""
+    
+    def get_request_kwargs(self):
+        kwargs = dict(super().get_request_kwargs())
+        remaining = remaining_deadline()
+        
+        if remaining is not None:
+            if remaining <= 0:
+                raise RPCDeadlineExceededError("RPC deadline exceeded")
+            kwargs["timeout"] = min(kwargs.get("timeout", remaining), remaining)
+        
+        return kwargs
+    
+    def make_request(self, method, params):
+        try:
+            return super().make_request(method, params)
+        except requests.exceptions.Timeout as e:
+            if remaining_deadline() is None:
+                raise
+            raise RPCDeadlineExceededError("RPC deadline exceeded") from e
+    
+    def make_batch_request(self, requests_info):
+        try:
+            return super().make_batch_request(requests_info)
+        except requests.exceptions.Timeout as e:
+            if remaining_deadline() is None:
+                raise
+            raise RPCDeadlineExceededError("RPC deadline exceeded") from e
+
+
+def parse_network(network: Union[str, NetworkType]) -> NetworkType:
+    """
+    Convert a network name to a NetworkType.
+    
+    Args:
+        network: Network name, e.g. "polygon" or "hardhat", or a NetworkType
+    
+    Returns:
+        The matching NetworkType
+    
+    Raises:
+        ValueError: If the name is not a known network
+    """
+    if not isinstance(network, str):
+        return network
+    
+    try:
+        # Handle "hardhat" as a special case for LOCAL network
+        if network.lower() == "hardhat":
+            return NetworkType.LOCAL
+        return NetworkType(network)
+    except ValueError:
+        raise ValueError(f"Invalid network: {network}")
 
 
 class BlockchainConnector:
     """
     Connector for interacting with the Ethereum blockchain and the ProveIt contract.
+    
+    A connector can be shared between threads: web3 keeps an HTTP session and
+    a batching context per thread, the caches are locked, and transactions
+    sent through register or under reserve_nonce never share a nonce.
     """
     
     # Default contract addresses (to be updated after deployment)
@@ -47,7 +159,11 @@ class BlockchainConnector:
         contract_address: Optional[str] = None,
         rpc_endpoint: Optional[str] = None,
         private_key: Optional[str] = None,
-        infura_api_key: Optional[str] = None
+        infura_api_key: Optional[str] = None,
+        request_timeout: Optional[float] = None,
+        admission: Optional[AdmissionGate] = None,
+        tx_cache: Optional[TransactionCache] = None,
+        block_timestamps: Optional[BlockTimestampIndex] = None
     ):
         """
         Initialize the blockchain connector.
@@ -58,19 +174,16 @@ class BlockchainConnector:
             rpc_endpoint: RPC endpoint to connect to (default: use predefined endpoint for network)
             private_key: Private key for signing transactions (default: use from environment)
             infura_api_key: Infura API key (default: use from environment)
+            request_timeout: Timeout of each HTTP request to the RPC endpoint, in seconds (default: web3 default)
+            admission: Gate limiting the number of concurrent RPC calls (default: no limit)
+            tx_cache: Cache of the transactions that registered hashes (default: new cache)
+            block_timestamps: Cache of block timestamps used to locate registrations (default: new index)
         """
-        # Convert string network to NetworkType if needed
-        if isinstance(network, str):
-            try:
-                # Handle "hardhat" as a special case for LOCAL network
-                if network.lower() == "hardhat":
-                    self.network = NetworkType.LOCAL
-                else:
-                    self.network = NetworkType(network)
-            except ValueError:
-                raise ValueError(f"Invalid network: {network}")
-        else:
-            self.network = network
+        self.admission = admission
+        self.tx_cache = tx_cache if tx_cache is not None else TransactionCache()
+        self.block_timestamps = block_timestamps if block_timestamps is not None else BlockTimestampIndex()
+        
+        self.network = parse_network(network)
         
         # Get Infura API key from environment if not provided
         if not infura_api_key and "INFURA_API_KEY" in os.environ:
@@ -87,7 +200,8 @@ class BlockchainConnector:
                 raise ValueError(f"No default RPC endpoint for network: {self.network.value}")
         
         # Connect to the blockchain
-        self.web3 = Web3(Web3.HTTPProvider(rpc_endpoint))
+        request_kwargs = {"timeout": request_timeout} if request_timeout else None
+        self.web3 = Web3(_DeadlineHTTPProvider(rpc_endpoint, request_kwargs=request_kwargs))
         
         # Configure the web3 instance for the network
         if self.network in [NetworkType.GOERLI, NetworkType.POLYGON, NetworkType.POLYGON_MUMBAI]:
@@ -113,6 +227,10 @@ class BlockchainConnector:
         # Initialize contract
         self.contract = self.web3.eth.contract(address=contract_address, abi=contract_abi)
         
+        # Next nonce of the account, handed out by reserve_nonce
+        self._nonce_lock = threading.Lock()
+        self._next_nonce: Optional[int] = None
+        
         # Set up account for transactions if private key is provided
         self.account = None
         if private_key:
@@ -326,104 +444,552 @@ class BlockchainConnector:
         
         return None
     
-    def register(self, file_hash: str, metadata: str = "") -> Dict[str, Any]:
+    def register(self, file_hash: Union[str, Hash32], metadata: str = "") -> Dict[str, Any]:
         """
         Register a file hash on the blockchain.
         
         Args:
-            file_hash: Hash of the file to register
+            file_hash: Hash of the file to register, as a hex string or Hash32
             metadata: Optional metadata to associate with the hash
             
         Returns:
-            Dictionary with transaction details
+            Dictionary with transaction details; the hash is a Hash32
             
         Raises:
-            ValueError: If no account is available for signing transactions
+            ValueError: If no account is available for signing transactions,
+                or if the hash is not a valid 32-byte hash
             ContractLogicError: If the hash is already registered
+            TimeExhausted: If the transaction is not mined before the deadline
         """
+        file_hash = Hash32.coerce(file_hash)
         if not self.account:
             raise ValueError("No account available for signing transactions")
         
-        # Ensure the hash is in the correct format
-        if not file_hash.startswith("0x"):
-            file_hash = "0x" + file_hash
+        with self._rpc_slot():
+            # Sign and send the transaction
+            with self.reserve_nonce() as nonce:
+                signed_tx = self.sign_registration(file_hash, metadata, nonce)
+                tx_hash = self.send_registration(signed_tx)
+        
+        # Wait for the transaction to be mined, no longer than the current deadline. The
+        # admission slot is released first: waiting can take minutes and would starve lookups
+        remaining = remaining_deadline()
+        result = self.wait_for_registration(tx_hash, timeout=max(remaining, 0) if remaining is not None else 120)
+        
+        # Return transaction details
+        return {
+            "hash": file_hash,
+            "tx_hash": result["tx_hash"],
+            "owner": self.account.address,
+            "timestamp": result["timestamp"],
+            "block_number": result["block_number"],
+            "network": self.network.value,
+            "metadata": metadata
+        }
+    
+    def sign_registration(
+        self,
+        file_hash: Union[str, Hash32],
+        metadata: str = "",
+        nonce: Optional[int] = None,
+        gas_price: Optional[int] = None
+    ) -> Any:
+        """
+        Build and sign a registration transaction without sending it.
+        
+        Signing first gives the transaction hash before anything is sent, so
+        callers can record it. Callers sending many transactions pass their own
+        consecutive nonces instead of asking the node for each one.
         
-        # Convert the hash to bytes32
-        file_hash_bytes32 = bytes.fromhex(file_hash[2:])
+        Args:
+            file_hash: Hash of the file to register, as a hex string or Hash32
+            metadata: Optional metadata to associate with the hash
+            nonce: Nonce of the transaction (default: the account's transaction count)
+            gas_price: Gas price in wei (default: the node's current gas price)
+        
+        Returns:
+            Signed transaction, with hash and raw_transaction attributes
+        
+        Raises:
+            ValueError: If no account is available for signing transactions,
+                or if the hash is not a valid 32-byte hash
+        """
+        if not self.account:
+            raise ValueError("No account available for signing transactions")
         
         # Build the transaction
-        tx = self.contract.functions.register(file_hash_bytes32, metadata).build_transaction({
+        tx = self.contract.functions.register(Hash32.coerce(file_hash).raw, metadata).build_transaction({
             'from': self.account.address,
-            'nonce': self.web3.eth.get_transaction_count(self.account.address),
+            'nonce': nonce if nonce is not None else self.web3.eth.get_transaction_count(self.account.address),
             'gas': 200000,  # Adjust as needed
-            'gasPrice': self.web3.eth.gas_price
+            'gasPrice': gas_price if gas_price is not None else self.web3.eth.gas_price
         })
         
-        # Sign and send the transaction
-        signed_tx = self.account.sign_transaction(tx)
+        return self.account.sign_transaction(tx)
+    
+    def send_registration(self, signed_tx: Any) -> str:
+        """
+        Send a signed registration transaction.
+        
+        Args:
+            signed_tx: Transaction returned by sign_registration
+        
+        Returns:
+            The 0x-prefixed transaction hash
+        """
         tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        return "0x" + bytes(tx_hash).hex()
+    
+    def wait_for_registration(self, tx_hash: str, timeout: float = 120) -> Dict[str, Any]:
+        """
+        Wait for a registration transaction to be mined.
+        
+        Args:
+            tx_hash: Hash of the transaction
+            timeout: Maximum number of seconds to wait (default: 120)
         
-        # Wait for the transaction to be mined
-        tx_receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        Returns:
+            Dictionary with the tx_hash, status (1 for success, 0 if the
+            transaction reverted), block_number and timestamp of the block
+        """
+        tx_receipt = self.web3.eth.wait_for_transaction_receipt(HexStr(tx_hash), timeout=timeout)
         
         # Get the block timestamp
-        block = self.web3.eth.get_block(tx_receipt.blockNumber)
-        timestamp = datetime.fromtimestamp(block.timestamp)
+        block = self.web3.eth.get_block(tx_receipt["blockNumber"])
         
-        # Return transaction details
         return {
-            "hash": file_hash,
-            "tx_hash": tx_receipt.transactionHash.hex(),
-            "owner": self.account.address,
-            "timestamp": timestamp,
-            "block_number": tx_receipt.blockNumber,
-            "network": self.network.value,
-            "metadata": metadata
+            "tx_hash": "0x" + bytes(tx_receipt["transactionHash"]).hex(),
+            "status": tx_receipt.get("status", 1),
+            "block_number": tx_receipt["blockNumber"],
+            "timestamp": datetime.fromtimestamp(block["timestamp"])
         }
     
-    def verify(self, file_hash: str) -> Dict[str, Any]:
+    def get_transaction_state(self, tx_hash: str) -> str:
+        """
+        Get the state of a previously sent transaction.
+        
+        Args:
+            tx_hash: Hash of the transaction
+        
+        Returns:
+            "confirmed" if it was mined successfully, "failed" if it was mined
+            but reverted, "pending" if the node knows it but it is not mined yet,
+            or "unknown" if the node has never seen it or has dropped it
+        """
+        try:
+            receipt = self.web3.eth.get_transaction_receipt(HexStr(tx_hash))
+        except TransactionNotFound:
+            receipt = None
+        
+        if receipt is not None:
+            return "confirmed" if receipt.get("status", 1) else "failed"
+        
+        try:
+            self.web3.eth.get_transaction(HexStr(tx_hash))
+        except TransactionNotFound:
+            return "unknown"
+        
+        return "pending"
+    
+    def get_pending_nonce(self) -> int:
+        """
+        Get the next nonce of the signing account, counting transactions still in the mempool.
+        
+        Returns:
+            The nonce to use for the next transaction
+        
+        Raises:
+            ValueError: If no account is available for signing transactions
+        """
+        if not self.account:
+            raise ValueError("No account available for signing transactions")
+        
+        return self.web3.eth.get_transaction_count(self.account.address, "pending")
+    
+    @contextmanager
+    def reserve_nonce(self) -> Iterator[int]:
+        """
+        Hold the next nonce of the signing account while a transaction is signed and sent.
+        
+        Reservations are serialized, so threads sharing the connector never
+        sign two transactions with the same nonce. The first reservation asks
+        the node for the pending nonce; later ones count up locally. If the
+        block raises, or calls reset_nonce, the nonce is taken as unused and
+        the next reservation asks the node again.
+        
+        Yields:
+            The nonce to sign the transaction with
+        
+        Raises:
+            ValueError: If no account is available for signing transactions
+        """
+        with self._nonce_lock:
+            if self._next_nonce is None:
+                self._next_nonce = self.get_pending_nonce()
+            nonce = self._next_nonce
+            
+            try:
+                yield nonce
+            except BaseException:
+                self._next_nonce = None
+                raise
+            
+            if self._next_nonce == nonce:
+                self._next_nonce = nonce + 1
+    
+    def reset_nonce(self) -> None:
+        """Forget the locally counted nonce, e.g. after a transaction could not be sent."""
+        self._next_nonce = None
+    
+    def verify(self, file_hash: Union[str, Hash32]) -> Dict[str, Any]:
         """
         Verify if a file hash is registered on the blockchain.
         
         Args:
-            file_hash: Hash of the file to verify
+            file_hash: Hash of the file to verify, as a hex string or Hash32
             
         Returns:
-            Dictionary with verification details
-        """
-        # Ensure the hash is in the correct format
-        if not file_hash.startswith("0x"):
-            file_hash = "0x" + file_hash
+            Dictionary with verification details; the hash is a Hash32
         
-        # Convert the hash to bytes32
-        file_hash_bytes32 = bytes.fromhex(file_hash[2:])
+        Raises:
+            ValueError: If the hash is not a valid 32-byte hash
+        """
+        file_hash = Hash32.coerce(file_hash)
         
         # Call the verify function
         try:
-            registration = self.contract.functions.verify(file_hash_bytes32).call()
+            with self._rpc_slot():
+                registration = self.contract.functions.verify(file_hash.raw).call()
+            return self._registration_to_dict(file_hash, registration)
+        except ContractLogicError:
+            # Handle contract errors
+            return {
+                "hash": file_hash,
+                "is_registered": False
+            }
+    
+    def verify_many(self, file_hashes: Sequence[Union[str, Hash32]], batch_size: int = 100) -> List[Dict[str, Any]]:
+        """
+        Verify several file hashes using batched JSON-RPC calls.
+        
+        Each batch of up to ``batch_size`` hashes is sent to the node as a single
+        JSON-RPC batch request. If the node rejects batch requests, the hashes of
+        that batch are verified one at a time instead.
+        
+        Args:
+            file_hashes: Hashes of the files to verify, as hex strings or Hash32 values
+            batch_size: Maximum number of calls per JSON-RPC batch (default: 100)
+        
+        Returns:
+            List of dictionaries with verification details, in the same order as file_hashes
+        
+        Raises:
+            ValueError: If one of the hashes is not a valid 32-byte hash
+        """
+        results: List[Dict[str, Any]] = []
+        
+        for start in range(0, len(file_hashes), batch_size):
+            chunk = [Hash32.coerce(file_hash) for file_hash in file_hashes[start:start + batch_size]]
             
-            # Check if the hash is registered (owner is not zero address)
-            is_registered = registration[0] != "0x0000000000000000000000000000000000000000"
+            try:
+                with self._rpc_slot():
+                    with self.web3.batch_requests() as batch:
+                        for file_hash in chunk:
+                            batch.add(self.contract.functions.verify(file_hash.raw))
+                        registrations = batch.execute()
+            except (RPCOverloadedError, RPCDeadlineExceededError):
+                raise
+            except Exception:
+                # Fall back to individual calls if the node does not support batching
+                results.extend(self.verify(file_hash) for file_hash in chunk)
+                continue
             
-            if is_registered:
-                # Convert timestamp to datetime
-                timestamp = datetime.fromtimestamp(registration[1])
+            for file_hash, registration in zip(chunk, registrations):
+                results.append(self._registration_to_dict(file_hash, registration))
+        
+        return results
+    
+    def find_registration_transaction(self, file_hash: Union[str, Hash32], timestamp: int) -> Optional[str]:
+        """
+        Find the transaction that registered a hash.
+        
+        The registration's timestamp is the timestamp of the block it was mined
+        in, so the block is located by bisection over block timestamps and the
+        HashRegistered event is then looked up with an eth_getLogs topic filter
+        over just that block. Block timestamps and resolved transactions are
+        cached, so repeated lookups need few or no RPC calls.
+        
+        Args:
+            file_hash: Registered hash
+            timestamp: Unix timestamp of the registration
+        
+        Returns:
+            The 0x-prefixed transaction hash, or None if no registration event was found
+        """
+        file_hash = Hash32.coerce(file_hash)
+        
+        tx_hash = self.tx_cache.get(self.network.value, file_hash)
+        if tx_hash is not None:
+            return tx_hash
+        
+        with self._rpc_slot():
+            latest = self.web3.eth.block_number
+            from_block, to_block = self._blocks_at(timestamp, latest)
+            
+            logs = self.web3.eth.get_logs({
+                "address": self.contract.address,
+                "topics": ["0x" + HASH_REGISTERED_TOPIC.hex(), file_hash.hex],
+                "fromBlock": from_block,
+                "toBlock": to_block,
+            })
+        
+        if not logs:
+            return None
+        
+        tx_hash = "0x" + bytes(logs[0]["transactionHash"]).hex()
+        self.tx_cache.put(self.network.value, file_hash, tx_hash)
+        return tx_hash
+    
+    def find_registration_transactions(
+        self,
+        registrations: Iterable[Tuple[Union[str, Hash32], int]],
+        max_blocks: int = 1000
+    ) -> Dict[Hash32, Optional[str]]:
+        """
+        Find the transactions that registered many hashes.
+        
+        Works like find_registration_transaction, except that registrations
+        mined in nearby blocks are looked up together: one eth_getLogs call
+        covers up to max_blocks blocks, and its topic filter lists every hash
+        registered in them.
+        
+        Args:
+            registrations: (hash, Unix timestamp of the registration) pairs
+            max_blocks: Maximum number of blocks covered by one log query (default: 1000)
+        
+        Returns:
+            The 0x-prefixed transaction hash of each hash, or None if no
+            registration event was found for it
+        """
+        network = self.network.value
+        found: Dict[Hash32, Optional[str]] = {}
+        todo: Dict[Hash32, int] = {}
+        
+        for file_hash, timestamp in registrations:
+            file_hash = Hash32.coerce(file_hash)
+            found[file_hash] = self.tx_cache.get(network, file_hash)
+            if found[file_hash] is None:
+                todo[file_hash] = timestamp
+        
+        if not todo:
+            return found
+        
+        with self._rpc_slot():
+            latest = self.web3.eth.block_number
+            blocks = {timestamp: self._blocks_at(timestamp, latest) for timestamp in set(todo.values())}
+            
+            # Group the registrations of nearby blocks into one log query each
+            groups: List[Tuple[int, int, List[Hash32]]] = []
+            for file_hash, timestamp in sorted(todo.items(), key=lambda item: blocks[item[1]]):
+                from_block, to_block = blocks[timestamp]
+                if groups and to_block - groups[-1][0] < max_blocks:
+                    group_from, group_to, hashes = groups[-1]
+                    groups[-1] = (group_from, max(group_to, to_block), hashes + [file_hash])
+                else:
+                    groups.append((from_block, to_block, [file_hash]))
+            
+            for from_block, to_block, hashes in groups:
+                logs = self.web3.eth.get_logs({
+                    "address": self.contract.address,
+                    "topics": ["0x" + HASH_REGISTERED_TOPIC.hex(), [file_hash.hex for file_hash in hashes]],
+                    "fromBlock": from_block,
+                    "toBlock": to_block,
+                })
                 
-                return {
-                    "hash": file_hash,
-                    "is_registered": True,
-                    "owner": registration[0],
-                    "timestamp": timestamp,
-                    "metadata": registration[2],
-                    "network": self.network.value
-                }
+                for log in logs:
+                    file_hash = Hash32.coerce(log["topics"][1])
+                    # A hash is registered once; keep the first event like the single lookup does
+                    if file_hash in todo and found[file_hash] is None:
+                        tx_hash = "0x" + bytes(log["transactionHash"]).hex()
+                        found[file_hash] = tx_hash
+                        self.tx_cache.put(network, file_hash, tx_hash)
+        
+        return found
+    
+    def _blocks_at(self, timestamp: int, latest: int) -> Tuple[int, int]:
+        """
+        Find the blocks mined at a point in time.
+        
+        Args:
+            timestamp: Unix timestamp of a block
+            latest: Number of the latest block
+        
+        Returns:
+            First and last number of the blocks whose timestamp is exactly timestamp
+        """
+        from_block = self._first_block_at(timestamp, latest)
+        to_block = max(self._first_block_at(timestamp + 1, latest) - 1, from_block)
+        return from_block, min(to_block, latest)
+    
+    def _first_block_at(self, timestamp: int, latest: int) -> int:
+        """
+        Find the first block mined at or after a point in time.
+        
+        Args:
+            timestamp: Unix timestamp
+            latest: Number of the latest block
+        
+        Returns:
+            Number of the first block whose timestamp is not earlier than timestamp,
+            or latest + 1 if there is none
+        """
+        low, high = 0, latest + 1
+        
+        while low < high:
+            middle = (low + high) // 2
+            if self._block_timestamp(middle) < timestamp:
+                low = middle + 1
             else:
-                return {
-                    "hash": file_hash,
-                    "is_registered": False
-                }
-        except ContractLogicError:
-            # Handle contract errors
+                high = middle
+        
+        return low
+    
+    def _block_timestamp(self, block_number: int) -> int:
+        """
+        Get the timestamp of a block, from the block timestamp index if possible.
+        
+        Args:
+            block_number: Number of the block
+        
+        Returns:
+            The block's Unix timestamp
+        """
+        timestamp = self.block_timestamps.get(block_number)
+        
+        if timestamp is None:
+            timestamp = self.web3.eth.get_block(block_number)["timestamp"]
+            self.block_timestamps.put(block_number, timestamp)
+        
+        return timestamp
+    
+    def get_registration_proof(self, file_hash: Union[str, Hash32], tx_hash: str) -> Dict[str, Any]:
+        """
+        Build an offline-verifiable proof certificate for a registration.
+        
+        Args:
+            file_hash: Registered hash
+            tx_hash: Hash of the transaction that registered it
+        
+        Returns:
+            Proof certificate, see proveit.proof.create_proof_certificate
+        
+        Raises:
+            ProofError: If the transaction did not register the hash with this connector's contract
+        """
+        file_hash = Hash32.coerce(file_hash).hex
+        
+        with self._rpc_slot():
+            tx_receipt = self.web3.eth.get_transaction_receipt(HexStr(tx_hash))
+            block = self.web3.eth.get_block(tx_receipt["blockNumber"])
+            receipts = self._get_block_receipts(block)
+        
+        return create_proof_certificate(
+            file_hash,
+            self.contract.address,
+            self.network.value,
+            tx_hash,
+            block,
+            receipts
+        )
+    
+    def get_block_hashes(self, block_numbers: List[int], batch_size: int = 100) -> Dict[int, str]:
+        """
+        Get the hashes of several blocks using batched JSON-RPC calls.
+        
+        Args:
+            block_numbers: Numbers of the blocks
+            batch_size: Maximum number of calls per JSON-RPC batch (default: 100)
+        
+        Returns:
+            Dictionary mapping each block number to its 0x-prefixed block hash
+        """
+        block_numbers = sorted(set(block_numbers))
+        block_hashes = {}
+        
+        for start in range(0, len(block_numbers), batch_size):
+            chunk = block_numbers[start:start + batch_size]
+            
+            with self._rpc_slot():
+                with self.web3.batch_requests() as batch:
+                    for number in chunk:
+                        batch.add(self.web3.eth.get_block(number))
+                    blocks: Sequence[Mapping[str, Any]] = batch.execute()
+            
+            for number, block in zip(chunk, blocks):
+                block_hashes[number] = "0x" + bytes(block["hash"]).hex()
+        
+        return block_hashes
+    
+    def _get_block_receipts(self, block: Mapping[str, Any]) -> Sequence[Mapping[str, Any]]:
+        """
+        Get the receipts of all transactions in a block.
+        
+        Args:
+            block: Block whose receipts should be fetched
+        
+        Returns:
+            List of receipts, in transaction order
+        """
+        try:
+            return list(self.web3.eth.get_block_receipts(block["number"]))
+        except (RPCOverloadedError, RPCDeadlineExceededError):
+            raise
+        except Exception:
+            # Fall back to one call per transaction if the node does not support eth_getBlockReceipts
+            with self.web3.batch_requests() as batch:
+                for tx_hash in block["transactions"]:
+                    batch.add(self.web3.eth.get_transaction_receipt(tx_hash))
+                return list(batch.execute())
+    
+    def _rpc_slot(self):
+        """
+        Hold an admission slot for a call to the RPC endpoint.
+        
+        Returns:
+            Context manager that waits for a slot no longer than the current RPC deadline
+        """
+        if self.admission is None:
+            return nullcontext()
+        
+        return self.admission.admit(timeout=remaining_deadline())
+    
+    def _registration_to_dict(self, file_hash: Hash32, registration: Any) -> Dict[str, Any]:
+        """
+        Convert a Registration struct returned by the contract to a dictionary.
+        
+        Args:
+            file_hash: Hash the registration belongs to
+            registration: (owner, timestamp, metadata) tuple returned by the contract
+        
+        Returns:
+            Dictionary with verification details
+        """
+        # Check if the hash is registered (owner is not zero address)
+        is_registered = registration[0] != "0x0000000000000000000000000000000000000000"
+        
+        if is_registered:
+            # Convert timestamp to datetime
+            timestamp = datetime.fromtimestamp(registration[1])
+            
+            return {
+                "hash": file_hash,
+                "is_registered": True,
+                "owner": registration[0],
+                "timestamp": timestamp,
+                "metadata": registration[2],
+                "network": self.network.value
+            }
+        else:
             return {
                 "hash": file_hash,
                 "is_registered": False
@@ -0,0 +1,297 @@
+"""
+Caching utilities for the ProveIt package.
+
+This module provides in-memory caches for verification results, rendered
+certificates, registration transactions and block timestamps. Registrations on
+the ProveIt contract can never be removed, so a positive verification result
+(and any certificate or transaction hash looked up for it) stays valid
+forever, while a negative one only holds until somebody registers the hash.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .hash import Hash32
+from .models import VerificationResult
+
+# Key of a rendered certificate: (network, hash, file_name, format)
+CertificateKey = Tuple[str, Hash32, Optional[str], str]
+
+
+class VerificationCache:
+    """
+    Thread-safe LRU cache of verification results, keyed by network and hash.
+    """
+    
+    def __init__(self, maxsize: int = 10000, negative_ttl: float = 30.0):
+        """
+        Initialize the verification cache.
+        
+        Args:
+            maxsize: Maximum number of results to keep (default: 10000)
+            negative_ttl: Number of seconds a negative result stays valid (default: 30)
+        """
+        self.maxsize = maxsize
+        self.negative_ttl = negative_ttl
+        self._entries: "OrderedDict[Tuple[str, Hash32], Tuple[VerificationResult, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, network: str, file_hash: Hash32) -> Optional[VerificationResult]:
+        """
+        Look up a cached verification result.
+        
+        Args:
+            network: Network the hash was verified on
+            file_hash: Hash to look up
+        
+        Returns:
+            The cached VerificationResult, or None if there is no valid entry
+        """
+        key = (network, file_hash)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            result, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return result
+    
+    def put(self, network: str, result: VerificationResult) -> None:
+        """
+        Store a verification result.
+        
+        Args:
+            network: Network the hash was verified on
+            result: VerificationResult to store, keyed by its hash; results
+                of files that could not be read are not stored
+        """
+        if self.maxsize <= 0 or result.hash is None:
+            return
+        
+        if result.is_registered:
+            expires_at = None
+        elif self.negative_ttl > 0:
+            expires_at = time.monotonic() + self.negative_ttl
+        else:
+            return
+        
+        key = (network, result.hash)
+        
+        with self._lock:
+            self._entries[key] = (result, expires_at)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached results."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class CertificateCache:
+    """
+    Thread-safe LRU cache of rendered certificates.
+    
+    Entries are keyed by (network, hash, file_name, format) and the cache is
+    bounded both by the number of entries and by their total size.
+    """
+    
+    def __init__(self, maxsize: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the certificate cache.
+        
+        Args:
+            maxsize: Maximum number of certificates to keep (default: 256)
+            max_bytes: Maximum total size of the cached certificates (default: 64 MiB)
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CertificateKey, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: CertificateKey) -> Optional[bytes]:
+        """
+        Look up a rendered certificate.
+        
+        Args:
+            key: (network, hash, file_name, format) tuple
+        
+        Returns:
+            The rendered certificate, or None if it is not cached
+        """
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+    
+    def put(self, key: CertificateKey, content: bytes) -> None:
+        """
+        Store a rendered certificate.
+        
+        Args:
+            key: (network, hash, file_name, format) tuple
+            content: Rendered certificate
+        """
+        if self.maxsize <= 0 or len(content) > self.max_bytes:
+            return
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            
+            self._entries[key] = content
+            self._size += len(content)
+            
+            while len(self._entries) > self.maxsize or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+    
+    def clear(self) -> None:
+        """Remove all cached certificates."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class TransactionCache:
+    """
+    Thread-safe LRU cache of the transactions that registered hashes, keyed by network and hash.
+    """
+    
+    def __init__(self, maxsize: int = 10000):
+        """
+        Initialize the transaction cache.
+        
+        Args:
+            maxsize: Maximum number of transaction hashes to keep (default: 10000)
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, Hash32], str]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, network: str, file_hash: Hash32) -> Optional[str]:
+        """
+        Look up the transaction that registered a hash.
+        
+        Args:
+            network: Network the hash was registered on
+            file_hash: Registered hash
+        
+        Returns:
+            The transaction hash, or None if it is not cached
+        """
+        key = (network, file_hash)
+        
+        with self._lock:
+            tx_hash = self._entries.get(key)
+            if tx_hash is not None:
+                self._entries.move_to_end(key)
+            return tx_hash
+    
+    def put(self, network: str, file_hash: Hash32, tx_hash: str) -> None:
+        """
+        Store the transaction that registered a hash.
+        
+        Args:
+            network: Network the hash was registered on
+            file_hash: Registered hash
+            tx_hash: Hash of the registering transaction
+        """
+        if self.maxsize <= 0:
+            return
+        
+        key = (network, file_hash)
+        
+        with self._lock:
+            self._entries[key] = tx_hash
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached transaction hashes."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class BlockTimestampIndex:
+    """
+    Thread-safe cache of block timestamps, keyed by block number.
+    
+    Block timestamps never change once a block is final, and bisecting over
+    them to find the block of a registration probes the same blocks near the
+    top of the search every time, so those probes are answered from memory.
+    """
+    
+    def __init__(self, maxsize: int = 100000):
+        """
+        Initialize the block timestamp index.
+        
+        Args:
+            maxsize: Maximum number of block timestamps to keep (default: 100000)
+        """
+        self.maxsize = maxsize
+        self._timestamps: Dict[int, int] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, block_number: int) -> Optional[int]:
+        """
+        Look up the timestamp of a block.
+        
+        Args:
+            block_number: Number of the block
+        
+        Returns:
+            The block's Unix timestamp, or None if it is not cached
+        """
+        with self._lock:
+            return self._timestamps.get(block_number)
+    
+    def put(self, block_number: int, timestamp: int) -> None:
+        """
+        Store the timestamp of a block.
+        
+        Args:
+            block_number: Number of the block
+            timestamp: The block's Unix timestamp
+        """
+        with self._lock:
+            if len(self._timestamps) >= self.maxsize:
+                # Keep the index bounded; it is rebuilt from the probes of the next searches
+                self._timestamps.clear()
+            self._timestamps[block_number] = timestamp
+    
+    def clear(self) -> None:
+        """Remove all cached timestamps."""
+        with self._lock:
+            self._timestamps.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._timestamps)
@@ -5,10 +5,14 @@ This module provides functionality for generating certificates of registration.
 """
 
 import os
+import io
 import json
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, BinaryIO, Iterable, Iterator, Optional, Set, Union
 
 try:
     from reportlab.lib.pagesizes import letter
@@ -20,8 +24,18 @@ try:
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
+from .hash import split_metadata_tag
 from .models import Certificate
 
+# Names of the built-in hash algorithms as printed on certificates; other
+# registered algorithms are printed under their registry name
+ALGORITHM_LABELS = {
+    "sha256": "SHA-256",
+    "sha3-256": "SHA3-256",
+    "blake2b-256": "BLAKE2b-256",
+    "blake2s-256": "BLAKE2s-256",
+}
+
 
 def generate_certificate(
     hash_value: str,
@@ -58,16 +72,324 @@ def generate_certificate(
     )
 
 
-def _create_certificate_pdf(certificate: Certificate, output_path: str) -> str:
+def render_certificate(certificate: Certificate, format_type: str = "pdf") -> bytes:
+    """
+    Render a certificate in memory.
+    
+    Args:
+        certificate: Certificate object
+        format_type: Format to render, either "pdf" or "json" (default: pdf)
+    
+    Returns:
+        The rendered certificate
+    
+    Raises:
+        ValueError: If the format is not supported
+        ImportError: If reportlab is not installed and a PDF is requested
+    """
+    format_type = format_type.lower()
+    
+    if format_type == "pdf":
+        buffer = io.BytesIO()
+        _create_certificate_pdf(certificate, buffer)
+        return buffer.getvalue()
+    elif format_type == "json":
+        return json.dumps(_certificate_data(certificate), indent=2).encode("utf-8")
+    else:
+        raise ValueError(f"Unsupported certificate format: {format_type}")
+
+
+def iter_certificates_zip(
+    certificates: Iterable[Certificate],
+    format_type: str = "pdf",
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    executor: Optional[Executor] = None
+) -> Iterator[bytes]:
+    """
+    Render many certificates in parallel and stream them as a zip archive.
+    
+    Certificates are rendered by a pool of worker processes and added to the
+    archive in the order they complete. The certificates iterable is consumed
+    lazily and at most max_in_flight certificates are pending at any time, so
+    memory use does not grow with the size of the batch.
+    
+    Args:
+        certificates: Certificates to render
+        format_type: Format to render, either "pdf" or "json" (default: pdf)
+        workers: Number of worker processes (default: number of CPUs)
+        max_in_flight: Maximum number of certificates being rendered at once (default: 2 x workers)
+        executor: Long-lived pool to render with, left running afterwards
+            (default: a new pool of workers processes, shut down at the end)
+    
+    Yields:
+        Consecutive chunks of the zip archive
+    
+    Raises:
+        ValueError: If the format is not supported
+    """
+    format_type = format_type.lower()
+    if format_type not in ("pdf", "json"):
+        raise ValueError(f"Unsupported certificate format: {format_type}")
+    
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 2
+    
+    stream = _ChunkWriter()
+    archive = zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED)
+    used_names: Set[str] = set()
+    pending: Dict[Future, str] = {}
+    
+    owns_executor = executor is None
+    pool = ProcessPoolExecutor(max_workers=workers) if executor is None else executor
+    try:
+        certificates = iter(certificates)
+        exhausted = False
+        
+        while pending or not exhausted:
+            # Keep the pool busy without reading ahead more than max_in_flight certificates
+            while not exhausted and len(pending) < max_in_flight:
+                certificate = next(certificates, None)
+                if certificate is None:
+                    exhausted = True
+                    break
+                future = pool.submit(render_certificate, certificate, format_type)
+                pending[future] = _archive_name(certificate, format_type, used_names)
+            
+            if not pending:
+                break
+            
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                archive.writestr(pending.pop(future), future.result())
+            
+            data = stream.drain()
+            if data:
+                yield data
+        
+        archive.close()
+        yield stream.drain()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owns_executor:
+            pool.shutdown(wait=False)
+
+
+def write_certificates_zip(
+    certificates: Iterable[Certificate],
+    output_path: Union[str, Path],
+    format_type: str = "pdf",
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None
+) -> str:
+    """
+    Render many certificates in parallel into a zip file.
+    
+    Args:
+        certificates: Certificates to render
+        output_path: Path where the zip archive should be saved
+        format_type: Format to render, either "pdf" or "json" (default: pdf)
+        workers: Number of worker processes (default: number of CPUs)
+        max_in_flight: Maximum number of certificates being rendered at once (default: 2 x workers)
+    
+    Returns:
+        The path to the saved archive
+    """
+    with open(output_path, "wb") as f:
+        for chunk in iter_certificates_zip(certificates, format_type, workers, max_in_flight):
+            f.write(chunk)
+    
+    return str(output_path)
+
+
+class _ChunkWriter(io.RawIOBase):
+    """Unseekable binary stream that buffers written data until it is drained."""
+    
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _archive_name(certificate: Certificate, format_type: str, used_names: Set[str]) -> str:
+    """
+    Choose a unique archive member name for a certificate.
+    
+    Args:
+        certificate: Certificate to name
+        format_type: Format of the rendered certificate
+        used_names: Names already used in the archive (updated in place)
+    
+    Returns:
+        Member name based on the file name, or on the hash if there is none
+    """
+    stem = Path(certificate.file_name).name if certificate.file_name else certificate.hash
+    name = f"{stem}.{format_type}"
+    counter = 1
+    
+    while name in used_names:
+        counter += 1
+        name = f"{stem}-{counter}.{format_type}"
+    
+    used_names.add(name)
+    return name
+
+
+class _CertificateLayout:
+    """
+    Styles and static content shared by every PDF certificate.
+    
+    Building the stylesheet and parsing the fixed paragraphs costs about as
+    much as laying out the certificate itself, so this is done once per thread
+    and reused for every certificate rendered by that thread.
+    """
+    
+    def __init__(self):
+        styles = getSampleStyleSheet()
+        self.title_style = styles["Title"]
+        self.heading_style = styles["Heading2"]
+        self.normal_style = styles["Normal"]
+        
+        # Create custom style for monospace text
+        self.mono_style = ParagraphStyle(
+            "MonoStyle",
+            parent=self.normal_style,
+            fontName="Courier",
+            fontSize=8,
+            leading=10
+        )
+        
+        # Create custom style for the legal disclaimer
+        disclaimer_style = ParagraphStyle(
+            "Disclaimer",
+            parent=self.normal_style,
+            fontSize=8,
+            leading=10,
+            textColor=colors.gray
+        )
+        
+        self.table_style = TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Courier'),
+            ('FONTSIZE', (1, 0), (1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ])
+        
+        self.large_space = Spacer(1, 0.25 * inch)
+        self.small_space = Spacer(1, 0.1 * inch)
+        
+        self.title = _StaticParagraph("Certificate of Registration", self.title_style)
+        self.intro = _StaticParagraph(
+            "This certificate verifies that the following file hash was registered "
+            "on the blockchain at the specified time. This provides evidence of the "
+            "file's existence at that point in time.",
+            self.normal_style
+        )
+        self.file_heading = _StaticParagraph("File Information", self.heading_style)
+        self.hash_labels: Dict[str, 'Paragraph'] = {}
+        self.file_name_label = _StaticParagraph("File Name:", self.normal_style)
+        self.registration_heading = _StaticParagraph("Registration Details", self.heading_style)
+        self.verification_heading = _StaticParagraph("Verification", self.heading_style)
+        self.verification = _StaticParagraph(
+            "To verify this registration, you can use the ProveIt tool to check "
+            "the file hash against the blockchain record. Visit https://proveit.example.com "
+            "or use the ProveIt command-line tool.",
+            self.normal_style
+        )
+        self.command_label = _StaticParagraph("Command:", self.normal_style)
+        self.disclaimer = _StaticParagraph(
+            "DISCLAIMER: This certificate provides evidence of file existence at a specific time. "
+            "It does not constitute copyright registration or legal protection. For legal protection, "
+            "consult with an intellectual property attorney and consider formal copyright registration "
+            "through appropriate government channels.",
+            disclaimer_style
+        )
+    
+    def hash_label(self, algorithm: str) -> 'Paragraph':
+        """
+        Get the label of the file hash.
+        
+        Args:
+            algorithm: Name of the algorithm the hash was computed with
+        
+        Returns:
+            The "Hash (<algorithm>):" paragraph, built on first use
+        """
+        label = self.hash_labels.get(algorithm)
+        if label is None:
+            name = ALGORITHM_LABELS.get(algorithm, algorithm)
+            label = self.hash_labels[algorithm] = _StaticParagraph(f"Hash ({name}):", self.normal_style)
+        return label
+
+
+if REPORTLAB_AVAILABLE:
+    class _StaticParagraph(Paragraph):
+        """Paragraph that remembers its line breaks for the widths it has been wrapped to."""
+        
+        def __init__(self, text, style):
+            super().__init__(text, style)
+            self._wrapped = {}
+        
+        def wrap(self, availWidth, availHeight):
+            wrapped = self._wrapped.get(availWidth)
+            
+            if wrapped is None:
+                super().wrap(availWidth, availHeight)
+                wrapped = (self._wrapWidths, self.blPara, self.height)
+                self._wrapped[availWidth] = wrapped
+            
+            self.width = availWidth
+            self._wrapWidths, self.blPara, self.height = wrapped
+            return self.width, self.height
+
+
+# Certificate layouts are mutated while a document is built, so each thread gets its own
+_layouts = threading.local()
+
+
+def _certificate_layout() -> _CertificateLayout:
+    """
+    Get the certificate layout of the current thread.
+    
+    Returns:
+        The layout, built on first use
+    """
+    layout = getattr(_layouts, "layout", None)
+    
+    if layout is None:
+        layout = _layouts.layout = _CertificateLayout()
+    
+    return layout
+
+
+def _create_certificate_pdf(
+    certificate: Certificate,
+    output_path: Union[str, BinaryIO]
+) -> Union[str, BinaryIO]:
     """
     Create a PDF certificate.
     
     Args:
         certificate: Certificate object
-        output_path: Path where the certificate should be saved
+        output_path: Path or binary file object the certificate should be written to
         
     Returns:
-        The path to the saved certificate
+        The path to the saved certificate, or the file object it was written to
         
     Raises:
         ImportError: If reportlab is not installed
@@ -88,55 +410,35 @@ def _create_certificate_pdf(certificate: Certificate, output_path: str) -> str:
         bottomMargin=72
     )
     
-    # Get styles
-    styles = getSampleStyleSheet()
-    title_style = styles["Title"]
-    heading_style = styles["Heading2"]
-    normal_style = styles["Normal"]
-    
-    # Create custom style for monospace text
-    mono_style = ParagraphStyle(
-        "MonoStyle",
-        parent=normal_style,
-        fontName="Courier",
-        fontSize=8,
-        leading=10
-    )
-    
-    # Create the content
-    content = []
+    layout = _certificate_layout()
     
-    # Title
-    content.append(Paragraph("Certificate of Registration", title_style))
-    content.append(Spacer(1, 0.25 * inch))
-    
-    # Introduction
-    intro_text = (
-        "This certificate verifies that the following file hash was registered "
-        "on the blockchain at the specified time. This provides evidence of the "
-        "file's existence at that point in time."
-    )
-    content.append(Paragraph(intro_text, normal_style))
-    content.append(Spacer(1, 0.25 * inch))
+    # Title and introduction
+    content = [
+        layout.title,
+        layout.large_space,
+        layout.intro,
+        layout.large_space,
+    ]
     
     # File information
-    content.append(Paragraph("File Information", heading_style))
-    content.append(Spacer(1, 0.1 * inch))
+    content.append(layout.file_heading)
+    content.append(layout.small_space)
     
     # File hash
-    content.append(Paragraph("Hash (SHA-256):", normal_style))
-    content.append(Paragraph(certificate.hash, mono_style))
-    content.append(Spacer(1, 0.1 * inch))
+    algorithm, _ = split_metadata_tag(certificate.metadata)
+    content.append(layout.hash_label(algorithm))
+    content.append(Paragraph(certificate.hash, layout.mono_style))
+    content.append(layout.small_space)
     
     # File name if available
     if certificate.file_name:
-        content.append(Paragraph("File Name:", normal_style))
-        content.append(Paragraph(certificate.file_name, normal_style))
-        content.append(Spacer(1, 0.1 * inch))
+        content.append(layout.file_name_label)
+        content.append(Paragraph(certificate.file_name, layout.normal_style))
+        content.append(layout.small_space)
     
     # Registration information
-    content.append(Paragraph("Registration Details", heading_style))
-    content.append(Spacer(1, 0.1 * inch))
+    content.append(layout.registration_heading)
+    content.append(layout.small_space)
     
     # Create a table for registration details
     data = [
@@ -152,52 +454,24 @@ def _create_certificate_pdf(certificate: Certificate, output_path: str) -> str:
     
     # Create the table
     table = Table(data, colWidths=[1.5 * inch, 4 * inch])
-    table.setStyle(TableStyle([
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Courier'),
-        ('FONTSIZE', (1, 0), (1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
+    table.setStyle(layout.table_style)
     
     content.append(table)
-    content.append(Spacer(1, 0.25 * inch))
+    content.append(layout.large_space)
     
     # Verification instructions
-    content.append(Paragraph("Verification", heading_style))
-    content.append(Spacer(1, 0.1 * inch))
-    
-    verification_text = (
-        "To verify this registration, you can use the ProveIt tool to check "
-        "the file hash against the blockchain record. Visit https://proveit.example.com "
-        "or use the ProveIt command-line tool."
-    )
-    content.append(Paragraph(verification_text, normal_style))
-    content.append(Spacer(1, 0.1 * inch))
+    content.append(layout.verification_heading)
+    content.append(layout.small_space)
+    content.append(layout.verification)
+    content.append(layout.small_space)
     
     verification_command = f"proveit verify --hash {certificate.hash}"
-    content.append(Paragraph("Command:", normal_style))
-    content.append(Paragraph(verification_command, mono_style))
-    content.append(Spacer(1, 0.25 * inch))
+    content.append(layout.command_label)
+    content.append(Paragraph(verification_command, layout.mono_style))
+    content.append(layout.large_space)
     
     # Legal disclaimer
-    disclaimer_style = ParagraphStyle(
-        "Disclaimer",
-        parent=normal_style,
-        fontSize=8,
-        leading=10,
-        textColor=colors.gray
-    )
-    
-    disclaimer_text = (
-        "DISCLAIMER: This certificate provides evidence of file existence at a specific time. "
-        "It does not constitute copyright registration or legal protection. For legal protection, "
-        "consult with an intellectual property attorney and consider formal copyright registration "
-        "through appropriate government channels."
-    )
-    content.append(Paragraph(disclaimer_text, disclaimer_style))
+    content.append(layout.disclaimer)
     
     # Build the PDF
     doc.build(content)
@@ -216,6 +490,25 @@ def _create_certificate_json(certificate: Certificate, output_path: str) -> str:
     Returns:
         The path to the saved certificate
     """
+    data = _certificate_data(certificate)
+    
+    # Write to file
+    with open(output_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    
+    return output_path
+
+
+def _certificate_data(certificate: Certificate) -> Dict[str, Any]:
+    """
+    Build the data of a JSON certificate.
+    
+    Args:
+        certificate: Certificate object
+    
+    Returns:
+        Dictionary with the certificate fields
+    """
     # Create certificate data
     data = {
         "hash": certificate.hash,
@@ -232,11 +525,7 @@ def _create_certificate_json(certificate: Certificate, output_path: str) -> str:
     if certificate.file_name:
         data["file_name"] = certificate.file_name
     
-    # Write to file
-    with open(output_path, 'w') as f:
-        json.dump(data, f, indent=2)
-    
-    return output_path
+    return data
 
 
 # Monkey patch the Certificate.save method
@@ -251,17 +540,16 @@ def _save_certificate(self, output_path: str) -> str:
         The path to the saved certificate
     """
     # Determine the file format based on the extension
-    output_path = Path(output_path)
+    path = Path(output_path)
     
-    if output_path.suffix.lower() == '.pdf':
-        return _create_certificate_pdf(self, str(output_path))
-    elif output_path.suffix.lower() == '.json':
-        return _create_certificate_json(self, str(output_path))
-    else:
-        # Default to PDF
-        if not output_path.suffix:
-            output_path = output_path.with_suffix('.pdf')
-        return _create_certificate_pdf(self, str(output_path))
+    if path.suffix.lower() == '.json':
+        return _create_certificate_json(self, str(path))
+    
+    # Default to PDF
+    if not path.suffix:
+        path = path.with_suffix('.pdf')
+    _create_certificate_pdf(self, str(path))
+    return str(path)
 
 
 # Apply the monkey patch
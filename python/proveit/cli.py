@@ -6,15 +6,18 @@ This module provides a command-line interface for interacting with the ProveIt s
 
 import os
 import sys
+import csv
 import json
+import time
 import click
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from .cache import VerificationCache
 from .core import ProveIt
 from .models import NetworkType
-from .hash import hash_file
+from .hash import HASH_ALGORITHMS, hash_file
 
 
 @click.group()
@@ -28,12 +31,40 @@ def main():
     pass
 
 
+# ProveIt instances by network, shared between commands when running in the daemon
+_shared_provers: Optional[Dict[str, ProveIt]] = None
+
+
+def _get_prover(network: Optional[str] = None) -> ProveIt:
+    """
+    Get a ProveIt instance for a command.
+    
+    Args:
+        network: Network to use (default: the ProveIt default)
+    
+    Returns:
+        A new ProveIt instance, or in the daemon the shared instance for the network
+    """
+    if _shared_provers is None:
+        return ProveIt(network=network) if network else ProveIt()
+    
+    prover = _shared_provers.get(network or "")
+    if prover is None:
+        # Registrations are permanent, so only positive results are cached across commands
+        cache = VerificationCache(negative_ttl=0)
+        prover = ProveIt(network=network, cache=cache) if network else ProveIt(cache=cache)
+        _shared_provers[network or ""] = prover
+    return prover
+
+
 @main.command()
 @click.argument('file_path', type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True))
 @click.option('--metadata', '-m', help='Optional metadata to associate with the file')
 @click.option('--network', '-n', help='Network to use (mainnet, goerli, polygon, polygonMumbai, localhost)')
 @click.option('--output', '-o', help='Output file for the registration certificate')
-def register(file_path: str, metadata: Optional[str] = None, network: Optional[str] = None, output: Optional[str] = None):
+@click.option('--proof', help='Output file for an offline-verifiable proof certificate')
+@click.option('--algorithm', type=click.Choice(list(HASH_ALGORITHMS)), help='Hash algorithm, recorded in the metadata (default: sha256)')
+def register(file_path: str, metadata: Optional[str] = None, network: Optional[str] = None, output: Optional[str] = None, proof: Optional[str] = None, algorithm: Optional[str] = None):
     """
     Register a file on the blockchain.
     
@@ -41,11 +72,11 @@ def register(file_path: str, metadata: Optional[str] = None, network: Optional[s
     """
     try:
         # Initialize ProveIt with the specified network if provided
-        prover = ProveIt(network=network) if network else ProveIt()
+        prover = _get_prover(network)
         
         # Register the file
         click.echo(f"Registering file: {file_path}")
-        result = prover.register_file(file_path, metadata or "")
+        result = prover.register_file(file_path, metadata or "", algorithm)
         
         # Display the result
         click.echo(f"File registered successfully!")
@@ -62,28 +93,242 @@ def register(file_path: str, metadata: Optional[str] = None, network: Optional[s
             certificate_path = certificate.save(output)
             click.echo(f"Certificate saved to: {certificate_path}")
         
+        # Generate a proof certificate if requested
+        if proof:
+            _write_json(prover.generate_proof_certificate(result), proof)
+            click.echo(f"Proof certificate saved to: {proof}")
+        
     except Exception as e:
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
 
 
+@main.command('register-many')
+@click.argument('inputs', nargs=-1)
+@click.option('--from', 'file_list', type=click.File('r'), help='File listing the paths to register, one per line ("-" for stdin)')
+@click.option('--metadata', '-m', default='', help='Optional metadata to associate with every file')
+@click.option('--network', '-n', help='Network to use (mainnet, goerli, polygon, polygonMumbai, localhost)')
+@click.option('--journal', '-j', default='proveit-journal.jsonl', show_default=True, help='Journal recording the progress, used to resume an interrupted run')
+@click.option('--workers', '-w', type=int, help='Number of hashing threads (default: number of CPUs)')
+@click.option('--max-pending', type=int, default=16, show_default=True, help='Maximum number of unconfirmed transactions')
+def register_many(
+    inputs: Tuple[str, ...],
+    file_list=None,
+    metadata: str = '',
+    network: Optional[str] = None,
+    journal: str = 'proveit-journal.jsonl',
+    workers: Optional[int] = None,
+    max_pending: int = 16
+):
+    """
+    Register many files on the blockchain.
+    
+    INPUTS are files, directories (registered recursively) or glob patterns
+    such as "docs/**/*.pdf". Files are hashed in parallel and registrations
+    are sent without waiting for each one to be mined. Every step is recorded
+    in the journal, so running the same command again after an interruption
+    resumes where it stopped.
+    """
+    from .hash import expand_paths
+    from .journal import RegistrationJournal
+    
+    entries = list(inputs)
+    if file_list is not None:
+        entries.extend(line.strip() for line in file_list if line.strip())
+    
+    if not entries:
+        click.echo("Error: no files given", err=True)
+        sys.exit(1)
+    
+    try:
+        # Initialize ProveIt with the specified network if provided
+        prover = _get_prover(network)
+        
+        file_paths = list(expand_paths(entries))
+        click.echo(f"Registering {len(file_paths)} files (journal: {journal})")
+        
+        progress = _BulkProgress(len(file_paths))
+        with RegistrationJournal(journal) as registration_journal:
+            summary = prover.register_many(
+                file_paths,
+                metadata,
+                journal=registration_journal,
+                workers=workers,
+                max_pending=max_pending,
+                progress=progress
+            )
+        progress.finish()
+        
+        click.echo(f"Hashes: {summary.hashes} from {summary.files} files")
+        click.echo(f"Registered: {summary.confirmed}")
+        click.echo(f"Already registered: {summary.already_registered}")
+        if summary.pending:
+            click.echo(f"Still pending: {summary.pending} (run the command again to follow them up)")
+        
+        if summary.failed:
+            click.echo(f"{len(summary.failed)} registrations failed:", err=True)
+            for file_hash, error in summary.failed.items():
+                click.echo(f"  {file_hash}: {error}", err=True)
+            sys.exit(2)
+    
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+class _BulkProgress:
+    """Progress line for register-many, showing counts and throughput."""
+    
+    def __init__(self, files: int, interval: float = 0.5):
+        self.files = files
+        self.interval = interval
+        self.counts = {"hashed": 0, "skipped": 0, "submitted": 0, "confirmed": 0, "failed": 0}
+        self.bytes = 0
+        self.start = time.monotonic()
+        self.last = 0.0
+        self.tty = sys.stderr.isatty()
+    
+    def __call__(self, event: str, size: int = 0) -> None:
+        self.counts[event] += 1
+        self.bytes += size
+        
+        now = time.monotonic()
+        if now - self.last >= self.interval:
+            self.last = now
+            self._render(now)
+    
+    def finish(self) -> None:
+        self._render(time.monotonic())
+        if self.tty:
+            click.echo(err=True)
+    
+    def _render(self, now: float) -> None:
+        elapsed = max(now - self.start, 1e-6)
+        line = (
+            f"hashed {self.counts['hashed']}/{self.files} ({self.bytes / elapsed / 1e6:.1f} MB/s), "
+            f"skipped {self.counts['skipped']}, submitted {self.counts['submitted']}, "
+            f"confirmed {self.counts['confirmed']} ({self.counts['confirmed'] / elapsed:.1f}/s), "
+            f"failed {self.counts['failed']}"
+        )
+        click.echo(f"\r{line}" if self.tty else line, nl=not self.tty, err=True)
+
+
 @main.command()
-@click.argument('file_path', type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True))
+@click.argument('directory', type=click.Path(exists=True, file_okay=False))
+@click.option('--metadata', '-m', default='', help='Optional metadata to associate with every file')
+@click.option('--network', '-n', help='Network to use (mainnet, goerli, polygon, polygonMumbai, localhost)')
+@click.option('--journal', '-j', help='Journal recording the progress (default: .proveit-journal.jsonl in DIRECTORY)')
+@click.option('--workers', '-w', type=int, help='Number of hashing threads (default: number of CPUs)')
+@click.option('--settle', type=float, default=2.0, show_default=True, help='Seconds a file must stay unchanged before it is hashed')
+@click.option('--batch-interval', type=float, default=30.0, show_default=True, help='Maximum seconds between two batch submissions')
+@click.option('--batch-size', type=int, default=100, show_default=True, help='Number of waiting files that triggers a submission')
+@click.option('--poll', 'polling', is_flag=True, help='Poll the folder instead of using inotify')
+@click.option('--poll-interval', type=float, default=2.0, show_default=True, help='Seconds between two looks at the folder when polling')
+@click.option('--ignore', multiple=True, help='File name pattern to ignore, in addition to hidden and partial files (repeatable)')
+def watch(
+    directory: str,
+    metadata: str = '',
+    network: Optional[str] = None,
+    journal: Optional[str] = None,
+    workers: Optional[int] = None,
+    settle: float = 2.0,
+    batch_interval: float = 30.0,
+    batch_size: int = 100,
+    polling: bool = False,
+    poll_interval: float = 2.0,
+    ignore: Tuple[str, ...] = ()
+):
+    """
+    Register the files added to or changed in a folder, until interrupted.
+    
+    Files already in DIRECTORY are left alone; only files created, modified
+    or moved in while watching are hashed, once they have stopped changing,
+    and registered in periodic batches. Register existing files with
+    register-many using the same journal.
+    """
+    import signal
+    from .journal import RegistrationJournal
+    from .watch import DEFAULT_IGNORE_PATTERNS, FolderRegistrar, create_watcher
+    
+    journal = journal or os.path.join(directory, '.proveit-journal.jsonl')
+    stopping = []
+    
+    try:
+        # Initialize ProveIt with the specified network if provided
+        prover = _get_prover(network)
+        
+        watcher = create_watcher(directory, polling=polling, interval=poll_interval)
+        signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+        
+        with RegistrationJournal(journal) as registration_journal:
+            registrar = FolderRegistrar(
+                prover,
+                watcher,
+                registration_journal,
+                metadata,
+                settle=settle,
+                batch_interval=batch_interval,
+                batch_size=batch_size,
+                workers=workers,
+                ignore=DEFAULT_IGNORE_PATTERNS + ignore,
+                echo=click.echo
+            )
+            
+            click.echo(f"Watching {directory} with {type(watcher).__name__} (journal: {journal})")
+            try:
+                registrar.run(should_stop=lambda: bool(stopping))
+            except KeyboardInterrupt:
+                # run() has submitted the files that were waiting
+                pass
+            finally:
+                watcher.close()
+    
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+@main.command()
+@click.argument('file_paths', nargs=-1, required=True)
 @click.option('--network', '-n', help='Network to use (mainnet, goerli, polygon, polygonMumbai, localhost)')
 @click.option('--output', '-o', help='Output file for the verification result')
-def verify(file_path: str, network: Optional[str] = None, output: Optional[str] = None):
+@click.option('--format', 'format_type', type=click.Choice(['text', 'ndjson', 'csv']), default='text', help='Output format when verifying several files')
+@click.option('--workers', '-w', type=int, help='Number of hashing threads (default: number of CPUs)')
+@click.option('--batch-size', type=int, default=100, show_default=True, help='Number of hashes looked up per bulk query')
+@click.option('--algorithm', 'algorithms', multiple=True, type=click.Choice(list(HASH_ALGORITHMS)), help='Hash algorithm the file may be registered with, for a single file (repeatable; default: sha256)')
+def verify(
+    file_paths: Tuple[str, ...],
+    network: Optional[str] = None,
+    output: Optional[str] = None,
+    format_type: str = 'text',
+    workers: Optional[int] = None,
+    batch_size: int = 100,
+    algorithms: Tuple[str, ...] = ()
+):
     """
-    Verify if a file is registered on the blockchain.
+    Verify if files are registered on the blockchain.
     
-    This command calculates the hash of the specified file and checks if it is registered on the blockchain.
+    This command calculates the hash of each file and checks if it is registered
+    on the blockchain. FILE_PATHS may be files, directories (verified
+    recursively) or glob patterns. With several files, or with --format ndjson
+    or csv, the files are hashed in parallel, looked up in bulk and a result is
+    written per file as soon as its batch completes; the command then exits with
+    status 2 if any file is not registered. A single file can be checked for
+    registrations made with several --algorithm values, in one read.
     """
+    if len(file_paths) > 1 or format_type != 'text' or not os.path.isfile(file_paths[0]):
+        _verify_many(file_paths, network, output, format_type, workers, batch_size)
+        return
+    
+    file_path = file_paths[0]
+    
     try:
         # Initialize ProveIt with the specified network if provided
-        prover = ProveIt(network=network) if network else ProveIt()
+        prover = _get_prover(network)
         
         # Verify the file
         click.echo(f"Verifying file: {file_path}")
-        result = prover.verify_file(file_path)
+        result = prover.verify_file(file_path, algorithms or None)
         
         # Display the result
         if result.is_registered:
@@ -96,7 +341,7 @@ def verify(file_path: str, network: Optional[str] = None, output: Optional[str]
                 click.echo(f"Metadata: {result.metadata}")
             
             # Generate a certificate if requested
-            if output:
+            if output and result.hash is not None:
                 certificate = prover.generate_certificate(result.hash)
                 certificate.file_name = Path(file_path).name
                 certificate_path = certificate.save(output)
@@ -116,6 +361,287 @@ def verify(file_path: str, network: Optional[str] = None, output: Optional[str]
         sys.exit(1)
 
 
+# Columns of the CSV output of verify
+VERIFY_CSV_FIELDS = ['path', 'hash', 'is_registered', 'owner', 'timestamp', 'metadata', 'network']
+
+
+def _verify_many(
+    inputs: Tuple[str, ...],
+    network: Optional[str],
+    output: Optional[str],
+    format_type: str,
+    workers: Optional[int],
+    batch_size: int
+) -> None:
+    """
+    Verify many files and stream one result per file.
+    
+    Args:
+        inputs: Files, directories or glob patterns
+        network: Network to use, or None for the default
+        output: File to write the results to, or None for standard output
+        format_type: "text", "ndjson" or "csv"
+        workers: Number of hashing threads, or None for the number of CPUs
+        batch_size: Number of hashes looked up per bulk query
+    """
+    from .hash import expand_paths
+    
+    stream = open(output, 'w', newline='') if output else sys.stdout
+    missing = 0
+    
+    try:
+        # Initialize ProveIt with the specified network if provided
+        prover = _get_prover(network)
+        
+        writer = None
+        if format_type == 'csv':
+            writer = csv.DictWriter(stream, fieldnames=VERIFY_CSV_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+        
+        for file_path, result in prover.iter_verify_files(expand_paths(inputs), workers, batch_size):
+            row = {'path': str(file_path), **result.to_dict()}
+            
+            if not result.is_registered:
+                missing += 1
+            
+            if format_type == 'ndjson':
+                stream.write(json.dumps(row) + '\n')
+            elif writer is not None:
+                writer.writerow(row)
+            elif result.is_registered:
+                stream.write(f"{file_path}: registered by {result.owner} at {result.timestamp.isoformat()}\n")
+            elif result.hash is None:
+                stream.write(f"{file_path}: could not be read\n")
+            else:
+                stream.write(f"{file_path}: not registered ({result.hash})\n")
+            
+            stream.flush()
+    
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+    finally:
+        if output:
+            stream.close()
+    
+    if missing:
+        sys.exit(2)
+
+
+@main.command()
+@click.argument('manifest', type=click.Path(dir_okay=False))
+@click.argument('inputs', nargs=-1)
+@click.option('--network', '-n', help='Network to use (mainnet, goerli, polygon, polygonMumbai, localhost)')
+@click.option('--output', '-o', help='Output file for the JSON report')
+@click.option('--format', 'format_type', type=click.Choice(['text', 'json']), default='text', help='Report format')
+@click.option('--workers', '-w', type=int, help='Number of hashing threads (default: number of CPUs)')
+@click.option('--batch-size', type=int, default=100, show_default=True, help='Number of hashes looked up per bulk query')
+@click.option('--rehash', is_flag=True, help='Rehash every file, even those whose size and modification time did not change')
+@click.option('--recheck', is_flag=True, help='Look up every registration, even those already confirmed')
+def audit(
+    manifest: str,
+    inputs: Tuple[str, ...],
+    network: Optional[str] = None,
+    output: Optional[str] = None,
+    format_type: str = 'text',
+    workers: Optional[int] = None,
+    batch_size: int = 100,
+    rehash: bool = False,
+    recheck: bool = False
+):
+    """
+    Check that an archive still matches its registrations.
+    
+    MANIFEST records the size, modification time, hash and registration of
+    every file, and is created by the first audit of INPUTS (files,
+    directories or glob patterns). Later audits reuse the recorded INPUTS
+    unless new ones are given, rehash only the files whose size or
+    modification time changed and look up only the hashes not yet
+    registered. Exits with status 2 if files were modified or removed since
+    the previous audit, or are not registered.
+    """
+    from .audit import AuditManifest, audit as run_audit
+    
+    try:
+        prover = _get_prover(network)
+        report = run_audit(
+            prover,
+            AuditManifest(manifest),
+            inputs,
+            workers=workers,
+            batch_size=batch_size,
+            rehash=rehash,
+            recheck=recheck
+        )
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+    
+    if output:
+        _write_json(report.to_dict(), output)
+    
+    if format_type == 'json':
+        click.echo(json.dumps(report.to_dict(), indent=2))
+    else:
+        click.echo(
+            f"Audited {report.files} files: {report.unchanged} unchanged, "
+            f"{report.rehashed} rehashed, {report.queried} hashes looked up"
+        )
+        for title, paths in [
+            ("Added", report.added),
+            ("Modified", report.modified),
+            ("Missing", report.missing),
+            ("Newly registered", report.newly_registered),
+            ("Not registered", report.unregistered),
+        ]:
+            if paths:
+                click.echo(f"{title} ({len(paths)}):")
+                for path in paths:
+                    click.echo(f"  {path}")
+        if output:
+            click.echo(f"Report saved to: {output}")
+    
+    if not report.ok:
+        sys.exit(2)
+
+
+@main.command()
+@click.argument('inputs', nargs=-1, required=True)
+@click.option('--format', 'format_type', type=click.Choice(['text', 'json']), default='text', help='Report format')
+@click.option('--workers', '-w', type=int, help='Number of threads (default: number of CPUs)')
+def duplicates(inputs: Tuple[str, ...], format_type: str = 'text', workers: Optional[int] = None):
+    """
+    Find files with identical content.
+    
+    INPUTS are files, directories (searched recursively) or glob patterns.
+    Files are grouped by size and by samples of their content before any is
+    hashed, so each distinct content is hashed once. No network access is
+    needed.
+    """
+    from .hash import expand_paths, hash_files_deduplicated
+    
+    try:
+        hashes, groups = hash_files_deduplicated(expand_paths(inputs), workers)
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+    
+    report: Dict[str, Any] = {
+        'files': len(hashes),
+        'distinct': len(set(hashes.values())),
+        'groups': [
+            {'hash': hashes[paths[0]], 'size': paths[0].stat().st_size, 'paths': [str(path) for path in paths]}
+            for paths in groups
+        ]
+    }
+    
+    if format_type == 'json':
+        click.echo(json.dumps(report, indent=2))
+        return
+    
+    click.echo(f"{report['files']} files, {report['distinct']} distinct contents")
+    for group in report['groups']:
+        click.echo(f"{group['hash']} ({len(group['paths'])} files of {group['size']} bytes):")
+        for path in group['paths']:
+            click.echo(f"  {path}")
+
+
+@main.command('hash-archive')
+@click.argument('archives', nargs=-1, required=True, type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True))
+@click.option('--output', '-o', help='Output file for the manifest (default: standard output)')
+@click.option('--format', 'format_type', type=click.Choice(['csv', 'ndjson']), default='csv', help='Manifest format')
+@click.option('--workers', '-w', type=int, help='Number of hashing threads for zip archives (default: number of CPUs)')
+@click.option('--verify', 'verify_members', is_flag=True, help='Look up the registration of every member')
+@click.option('--register', 'register_members', is_flag=True, help='Register every member that is not registered yet')
+@click.option('--metadata', '-m', help='Metadata to register with every member (default: the member path)')
+@click.option('--network', '-n', help='Network to use (mainnet, goerli, polygon, polygonMumbai, localhost)')
+@click.option('--journal', '-j', help='Journal recording the progress of --register, used to resume an interrupted run')
+def hash_archive_command(
+    archives: Tuple[str, ...],
+    output: Optional[str] = None,
+    format_type: str = 'csv',
+    workers: Optional[int] = None,
+    verify_members: bool = False,
+    register_members: bool = False,
+    metadata: Optional[str] = None,
+    network: Optional[str] = None,
+    journal: Optional[str] = None
+):
+    """
+    Hash the files inside zip or tar archives without extracting them.
+    
+    Writes one "hash,member" line per file (the manifest format read by
+    "proveit certificates --from"), or one JSON object per file with
+    --format ndjson. With several archives, members are prefixed with the
+    archive name. --verify adds the registration status of each member and
+    exits with status 2 if some are not registered; --register registers
+    the members that are not registered yet, like register-many.
+    """
+    from .hash import hash_archive
+    from .journal import RegistrationJournal
+    
+    stream = open(output, 'w', newline='') if output else sys.stdout
+    members = []
+    
+    try:
+        for archive in archives:
+            for name, file_hash in hash_archive(archive, workers):
+                member = f"{archive}:{name}" if len(archives) > 1 else name
+                if verify_members or register_members:
+                    members.append((member, file_hash))
+                else:
+                    _write_archive_member(stream, format_type, member, file_hash)
+        
+        if register_members:
+            prover = _get_prover(network)
+            member_metadata: Dict[str, str] = {}
+            for member, file_hash in members:
+                member_metadata.setdefault(file_hash, metadata if metadata is not None else member)
+            registration_journal = RegistrationJournal(journal) if journal else None
+            try:
+                summary = prover.register_hashes(list(member_metadata), member_metadata, journal=registration_journal)
+            finally:
+                if registration_journal is not None:
+                    registration_journal.close()
+            click.echo(
+                f"Registered: {summary.confirmed}, already registered: {summary.already_registered}, "
+                f"still pending: {summary.pending}, failed: {len(summary.failed)}",
+                err=True
+            )
+            for file_hash, error in summary.failed.items():
+                click.echo(f"  {file_hash}: {error}", err=True)
+        
+        missing = 0
+        if verify_members or register_members:
+            prover = _get_prover(network)
+            for start in range(0, len(members), 100):
+                batch = members[start:start + 100]
+                for (member, file_hash), result in zip(batch, prover.verify_hashes([file_hash for _, file_hash in batch])):
+                    missing += not result.is_registered
+                    _write_archive_member(stream, format_type, member, file_hash, result.is_registered)
+    
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+    finally:
+        if output:
+            stream.close()
+    
+    if missing:
+        sys.exit(2)
+
+
+def _write_archive_member(stream, format_type: str, member: str, file_hash: str, is_registered: Optional[bool] = None) -> None:
+    if format_type == 'ndjson':
+        row: Dict[str, Any] = {'hash': file_hash, 'path': member}
+        if is_registered is not None:
+            row['is_registered'] = is_registered
+        stream.write(json.dumps(row) + '\n')
+    else:
+        csv.writer(stream).writerow([file_hash, member] + ([is_registered] if is_registered is not None else []))
+    stream.flush()
+
+
 @main.command()
 @click.option('--hash', '-h', required=True, help='Hash to verify')
 @click.option('--network', '-n', help='Network to use (mainnet, goerli, polygon, polygonMumbai, localhost)')
@@ -128,7 +654,7 @@ def verify_hash(hash: str, network: Optional[str] = None, output: Optional[str]
     """
     try:
         # Initialize ProveIt with the specified network if provided
-        prover = ProveIt(network=network) if network else ProveIt()
+        prover = _get_prover(network)
         
         # Verify the hash
         click.echo(f"Verifying hash: {hash}")
@@ -162,30 +688,542 @@ def verify_hash(hash: str, network: Optional[str] = None, output: Optional[str]
         sys.exit(1)
 
 
+@main.command()
+@click.option('--hash', '-h', required=True, help='Registered hash')
+@click.option('--tx', 'tx_hash', help='Hash of the transaction that registered it (default: look it up)')
+@click.option('--network', '-n', help='Network to use (mainnet, goerli, polygon, polygonMumbai, localhost)')
+@click.option('--output', '-o', required=True, help='Output file for the proof certificate')
+def proof(hash: str, output: str, tx_hash: Optional[str] = None, network: Optional[str] = None):
+    """
+    Generate an offline-verifiable proof certificate for a registration.
+    
+    The certificate embeds the block header, the transaction receipt and a
+    receipt trie proof, so it can later be checked with verify-certificate
+    without querying the blockchain.
+    """
+    try:
+        # Initialize ProveIt with the specified network if provided
+        prover = _get_prover(network)
+        
+        click.echo(f"Generating proof certificate for: {hash}")
+        _write_json(prover.generate_proof_certificate(hash, tx_hash), output)
+        click.echo(f"Proof certificate saved to: {output}")
+    
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+@main.command('verify-certificate')
+@click.argument('certificate_paths', nargs=-1, required=True, type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True))
+@click.option('--trusted-blocks', type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True), help='File listing trusted block hashes, one per line or as a JSON list')
+@click.option('--network', '-n', help='Network to fetch the block hashes from when no trusted blocks are given')
+@click.option('--contract', help='Expected address of the ProveIt contract (default: the contract of --network, or of the configured network)')
+def verify_certificate(certificate_paths: Tuple[str, ...], trusted_blocks: Optional[str] = None, network: Optional[str] = None, contract: Optional[str] = None):
+    """
+    Check proof certificates locally.
+    
+    Each certificate is checked against its embedded block header, receipt
+    and receipt trie proof. The block must be one of the trusted blocks; if no
+    trusted blocks are given, the hashes of the blocks are fetched from the
+    network in a single batched request. The registration must have been made
+    with the ProveIt contract, not merely with the contract the certificate
+    names.
+    """
+    from .proof import ProofError, load_trusted_block_hashes, verify_proof_certificate
+    
+    if not trusted_blocks and not network:
+        click.echo("Error: either --trusted-blocks or --network is required", err=True)
+        sys.exit(1)
+    
+    try:
+        certificates = {}
+        failed = []
+        
+        for path in certificate_paths:
+            try:
+                with open(path, 'r') as f:
+                    certificate = json.load(f)
+            except (OSError, ValueError) as e:
+                failed.append((path, f"cannot read certificate: {e}"))
+                continue
+            
+            if isinstance(certificate, dict):
+                certificates[path] = certificate
+            else:
+                failed.append((path, "not a proof certificate"))
+        
+        if not contract:
+            contract = _get_prover(network).blockchain.contract.address
+        
+        if trusted_blocks:
+            trusted = load_trusted_block_hashes(trusted_blocks)
+        else:
+            prover = _get_prover(network)
+            block_numbers = [
+                c["block_number"] for c in certificates.values()
+                if isinstance(c.get("block_number"), int)
+            ]
+            trusted = set(prover.blockchain.get_block_hashes(block_numbers).values())
+        
+        for path, certificate in certificates.items():
+            try:
+                result = verify_proof_certificate(certificate, trusted, contract)
+            except ProofError as e:
+                failed.append((path, str(e)))
+                continue
+            
+            click.echo(f"Valid: {path}")
+            click.echo(f"  Hash: {result['hash']}")
+            click.echo(f"  Owner: {result['owner']}")
+            click.echo(f"  Timestamp: {result['timestamp'].isoformat()}")
+            click.echo(f"  Block: {result['block_number']} ({result['block_hash']})")
+        
+        for path, reason in failed:
+            click.echo(f"Invalid: {path}: {reason}", err=True)
+        
+        if failed:
+            sys.exit(2)
+    
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+def _write_json(data, output: str) -> None:
+    """
+    Write a JSON document to a file.
+    
+    Args:
+        data: Data to write
+        output: Path of the file
+    """
+    with open(output, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+@main.command()
+@click.option('--from', 'manifest', required=True, type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True), help='Manifest listing the registrations to certify')
+@click.option('--output', '-o', required=True, help='Zip archive to write the certificates to')
+@click.option('--format', 'format_type', type=click.Choice(['pdf', 'json']), default='pdf', help='Certificate format')
+@click.option('--workers', '-w', type=int, help='Number of rendering processes (default: number of CPUs)')
+@click.option('--network', '-n', help='Network to use (mainnet, goerli, polygon, polygonMumbai, localhost)')
+def certificates(manifest: str, output: str, format_type: str = 'pdf', workers: Optional[int] = None, network: Optional[str] = None):
+    """
+    Generate certificates for many registrations into a single zip archive.
+    
+    Each line of the manifest is a hash, a "hash,file_name" pair, or a JSON
+    object with a "hash" and an optional "file_name" or "path". Registrations
+    are looked up in bulk and the certificates are rendered by a pool of
+    processes and streamed into the archive as they complete.
+    """
+    from .certificate import write_certificates_zip
+    
+    try:
+        # Initialize ProveIt with the specified network if provided
+        prover = _get_prover(network)
+        
+        rendered = 0
+        missing = []
+        
+        def registered_certificates():
+            nonlocal rendered
+            for file_hash, certificate in prover.generate_certificates(_read_certificate_manifest(manifest)):
+                if certificate is None:
+                    missing.append(file_hash)
+                else:
+                    rendered += 1
+                    yield certificate
+        
+        click.echo(f"Generating certificates from: {manifest}")
+        write_certificates_zip(registered_certificates(), output, format_type, workers=workers)
+        click.echo(f"{rendered} certificates saved to: {output}")
+        
+        if missing:
+            click.echo(f"{len(missing)} hashes are not registered:", err=True)
+            for file_hash in missing:
+                click.echo(f"  {file_hash}", err=True)
+            sys.exit(2)
+    
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+def _read_certificate_manifest(manifest: str):
+    """
+    Read the (hash, file_name) pairs listed in a certificate manifest.
+    
+    Lines other than JSON objects are read as CSV rows, so quoted file names
+    and extra columns, such as the status written by "hash-archive --verify",
+    are handled.
+    
+    Args:
+        manifest: Path to the manifest
+    
+    Yields:
+        (hash, file_name) pairs; file_name is None if the line does not name a file
+    """
+    with open(manifest, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            if line.startswith('{'):
+                entry = json.loads(line)
+                file_name = entry.get('file_name') or entry.get('filename')
+                if not file_name and entry.get('path'):
+                    file_name = Path(entry['path']).name
+                yield entry['hash'], file_name
+            else:
+                row = next(csv.reader([line]))
+                file_name = row[1].strip() if len(row) > 1 else ''
+                yield row[0].strip(), file_name or None
+
+
+DEFAULT_OUTBOX = os.path.join('~', '.proveit', 'outbox.sqlite')
+
+
+@main.group()
+def outbox():
+    """
+    Queue registrations locally and submit them later.
+    
+    Registrations added to the outbox are stored in a local SQLite database
+    right away, whether or not the network is reachable, and submitted in
+    batches by "proveit outbox flush".
+    """
+    pass
+
+
+@outbox.command('add')
+@click.argument('inputs', nargs=-1)
+@click.option('--hash', 'hashes', multiple=True, help='Hash to queue, without a file (repeatable)')
+@click.option('--metadata', '-m', default='', help='Optional metadata to associate with every file')
+@click.option('--network', '-n', default='polygon', show_default=True, help='Network to register on (mainnet, goerli, polygon, polygonMumbai, localhost)')
+@click.option('--outbox', 'outbox_path', default=DEFAULT_OUTBOX, show_default=True, help='Outbox database')
+@click.option('--workers', '-w', type=int, help='Number of hashing threads (default: number of CPUs)')
+def outbox_add(inputs: Tuple[str, ...], hashes: Tuple[str, ...] = (), metadata: str = '', network: str = 'polygon', outbox_path: str = DEFAULT_OUTBOX, workers: Optional[int] = None):
+    """
+    Queue files or hashes for registration.
+    
+    INPUTS are files, directories (queued recursively) or glob patterns. No
+    network access is needed.
+    """
+    from .hash import expand_paths, hash_files
+    from .outbox import RegistrationOutbox
+    
+    try:
+        entries: List[Tuple[str, str, Optional[str]]] = [(file_hash, metadata, None) for file_hash in hashes]
+        entries.extend(
+            (file_hash, metadata, str(path))
+            for path, file_hash in hash_files(expand_paths(inputs), workers)
+        )
+        
+        with RegistrationOutbox(_outbox_path(outbox_path)) as registration_outbox:
+            added = registration_outbox.enqueue_many(entries, network)
+        
+        click.echo(f"Queued {added} registrations ({len(entries) - added} already in the outbox)")
+    
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+@outbox.command('flush')
+@click.option('--network', '-n', help='Network whose registrations to submit (mainnet, goerli, polygon, polygonMumbai, localhost)')
+@click.option('--outbox', 'outbox_path', default=DEFAULT_OUTBOX, show_default=True, help='Outbox database')
+@click.option('--batch-size', type=int, default=500, show_default=True, help='Number of registrations per batch')
+@click.option('--max-pending', type=int, default=16, show_default=True, help='Maximum number of unconfirmed transactions')
+@click.option('--watch', 'interval', type=float, help='Keep flushing every INTERVAL seconds, retrying while the network is unreachable')
+def outbox_flush(network: Optional[str] = None, outbox_path: str = DEFAULT_OUTBOX, batch_size: int = 500, max_pending: int = 16, interval: Optional[float] = None):
+    """
+    Submit the queued registrations.
+    
+    Registrations already on chain are skipped, and transactions sent by an
+    earlier flush are followed up instead of being sent again. Exits with
+    status 2 if some registrations failed.
+    """
+    from .outbox import RegistrationOutbox
+    
+    with RegistrationOutbox(_outbox_path(outbox_path)) as registration_outbox:
+        while True:
+            try:
+                prover = _get_prover(network)
+                summary = registration_outbox.flush(prover, batch_size=batch_size, max_pending=max_pending)
+                click.echo(
+                    f"Registered: {summary.confirmed}, already registered: {summary.already_registered}, "
+                    f"still pending: {summary.pending}, failed: {len(summary.failed)}"
+                )
+                for file_hash, error in summary.failed.items():
+                    click.echo(f"  {file_hash}: {error}", err=True)
+                failed = bool(summary.failed)
+            except Exception as e:
+                if interval is None:
+                    click.echo(f"Error: {str(e)}", err=True)
+                    sys.exit(1)
+                click.echo(f"Flush failed, retrying in {interval:g} s: {str(e)}", err=True)
+            
+            if interval is None:
+                sys.exit(2 if failed else 0)
+            
+            try:
+                time.sleep(interval)
+            except KeyboardInterrupt:
+                return
+
+
+@outbox.command('status')
+@click.option('--network', '-n', help='Only count the registrations for this network')
+@click.option('--outbox', 'outbox_path', default=DEFAULT_OUTBOX, show_default=True, help='Outbox database')
+def outbox_status(network: Optional[str] = None, outbox_path: str = DEFAULT_OUTBOX):
+    """
+    Show the number of registrations in each state.
+    """
+    from .outbox import RegistrationOutbox
+    
+    with RegistrationOutbox(_outbox_path(outbox_path)) as registration_outbox:
+        for state, count in registration_outbox.counts(network).items():
+            click.echo(f"{state}: {count}")
+
+
+def _outbox_path(path: str) -> str:
+    path = os.path.expanduser(path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    return path
+
+
+@main.group()
+def daemon():
+    """
+    Manage the ProveIt daemon.
+    
+    While the daemon runs, proveit commands are forwarded to it over a Unix
+    socket and skip loading web3, reportlab and the blockchain connector.
+    """
+    pass
+
+
+@daemon.command('start')
+@click.option('--socket', 'socket_path', help='Socket to listen on (default: $PROVEIT_SOCKET or ~/.proveit/daemon.sock)')
+@click.option('--warm-network', multiple=True, help='Network to connect to at startup (repeatable)')
+@click.option('--foreground', is_flag=True, help='Run in this process instead of in the background')
+@click.option('--log', 'log_path', help='Log file of a background daemon (default: next to the socket)')
+def daemon_start(socket_path: Optional[str] = None, warm_network: Tuple[str, ...] = (), foreground: bool = False, log_path: Optional[str] = None):
+    """
+    Start the daemon.
+    """
+    import subprocess
+    from .daemon import ProveItDaemon, daemon_request, default_socket_path
+    
+    socket_path = socket_path or default_socket_path()
+    
+    if daemon_request({"control": "status"}, socket_path) is not None:
+        click.echo(f"Error: a ProveIt daemon is already running on {socket_path}", err=True)
+        sys.exit(1)
+    
+    if foreground:
+        click.echo(f"ProveIt daemon listening on {socket_path}")
+        try:
+            ProveItDaemon(socket_path, warm_network).serve_forever()
+        except Exception as e:
+            click.echo(f"Error: {str(e)}", err=True)
+            sys.exit(1)
+        return
+    
+    os.makedirs(os.path.dirname(socket_path) or '.', mode=0o700, exist_ok=True)
+    log_path = log_path or os.path.splitext(socket_path)[0] + '.log'
+    command = [sys.executable, '-m', 'proveit.cli', 'daemon', 'start', '--foreground', '--socket', socket_path]
+    for network in warm_network:
+        command += ['--warm-network', network]
+    
+    with open(log_path, 'a') as log:
+        process = subprocess.Popen(
+            command, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, start_new_session=True
+        )
+    
+    # Wait for the daemon to answer, so that the next command is forwarded
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        status = daemon_request({"control": "status"}, socket_path)
+        if status is not None:
+            click.echo(f"ProveIt daemon started (pid {status['pid']}, socket {socket_path})")
+            return
+        if process.poll() is not None:
+            break
+        time.sleep(0.1)
+    
+    click.echo(f"Error: the daemon did not start, see {log_path}", err=True)
+    sys.exit(1)
+
+
+@daemon.command('stop')
+@click.option('--socket', 'socket_path', help='Socket of the daemon (default: $PROVEIT_SOCKET or ~/.proveit/daemon.sock)')
+def daemon_stop(socket_path: Optional[str] = None):
+    """
+    Stop the daemon.
+    """
+    from .daemon import daemon_request
+    
+    if daemon_request({"control": "stop"}, socket_path) is None:
+        click.echo("No ProveIt daemon is running")
+        sys.exit(1)
+    click.echo("ProveIt daemon stopped")
+
+
+@daemon.command('status')
+@click.option('--socket', 'socket_path', help='Socket of the daemon (default: $PROVEIT_SOCKET or ~/.proveit/daemon.sock)')
+def daemon_status(socket_path: Optional[str] = None):
+    """
+    Show whether the daemon is running.
+    """
+    from .daemon import daemon_request
+    
+    status = daemon_request({"control": "status"}, socket_path)
+    if status is None:
+        click.echo("No ProveIt daemon is running")
+        sys.exit(1)
+    
+    click.echo(f"ProveIt daemon running (pid {status['pid']}, socket {status['socket']})")
+    click.echo(f"Uptime: {status['uptime']} s, commands served: {status['requests']}")
+    click.echo(f"Warm networks: {', '.join(name or 'default' for name in status['networks']) or 'none'}")
+
+
 @main.command()
 @click.option('--port', '-p', default=8000, help='Port to run the server on')
 @click.option('--host', '-h', default='127.0.0.1', help='Host to run the server on')
-def serve(port: int, host: str):
+@click.option('--production', is_flag=True, help='Serve with the multi-process production server (requires gunicorn)')
+@click.option('--bind', '-b', multiple=True, help='Socket to bind in production mode, e.g. 0.0.0.0:8000 or unix:/run/proveit.sock (repeatable)')
+@click.option('--workers', '-w', type=int, help='Number of worker processes in production mode (default: 2 x CPUs + 1)')
+@click.option('--threads', type=int, default=4, help='Number of threads per worker in production mode')
+@click.option('--keep-alive', type=int, default=5, help='Seconds to keep idle client connections open in production mode')
+@click.option('--timeout', type=int, default=30, help='Seconds before a silent worker is restarted in production mode')
+@click.option('--graceful-timeout', type=int, default=30, help='Seconds workers get to finish requests on reload or shutdown')
+@click.option('--warm-network', multiple=True, help='Network whose connector each worker creates at startup (repeatable)')
+def serve(
+    port: int,
+    host: str,
+    production: bool = False,
+    bind: Tuple[str, ...] = (),
+    workers: Optional[int] = None,
+    threads: int = 4,
+    keep_alive: int = 5,
+    timeout: int = 30,
+    graceful_timeout: int = 30,
+    warm_network: Tuple[str, ...] = ()
+):
     """
     Start a local web server for the ProveIt web interface.
     
     This command starts a Flask server that serves the ProveIt web interface.
+    With --production, the interface is served by a pre-forking gunicorn server
+    with several worker processes and threads. Send SIGHUP to reload the
+    workers gracefully and SIGTERM to shut down after in-flight requests.
     """
     try:
         from .web import create_app
         
-        click.echo(f"Starting ProveIt web server on http://{host}:{port}")
         app = create_app()
-        app.run(host=host, port=port)
         
-    except ImportError:
-        click.echo("Error: Flask is required for the web interface. Install it with: pip install flask", err=True)
+        if production:
+            from .web.server import build_production_server
+            
+            # Built first, so that invalid settings fail here instead of in every worker
+            sockets = list(bind) or [f"{host}:{port}"]
+            server = build_production_server(
+                app,
+                bind=sockets,
+                workers=workers,
+                threads=threads,
+                keep_alive=keep_alive,
+                timeout=timeout,
+                graceful_timeout=graceful_timeout,
+                warm_networks=warm_network
+            )
+            click.echo(f"Starting ProveIt production server on {', '.join(sockets)}")
+            server.run()
+        else:
+            click.echo(f"Starting ProveIt web server on http://{host}:{port}")
+            app.run(host=host, port=port)
+    
+    except ImportError as e:
+        if 'gunicorn' in str(e):
+            click.echo(f"Error: {str(e)}", err=True)
+        else:
+            click.echo("Error: Flask is required for the web interface. Install it with: pip install flask", err=True)
         sys.exit(1)
     except Exception as e:
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
 
 
+@main.command()
+@click.option('--only', 'sections', multiple=True, type=click.Choice(['hash', 'rpc', 'register', 'certificates', 'web']), help='Benchmark to run (repeatable, default: all that apply)')
+@click.option('--network', '-n', help='Network to measure RPC latency against (default: skip the RPC benchmarks)')
+@click.option('--rpc-endpoint', help='RPC endpoint of the node to use, e.g. a local development node')
+@click.option('--contract', help='Address of the ProveIt contract on that node')
+@click.option('--register', 'include_register', is_flag=True, help='Also time real registrations (spends gas)')
+@click.option('--quick', is_flag=True, help='Shorter runs and smaller files, for a rough figure')
+@click.option('--format', 'format_type', type=click.Choice(['text', 'json']), default='text', help='Output format')
+@click.option('--output', '-o', help='Also write the JSON report to this file')
+def bench(
+    sections: Tuple[str, ...] = (),
+    network: Optional[str] = None,
+    rpc_endpoint: Optional[str] = None,
+    contract: Optional[str] = None,
+    include_register: bool = False,
+    quick: bool = False,
+    format_type: str = 'text',
+    output: Optional[str] = None
+):
+    """
+    Measure ProveIt's performance on this host.
+    
+    Reports hash_file throughput across file and chunk sizes, hash_content
+    calls per second, certificate renders per second and web endpoint latency.
+    With --network, RPC round trips are timed against that network's node,
+    and with --register, registrations too. The JSON report (--format json or
+    --output) is meant to be kept and compared across releases.
+    """
+    from .bench import BENCH_SECTIONS, DEFAULT_CHUNK_SIZES, DEFAULT_FILE_SIZES, format_report, run_benchmarks
+    
+    selected = list(sections) or [s for s in BENCH_SECTIONS if s != 'rpc' or network]
+    if include_register and 'register' not in selected:
+        selected.append('register')
+    
+    try:
+        prover = None
+        if 'rpc' in selected or 'register' in selected:
+            if not network:
+                click.echo("Error: the rpc and register benchmarks need --network", err=True)
+                sys.exit(1)
+            prover = ProveIt(network=network, rpc_endpoint=rpc_endpoint, contract_address=contract)
+        
+        report = run_benchmarks(
+            selected,
+            prover=prover,
+            network=network if rpc_endpoint is None else None,
+            duration=0.2 if quick else 1.0,
+            samples=5 if quick else 20,
+            file_sizes=[s for s in DEFAULT_FILE_SIZES if not quick or s <= 1024 * 1024],
+            chunk_sizes=DEFAULT_CHUNK_SIZES,
+            progress=lambda section: click.echo(f"Running {section} benchmark...", err=True)
+        )
+        
+        if output:
+            _write_json(report, output)
+        
+        if format_type == 'json':
+            click.echo(json.dumps(report, indent=2))
+        else:
+            click.echo(format_report(report))
+    
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
 @main.command()
 @click.option('--network', help='Default network to use (mainnet, goerli, polygon, polygonMumbai, localhost)')
 @click.option('--wallet-type', help='Default wallet type to use (metamask, rabby, walletconnect)')
@@ -7,17 +7,38 @@ interacting with the ProveIt system.
 
 import json
 import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
+from typing import Callable, Deque, Dict, Any, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
-from .blockchain import BlockchainConnector
-from .hash import hash_file, hash_content
-from .models import RegistrationResult, VerificationResult, Certificate, NetworkType
+from web3.exceptions import TimeExhausted
+
+from .admission import AdmissionGate, RPCOverloadedError
+from .blockchain import BlockchainConnector, RPCDeadlineExceededError
+from .cache import VerificationCache
+from .hash import (
+    DEFAULT_ALGORITHM, Hash32, hash_file, hash_file_multi, hash_files, hash_files_deduplicated, hash_content,
+    new_hasher, normalize_hash, split_metadata_tag, tag_metadata
+)
+from .journal import FINAL_STATES, RegistrationJournal
+from .models import BulkRegistrationSummary, RegistrationResult, VerificationResult, Certificate, NetworkType
+
+# Number of hashes per bulk lookup
+VERIFY_BATCH_SIZE = 100
+
+
+def _no_progress(event: str, size: int) -> None:
+    """Progress callback of bulk registrations run without one."""
 
 
 class ProveIt:
     """
     Main class for interacting with the ProveIt system.
+    
+    An instance can be shared between threads.
     """
     
     def __init__(
@@ -28,7 +49,12 @@ class ProveIt:
         rpc_endpoint: Optional[str] = None,
         private_key: Optional[str] = None,
         infura_api_key: Optional[str] = None,
-        gas_price_strategy: str = "medium"
+        gas_price_strategy: str = "medium",
+        cache: Optional[VerificationCache] = None,
+        request_timeout: Optional[float] = None,
+        admission: Optional[AdmissionGate] = None,
+        max_workers: Optional[int] = None,
+        hash_algorithm: str = DEFAULT_ALGORITHM
     ):
         """
         Initialize the ProveIt instance.
@@ -41,10 +67,25 @@ class ProveIt:
             private_key: Private key for signing transactions (default: use from environment)
             infura_api_key: Infura API key (default: use from environment)
             gas_price_strategy: Gas price strategy to use (default: medium)
+            cache: Cache of verification results to consult before querying the blockchain (default: no cache)
+            request_timeout: Timeout of each HTTP request to the RPC endpoint, in seconds (default: web3 default)
+            admission: Gate limiting the number of concurrent RPC calls (default: no limit)
+            max_workers: Number of bulk lookups a batch verification runs at once (default: 1)
+            hash_algorithm: Hash algorithm of new single-file registrations (default: sha256);
+                verify_file also checks for SHA-256 registrations, in the same read
+        
+        Raises:
+            ValueError: If the hash algorithm is not registered
         """
         self.network = network
         self.wallet_provider = wallet_provider
         self.gas_price_strategy = gas_price_strategy
+        self.cache = cache
+        self.max_workers = max_workers or 1
+        new_hasher(hash_algorithm)
+        self.hash_algorithm = hash_algorithm
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
         
         # Initialize blockchain connector
         self.blockchain = BlockchainConnector(
@@ -52,7 +93,9 @@ class ProveIt:
             contract_address=contract_address,
             rpc_endpoint=rpc_endpoint,
             private_key=private_key,
-            infura_api_key=infura_api_key
+            infura_api_key=infura_api_key,
+            request_timeout=request_timeout,
+            admission=admission
         )
         
         # Load configuration
@@ -81,13 +124,15 @@ class ProveIt:
             "gas_price_strategy": self.gas_price_strategy
         }
     
-    def register_file(self, file_path: Union[str, Path], metadata: str = "") -> RegistrationResult:
+    def register_file(self, file_path: Union[str, Path], metadata: str = "", algorithm: Optional[str] = None) -> RegistrationResult:
         """
         Register a file on the blockchain.
         
         Args:
             file_path: Path to the file to register
             metadata: Optional metadata to associate with the file
+            algorithm: Hash algorithm to use (default: the instance's hash_algorithm);
+                recorded as a tag at the start of the metadata unless it is SHA-256
             
         Returns:
             RegistrationResult object with registration details
@@ -96,15 +141,17 @@ class ProveIt:
             FileNotFoundError: If the file does not exist
             ValueError: If no account is available for signing transactions
         """
+        algorithm = algorithm or self.hash_algorithm
+        
         # Calculate the file hash
-        file_hash = hash_file(file_path)
+        file_hash = hash_file(file_path, algorithm=algorithm)
         
         # Register the hash on the blockchain
-        result = self.blockchain.register(file_hash, metadata)
+        result = self.blockchain.register(file_hash, tag_metadata(metadata, algorithm))
         
         # Create and return a RegistrationResult object
         return RegistrationResult(
-            hash=result["hash"],
+            hash=Hash32.coerce(result["hash"]),
             tx_hash=result["tx_hash"],
             owner=result["owner"],
             timestamp=result["timestamp"],
@@ -113,13 +160,14 @@ class ProveIt:
             metadata=result.get("metadata")
         )
     
-    def register_hash(self, file_hash: str, metadata: str = "") -> RegistrationResult:
+    def register_hash(self, file_hash: Union[str, Hash32], metadata: str = "", algorithm: str = DEFAULT_ALGORITHM) -> RegistrationResult:
         """
         Register a pre-computed hash on the blockchain.
         
         Args:
-            file_hash: Hash to register
+            file_hash: Hash to register, as a hex string or Hash32
             metadata: Optional metadata to associate with the hash
+            algorithm: Algorithm the hash was computed with (default: sha256)
             
         Returns:
             RegistrationResult object with registration details
@@ -128,11 +176,11 @@ class ProveIt:
             ValueError: If no account is available for signing transactions
         """
         # Register the hash on the blockchain
-        result = self.blockchain.register(file_hash, metadata)
+        result = self.blockchain.register(file_hash, tag_metadata(metadata, algorithm))
         
         # Create and return a RegistrationResult object
         return RegistrationResult(
-            hash=result["hash"],
+            hash=Hash32.coerce(result["hash"]),
             tx_hash=result["tx_hash"],
             owner=result["owner"],
             timestamp=result["timestamp"],
@@ -141,13 +189,14 @@ class ProveIt:
             metadata=result.get("metadata")
         )
     
-    def register_content(self, content: Union[str, bytes], metadata: str = "") -> RegistrationResult:
+    def register_content(self, content: Union[str, bytes], metadata: str = "", algorithm: Optional[str] = None) -> RegistrationResult:
         """
         Register content on the blockchain.
         
         Args:
             content: Content to register
             metadata: Optional metadata to associate with the content
+            algorithm: Hash algorithm to use (default: the instance's hash_algorithm)
             
         Returns:
             RegistrationResult object with registration details
@@ -155,48 +204,389 @@ class ProveIt:
         Raises:
             ValueError: If no account is available for signing transactions
         """
+        algorithm = algorithm or self.hash_algorithm
+        
         # Calculate the content hash
-        content_hash = hash_content(content)
+        content_hash = hash_content(content, algorithm)
         
         # Register the hash on the blockchain
-        return self.register_hash(content_hash, metadata)
+        return self.register_hash(content_hash, metadata, algorithm)
+    
+    def register_many(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        metadata: str = "",
+        journal: Optional[RegistrationJournal] = None,
+        workers: Optional[int] = None,
+        max_pending: int = 16,
+        confirm_timeout: float = 120,
+        progress: Optional[Callable[[str, int], None]] = None
+    ) -> BulkRegistrationSummary:
+        """
+        Register many files on the blockchain.
+        
+        Files are hashed in parallel, hashes that are already registered are
+        skipped after one bulk lookup, and the rest are sent with consecutive
+        nonces so that up to max_pending transactions are in the mempool at
+        once instead of waiting for each one to be mined.
+        
+        With a journal, every step is recorded before it is taken: an
+        interrupted run can be started again with the same journal and
+        neither rehashes unchanged files nor sends a registration twice.
+        
+        Args:
+            file_paths: Paths of the files to register
+            metadata: Optional metadata to associate with every file
+            journal: Journal recording the progress (default: no journal)
+            workers: Number of hashing threads (default: number of CPUs)
+            max_pending: Maximum number of unconfirmed transactions (default: 16)
+            confirm_timeout: Seconds to wait for each transaction to be mined (default: 120)
+            progress: Called with an event name ("hashed", "skipped", "submitted",
+                "confirmed" or "failed") and, for "hashed", the file size in bytes
+        
+        Returns:
+            BulkRegistrationSummary with the number of files and hashes processed
+        
+        Raises:
+            ValueError: If no account is available for signing transactions
+        """
+        notify = progress or _no_progress
+        files = 0
+        
+        # Hash the files, reusing the hashes recorded by earlier runs
+        hashes: Dict[str, None] = {}
+        stats = {}
+        
+        for file_path in file_paths:
+            file_path = Path(file_path)
+            stat = file_path.stat()
+            files += 1
+            
+            cached = journal.cached_hash(file_path, stat) if journal is not None else None
+            if cached is not None:
+                hashes[cached] = None
+                notify("hashed", stat.st_size)
+            else:
+                stats[file_path] = stat
+        
+        for file_path, file_hash in hash_files(stats, workers):
+            if journal is not None:
+                journal.record_hash(file_path, stats[file_path], file_hash)
+            hashes[file_hash] = None
+            notify("hashed", stats[file_path].st_size)
+        
+        summary = self.register_hashes(
+            hashes,
+            metadata,
+            journal=journal,
+            max_pending=max_pending,
+            confirm_timeout=confirm_timeout,
+            progress=progress
+        )
+        summary.files = files
+        return summary
+    
+    def register_hashes(
+        self,
+        file_hashes: Iterable[str],
+        metadata: Union[str, Dict[str, str]] = "",
+        journal: Optional[RegistrationJournal] = None,
+        max_pending: int = 16,
+        confirm_timeout: float = 120,
+        progress: Optional[Callable[[str, int], None]] = None
+    ) -> BulkRegistrationSummary:
+        """
+        Register many hashes on the blockchain.
+        
+        This is the second half of register_many: hashes that are already
+        registered are skipped after one bulk lookup, and the rest are sent
+        with consecutive nonces, with up to max_pending transactions in the
+        mempool at once.
+        
+        Args:
+            file_hashes: Normalized hashes to register
+            metadata: Metadata for every hash, or a dictionary of metadata by hash
+            journal: Journal recording the progress (default: no journal); any
+                object with the state and record methods of RegistrationJournal
+            max_pending: Maximum number of unconfirmed transactions (default: 16)
+            confirm_timeout: Seconds to wait for each transaction to be mined (default: 120)
+            progress: Called with an event name ("skipped", "submitted", "confirmed" or "failed")
+        
+        Returns:
+            BulkRegistrationSummary with the number of hashes processed
+        
+        Raises:
+            ValueError: If no account is available for signing transactions
+        """
+        notify = progress or _no_progress
+        hashes = list(dict.fromkeys(file_hashes))
+        summary = BulkRegistrationSummary(hashes=len(hashes))
+        
+        # Pick up the transactions sent by earlier runs
+        in_flight: Deque[Tuple[str, str]] = deque()
+        todo = []
+        
+        for file_hash in hashes:
+            state = journal.state(file_hash) if journal is not None else None
+            event = state["event"] if state else None
+            
+            if event in FINAL_STATES:
+                summary.already_registered += 1
+                notify("skipped", 0)
+                continue
+            
+            if journal is not None and state is not None and event == "submitted":
+                tx_state = self.blockchain.get_transaction_state(state["tx_hash"])
+                if tx_state == "pending":
+                    in_flight.append((file_hash, state["tx_hash"]))
+                    continue
+                if tx_state == "confirmed":
+                    journal.record(file_hash, "confirmed", tx_hash=state["tx_hash"])
+                    summary.confirmed += 1
+                    notify("confirmed", 0)
+                    continue
+            
+            todo.append(file_hash)
+        
+        # Skip hashes registered on chain, e.g. by someone else or by a transaction the journal lost track of
+        registered: Set[str] = set()
+        for start in range(0, len(todo), 1000):
+            for verification in self.verify_hashes(todo[start:start + 1000]):
+                if verification.is_registered and verification.hash is not None:
+                    registered.add(verification.hash)
+        
+        for file_hash in registered:
+            if journal is not None:
+                journal.record(file_hash, "registered")
+            summary.already_registered += 1
+            notify("skipped", 0)
+        
+        todo = [file_hash for file_hash in todo if file_hash not in registered]
+        
+        # Send the registrations with consecutive nonces, shared with other threads using the connector
+        gas_price = None
+        
+        for index, file_hash in enumerate(todo):
+            if index % 100 == 0:
+                gas_price = self.blockchain.web3.eth.gas_price
+            
+            file_metadata = metadata if isinstance(metadata, str) else metadata.get(file_hash, "")
+            error = None
+            
+            with self.blockchain.reserve_nonce() as nonce:
+                signed_tx = self.blockchain.sign_registration(file_hash, file_metadata, nonce, gas_price)
+                tx_hash = "0x" + bytes(signed_tx.hash).hex()
+                
+                # Record the transaction before sending it, so a crash cannot lead to sending it twice
+                if journal is not None:
+                    journal.record(file_hash, "submitted", durable=True, tx_hash=tx_hash, nonce=nonce)
+                
+                try:
+                    self.blockchain.send_registration(signed_tx)
+                except Exception as e:
+                    error = str(e)
+                    # The nonce may not have been used; start again from the node's view
+                    self.blockchain.reset_nonce()
+            
+            if error is not None:
+                if journal is not None:
+                    journal.record(file_hash, "failed", error=error)
+                summary.failed[file_hash] = error
+                notify("failed", 0)
+                continue
+            
+            in_flight.append((file_hash, tx_hash))
+            notify("submitted", 0)
+            
+            while len(in_flight) >= max_pending:
+                self._confirm_registration(*in_flight.popleft(), journal, summary, confirm_timeout, notify)
+        
+        while in_flight:
+            self._confirm_registration(*in_flight.popleft(), journal, summary, confirm_timeout, notify)
+        
+        return summary
     
-    def verify_file(self, file_path: Union[str, Path]) -> VerificationResult:
+    def _confirm_registration(
+        self,
+        file_hash: str,
+        tx_hash: str,
+        journal: Optional[RegistrationJournal],
+        summary: BulkRegistrationSummary,
+        timeout: float,
+        notify: Callable[[str, int], None]
+    ) -> None:
+        """
+        Wait for a registration transaction sent by register_hashes and record its outcome.
+        
+        Args:
+            file_hash: Registered hash
+            tx_hash: Hash of the registration transaction
+            journal: Journal recording the progress, or None
+            summary: Summary to update
+            timeout: Seconds to wait for the transaction to be mined
+            notify: Progress callback
+        """
+        try:
+            result = self.blockchain.wait_for_registration(tx_hash, timeout=timeout)
+        except TimeExhausted:
+            # Still in the mempool; the journal keeps it as submitted for the next run
+            summary.pending += 1
+            return
+        
+        if result["status"]:
+            if journal is not None:
+                journal.record(file_hash, "confirmed", tx_hash=tx_hash, block_number=result["block_number"])
+            summary.confirmed += 1
+            notify("confirmed", 0)
+        else:
+            if journal is not None:
+                journal.record(file_hash, "failed", tx_hash=tx_hash, error="Transaction reverted")
+            summary.failed[file_hash] = "Transaction reverted"
+            notify("failed", 0)
+    
+    def verify_file(self, file_path: Union[str, Path], algorithms: Optional[Sequence[str]] = None) -> VerificationResult:
         """
         Verify if a file is registered on the blockchain.
         
+        With several algorithms, every hash is computed in a single read of
+        the file and all are looked up at once.
+        
         Args:
             file_path: Path to the file to verify
+            algorithms: Hash algorithms the file may have been registered with
+                (default: the instance's hash_algorithm and SHA-256)
             
         Returns:
-            VerificationResult object with verification details
+            VerificationResult object with verification details; if the file is
+            not registered, the hash is the one of the first algorithm
             
         Raises:
             FileNotFoundError: If the file does not exist
         """
-        # Calculate the file hash
-        file_hash = hash_file(file_path)
+        algorithms = list(dict.fromkeys(algorithms or (self.hash_algorithm, DEFAULT_ALGORITHM)))
         
-        # Verify the hash on the blockchain
-        return self.verify_hash(file_hash)
+        if len(algorithms) == 1:
+            # Calculate the file hash
+            file_hash = hash_file(file_path, algorithm=algorithms[0])
+            
+            # Verify the hash on the blockchain
+            return self.verify_hash(file_hash)
+        
+        return self._verify_digests(hash_file_multi(file_path, algorithms))
     
-    def verify_hash(self, file_hash: str) -> VerificationResult:
+    def verify_hash(self, file_hash: Union[str, Hash32]) -> VerificationResult:
         """
         Verify if a hash is registered on the blockchain.
         
         Args:
-            file_hash: Hash to verify
+            file_hash: Hash to verify, as a hex string or Hash32
             
         Returns:
             VerificationResult object with verification details
+        
+        Raises:
+            ValueError: If the hash is not a valid 32-byte hash
         """
+        file_hash = Hash32.coerce(file_hash)
+        
+        if self.cache is not None:
+            cached = self.cache.get(self.blockchain.network.value, file_hash)
+            if cached is not None:
+                return cached
+        
         # Verify the hash on the blockchain
-        result = self.blockchain.verify(file_hash)
+        result = self._to_verification_result(self.blockchain.verify(file_hash))
+        
+        if self.cache is not None:
+            self.cache.put(self.blockchain.network.value, result)
+        
+        return result
+    
+    def verify_hashes(self, file_hashes: Sequence[Union[str, Hash32]]) -> List[VerificationResult]:
+        """
+        Verify multiple hashes with a single bulk blockchain lookup.
+        
+        Hashes found in the verification cache are answered from it, duplicates
+        are looked up once, and the remaining hashes are verified with batched
+        JSON-RPC calls, up to max_workers batches at once.
+        
+        Args:
+            file_hashes: Hashes to verify, as hex strings or Hash32 values
+        
+        Returns:
+            List of VerificationResult objects, in the same order as file_hashes
+        
+        Raises:
+            ValueError: If one of the hashes is not a valid 32-byte hash
+        """
+        network = self.blockchain.network.value
+        # Parsed once; the cache, the connector and the results all reuse the raw bytes
+        normalized = [Hash32.coerce(file_hash) for file_hash in file_hashes]
+        
+        found: Dict[Hash32, VerificationResult] = {}
+        missing = []
+        
+        for file_hash in dict.fromkeys(normalized):
+            cached = self.cache.get(network, file_hash) if self.cache is not None else None
+            if cached is not None:
+                found[file_hash] = cached
+            else:
+                missing.append(file_hash)
+        
+        if missing:
+            for file_hash, result in zip(missing, self._verify_many(missing)):
+                verification = self._to_verification_result(result)
+                found[file_hash] = verification
+                if self.cache is not None:
+                    self.cache.put(network, verification)
+        
+        return [found[file_hash] for file_hash in normalized]
+    
+    def _verify_many(self, file_hashes: List[Hash32]) -> List[Dict[str, Any]]:
+        """
+        Look up hashes in bulk, running up to max_workers lookups at once.
+        
+        Args:
+            file_hashes: Hashes to look up
+        
+        Returns:
+            List of verification dictionaries, in the same order as file_hashes
+        """
+        if self.max_workers <= 1 or len(file_hashes) <= VERIFY_BATCH_SIZE:
+            return self.blockchain.verify_many(file_hashes, VERIFY_BATCH_SIZE)
+        
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="proveit-rpc")
         
+        chunks = [file_hashes[start:start + VERIFY_BATCH_SIZE] for start in range(0, len(file_hashes), VERIFY_BATCH_SIZE)]
+        return [
+            result
+            for results in self._executor.map(lambda chunk: self.blockchain.verify_many(chunk, VERIFY_BATCH_SIZE), chunks)
+            for result in results
+        ]
+    
+    def close(self) -> None:
+        """Stop the threads used by batch verifications."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+    
+    def _to_verification_result(self, result: Dict[str, Any]) -> VerificationResult:
+        """
+        Convert a verification dictionary from the blockchain connector to a VerificationResult.
+        
+        Args:
+            result: Dictionary returned by BlockchainConnector.verify
+        
+        Returns:
+            VerificationResult object with verification details
+        """
         # Create and return a VerificationResult object
         if result["is_registered"]:
             return VerificationResult(
-                hash=result["hash"],
+                hash=Hash32.coerce(result["hash"]),
                 is_registered=True,
                 owner=result["owner"],
                 timestamp=result["timestamp"],
@@ -205,52 +595,160 @@ class ProveIt:
             )
         else:
             return VerificationResult(
-                hash=result["hash"],
+                hash=Hash32.coerce(result["hash"]),
                 is_registered=False
             )
     
-    def verify_content(self, content: Union[str, bytes]) -> VerificationResult:
+    def verify_content(self, content: Union[str, bytes], algorithms: Optional[Sequence[str]] = None) -> VerificationResult:
         """
         Verify if content is registered on the blockchain.
         
         Args:
             content: Content to verify
+            algorithms: Hash algorithms the content may have been registered with
+                (default: the instance's hash_algorithm and SHA-256)
             
         Returns:
             VerificationResult object with verification details
         """
-        # Calculate the content hash
-        content_hash = hash_content(content)
+        algorithms = list(dict.fromkeys(algorithms or (self.hash_algorithm, DEFAULT_ALGORITHM)))
         
-        # Verify the hash on the blockchain
-        return self.verify_hash(content_hash)
+        if len(algorithms) == 1:
+            # Calculate the content hash
+            content_hash = hash_content(content, algorithms[0])
+            
+            # Verify the hash on the blockchain
+            return self.verify_hash(content_hash)
+        
+        return self._verify_digests({algorithm: hash_content(content, algorithm) for algorithm in algorithms})
+    
+    def _verify_digests(self, digests: Dict[str, str]) -> VerificationResult:
+        """
+        Verify the hashes of one file computed with several algorithms.
+        
+        Args:
+            digests: Hash of the file by algorithm
+        
+        Returns:
+            The first registration whose algorithm tag matches the algorithm of
+            its hash, or the unregistered result of the first algorithm
+        """
+        results = self.verify_hashes(list(digests.values()))
+        
+        for algorithm, result in zip(digests, results):
+            if result.is_registered and split_metadata_tag(result.metadata)[0] == algorithm:
+                return result
+        
+        return VerificationResult(hash=results[0].hash, is_registered=False)
     
     def batch_verify_files(self, file_paths: List[Union[str, Path]]) -> List[VerificationResult]:
         """
         Verify multiple files in batch.
         
+        Duplicate files are detected before hashing (see
+        hash_files_deduplicated), so each distinct content is hashed once and
+        each distinct hash is looked up once, in bulk.
+        
         Args:
             file_paths: List of paths to files to verify
             
         Returns:
             List of VerificationResult objects with verification details
         """
+        existing = [file_path for file_path in file_paths if Path(file_path).exists()]
+        hashes, _ = hash_files_deduplicated(existing)
+        
+        unique_hashes = list(dict.fromkeys(hashes.values()))
+        verified = dict(zip(unique_hashes, self.verify_hashes(unique_hashes)))
+        
         results = []
         
         for file_path in file_paths:
-            try:
-                result = self.verify_file(file_path)
-                results.append(result)
-            except FileNotFoundError:
+            file_hash = hashes.get(Path(file_path))
+            if file_hash is None:
                 # Create a "not found" result
                 results.append(VerificationResult(
-                    hash="",
-                    is_registered=False
+                    hash=None,
+                    is_registered=False,
+                    path=str(file_path)
                 ))
+            else:
+                results.append(verified[file_hash])
         
         return results
     
-    def generate_certificate(self, registration_result: Union[RegistrationResult, str]) -> Certificate:
+    def iter_verify_files(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        workers: Optional[int] = None,
+        batch_size: int = 100,
+        max_batches: int = 2,
+        chunk_size: int = 1024 * 1024
+    ) -> Iterator[Tuple[Path, VerificationResult]]:
+        """
+        Verify files as a stream, yielding each result as soon as it is known.
+        
+        Paths are pulled from file_paths only as hashing capacity frees up,
+        hashes are looked up in bulk batch_size at a time, and at most
+        max_batches lookups run at once; hashing pauses while they are all
+        busy. Memory use therefore stays flat however many paths there are.
+        
+        Args:
+            file_paths: Paths of the files to verify, e.g. a lazy iterator
+            workers: Number of hashing threads (default: number of CPUs)
+            batch_size: Number of hashes looked up per bulk query (default: 100)
+            max_batches: Maximum number of bulk queries in flight (default: 2)
+            chunk_size: Size of chunks to read from the files (in bytes)
+        
+        Yields:
+            (path, VerificationResult) pairs, in completion order; a file that
+            cannot be read gets a result without a hash
+        """
+        workers = workers or os.cpu_count() or 1
+        paths = iter(file_paths)
+        exhausted = False
+        
+        hashing: Dict[Future, Path] = {}
+        looking_up: Dict[Future, List[Tuple[Path, str]]] = {}
+        batch: List[Tuple[Path, str]] = []
+        
+        with ThreadPoolExecutor(max_workers=workers) as hashers, ThreadPoolExecutor(max_workers=max_batches) as lookups:
+            try:
+                while True:
+                    while not exhausted and len(hashing) < workers * 4:
+                        file_path = next(paths, None)
+                        if file_path is None:
+                            exhausted = True
+                        else:
+                            file_path = Path(file_path)
+                            hashing[hashers.submit(hash_file, file_path, chunk_size)] = file_path
+                    
+                    if batch and len(looking_up) < max_batches and (len(batch) >= batch_size or (exhausted and not hashing)):
+                        looking_up[lookups.submit(self.verify_hashes, [file_hash for _, file_hash in batch])] = batch
+                        batch = []
+                    
+                    if not (hashing or looking_up or batch):
+                        return
+                    
+                    # Leave hashed files waiting while a full batch cannot be submitted
+                    waiting = list(looking_up) + (list(hashing) if len(batch) < batch_size else [])
+                    done, _ = wait(waiting, return_when=FIRST_COMPLETED)
+                    
+                    for future in done:
+                        if future in looking_up:
+                            for (file_path, _), result in zip(looking_up.pop(future), future.result()):
+                                yield file_path, result
+                        else:
+                            file_path = hashing.pop(future)
+                            try:
+                                batch.append((file_path, future.result()))
+                            except (OSError, ValueError):
+                                yield file_path, VerificationResult(hash=None, is_registered=False, path=str(file_path))
+            finally:
+                for future in hashing:
+                    future.cancel()
+    
+    def generate_certificate(self, registration_result: Union[RegistrationResult, str, Hash32]) -> Certificate:
         """
         Generate a certificate for a registration.
         
@@ -264,21 +762,14 @@ class ProveIt:
             ValueError: If the hash is not registered
         """
         # If a hash is provided, verify it first
-        if isinstance(registration_result, str):
+        if isinstance(registration_result, (str, Hash32)):
             verification = self.verify_hash(registration_result)
             
             if not verification.is_registered:
                 raise ValueError(f"Hash not registered: {registration_result}")
             
             # Create a certificate from the verification result
-            return Certificate(
-                hash=verification.hash,
-                owner=verification.owner,
-                timestamp=verification.timestamp,
-                tx_hash="",  # Transaction hash not available from verification
-                network=verification.network,
-                metadata=verification.metadata
-            )
+            return self._verification_certificate(verification, self._registration_tx_hash(verification))
         else:
             # Create a certificate from the registration result
             return Certificate(
@@ -289,3 +780,165 @@ class ProveIt:
                 network=registration_result.network,
                 metadata=registration_result.metadata
             )
+    
+    def generate_proof_certificate(self, registration_result: Union[RegistrationResult, str], tx_hash: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generate an offline-verifiable proof certificate for a registration.
+        
+        Unlike a regular certificate, a proof certificate embeds the block
+        header, the transaction receipt and a receipt trie proof, so it can be
+        checked with proveit.proof.verify_proof_certificate without querying
+        the blockchain.
+        
+        Args:
+            registration_result: RegistrationResult object or hash of a registered file
+            tx_hash: Hash of the registering transaction (default: look it up)
+        
+        Returns:
+            Dictionary with the proof certificate, ready to be serialized as JSON
+        
+        Raises:
+            ValueError: If the hash is not registered or its transaction cannot be found
+            ProofError: If the transaction did not register the hash
+        """
+        file_hash: Union[str, Hash32]
+        if isinstance(registration_result, RegistrationResult):
+            file_hash = registration_result.hash
+            tx_hash = tx_hash or registration_result.tx_hash
+        else:
+            file_hash = registration_result
+        
+        if not tx_hash:
+            verification = self.verify_hash(file_hash)
+            if not verification.is_registered:
+                raise ValueError(f"Hash not registered: {file_hash}")
+            tx_hash = self._registration_tx_hash(verification)
+        
+        if not tx_hash:
+            raise ValueError(f"Could not find the transaction that registered {file_hash}")
+        
+        return self.blockchain.get_registration_proof(normalize_hash(file_hash), tx_hash)
+    
+    def _verification_certificate(
+        self,
+        verification: VerificationResult,
+        tx_hash: str,
+        file_name: Optional[str] = None
+    ) -> Certificate:
+        """
+        Build the certificate of a registered hash from its verification result.
+        
+        Args:
+            verification: VerificationResult of a registered hash
+            tx_hash: Hash of the registering transaction, or an empty string
+            file_name: Name of the certified file, if known
+        
+        Returns:
+            Certificate object
+        
+        Raises:
+            ValueError: If the result does not describe a registration
+        """
+        if verification.hash is None or verification.owner is None or verification.timestamp is None:
+            raise ValueError(f"Hash not registered: {verification.hash}")
+        
+        return Certificate(
+            hash=verification.hash,
+            owner=verification.owner,
+            timestamp=verification.timestamp,
+            tx_hash=tx_hash,
+            network=verification.network or self.blockchain.network,
+            metadata=verification.metadata,
+            file_name=file_name
+        )
+    
+    def _registration_tx_hash(self, verification: VerificationResult) -> str:
+        """
+        Look up the transaction that registered a verified hash.
+        
+        Args:
+            verification: VerificationResult of a registered hash
+        
+        Returns:
+            The transaction hash, or an empty string if it cannot be found
+        """
+        if verification.hash is None or verification.timestamp is None:
+            return ""
+        
+        try:
+            tx_hash = self.blockchain.find_registration_transaction(
+                verification.hash,
+                int(verification.timestamp.timestamp())
+            )
+        except (RPCOverloadedError, RPCDeadlineExceededError):
+            raise
+        except Exception:
+            # The certificate is still valid without the transaction hash
+            return ""
+        
+        return tx_hash or ""
+    
+    def _registration_tx_hashes(self, verifications: List[VerificationResult]) -> Dict[Hash32, Optional[str]]:
+        """
+        Look up the transactions that registered many verified hashes, in bulk.
+        
+        Args:
+            verifications: VerificationResults of registered hashes
+        
+        Returns:
+            Transaction hash by hash; empty if the lookup failed
+        """
+        if not verifications:
+            return {}
+        
+        try:
+            return self.blockchain.find_registration_transactions(
+                (verification.hash, int(verification.timestamp.timestamp()))
+                for verification in verifications
+                if verification.hash is not None and verification.timestamp is not None
+            )
+        except (RPCOverloadedError, RPCDeadlineExceededError):
+            raise
+        except Exception:
+            # The certificates are still valid without the transaction hashes
+            return {}
+    
+    def generate_certificates(
+        self,
+        entries: Iterable[Tuple[str, Optional[str]]],
+        batch_size: int = 100
+    ) -> Iterator[Tuple[str, Optional[Certificate]]]:
+        """
+        Generate certificates for many hashes.
+        
+        The entries are consumed lazily, in batches whose registrations are
+        looked up with a single bulk verification each. The transactions that
+        made them are then found with batched log queries.
+        
+        Args:
+            entries: (hash, file_name) pairs; file_name may be None
+            batch_size: Number of hashes verified per bulk lookup (default: 100)
+        
+        Yields:
+            (hash, certificate) pairs, where certificate is None if the hash is not registered
+        
+        Raises:
+            ValueError: If one of the hashes is not a valid 32-byte hash
+        """
+        entries = iter(entries)
+        
+        while True:
+            batch = list(islice(entries, batch_size))
+            if not batch:
+                break
+            
+            verifications = self.verify_hashes([file_hash for file_hash, _ in batch])
+            tx_hashes = self._registration_tx_hashes([v for v in verifications if v.is_registered])
+            
+            for (file_hash, file_name), verification in zip(batch, verifications):
+                if not verification.is_registered:
+                    yield file_hash, None
+                    continue
+                
+                tx_hash = tx_hashes.get(verification.hash) if verification.hash is not None else None
+                yield file_hash, self._verification_certificate(verification, tx_hash or "", file_name)
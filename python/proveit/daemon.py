@@ -0,0 +1,394 @@
+"""
+Command daemon for the ProveIt package.
+
+Starting a ProveIt command imports web3 and reportlab and builds a blockchain
+connector, which takes far longer than most commands themselves. The daemon
+does this once and keeps the connectors, their caches and the certificate
+layout warm; the ``proveit`` script then forwards each command to it over a
+Unix domain socket and only falls back to running the command itself when no
+daemon is listening.
+
+This module is imported by every invocation of the script, so it only uses
+the standard library at import time.
+"""
+
+import codecs
+import hashlib
+import io
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+# Commands that always run in the calling process: they run until interrupted,
+# manage the daemon, or change the configuration the daemon has loaded
+LOCAL_COMMANDS = ("daemon", "serve", "watch", "config")
+
+# Options that make a command run until interrupted, with or without a value
+LONG_RUNNING_OPTIONS = ("--watch",)
+
+# Environment variables the connectors read; a command whose values differ from
+# the daemon's would sign or connect with the wrong credentials, so it runs locally
+CONNECTOR_ENVIRONMENT = ("INFURA_API_KEY", "PRIVATE_KEY")
+
+
+def default_socket_path() -> str:
+    """
+    Get the path of the daemon socket.
+    
+    Returns:
+        $PROVEIT_SOCKET if set, otherwise ~/.proveit/daemon.sock
+    """
+    return os.environ.get("PROVEIT_SOCKET") or os.path.join(os.path.expanduser("~"), ".proveit", "daemon.sock")
+
+
+def run_cli() -> None:
+    """
+    Entry point of the proveit script.
+    
+    Forwards the command to the daemon if one is running, otherwise runs it in this process.
+    """
+    exit_code = forward(sys.argv[1:])
+    if exit_code is None:
+        from .cli import main
+        main()
+    else:
+        sys.exit(exit_code)
+
+
+def forward(argv: List[str], socket_path: Optional[str] = None) -> Optional[int]:
+    """
+    Run a command in the daemon, copying its output to this process.
+    
+    Args:
+        argv: Command-line arguments, without the program name
+        socket_path: Path of the daemon socket (default: default_socket_path())
+    
+    Returns:
+        The command's exit status, or None if it must run locally: no daemon is
+        running, PROVEIT_NO_DAEMON is set, the command is one of LOCAL_COMMANDS,
+        runs until interrupted or reads standard input, the daemon was started
+        with different CONNECTOR_ENVIRONMENT values, or it is busy with another command
+    """
+    if os.environ.get("PROVEIT_NO_DAEMON") or not argv or argv[0] in LOCAL_COMMANDS:
+        return None
+    if any(_reads_stdin(arg) or arg.startswith(LONG_RUNNING_OPTIONS) for arg in argv):
+        return None
+    
+    connection = _connect(socket_path or default_socket_path())
+    if connection is None:
+        return None
+    
+    with connection:
+        _send(connection, {"argv": list(argv), "cwd": os.getcwd(), "environment": _environment_fingerprint()})
+        
+        for frame in _frames(connection):
+            if frame.get("local"):
+                return None
+            if "out" in frame:
+                sys.stdout.write(frame["out"])
+                sys.stdout.flush()
+            if "err" in frame:
+                sys.stderr.write(frame["err"])
+                sys.stderr.flush()
+            if "exit" in frame:
+                return frame["exit"]
+    
+    sys.stderr.write("Error: the ProveIt daemon closed the connection\n")
+    return 1
+
+
+def daemon_request(request: Dict[str, Any], socket_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Send a control request ("status" or "stop") to the daemon.
+    
+    Args:
+        request: Request such as {"control": "status"}
+        socket_path: Path of the daemon socket (default: default_socket_path())
+    
+    Returns:
+        The daemon's reply, or None if no daemon is running
+    """
+    connection = _connect(socket_path or default_socket_path())
+    if connection is None:
+        return None
+    
+    with connection:
+        _send(connection, request)
+        for frame in _frames(connection):
+            return frame
+    return None
+
+
+class ProveItDaemon:
+    """
+    Unix socket server running ProveIt commands in a warm process.
+    
+    Commands run one at a time on a single worker thread: they change the
+    working directory and the standard streams of the process, and the
+    thread-local certificate layout stays warm from one command to the next.
+    A command arriving while another runs is sent back to run locally rather
+    than waiting for it, as are commands from a client whose
+    CONNECTOR_ENVIRONMENT differs from the daemon's. Status and stop requests
+    are answered at any time. A command whose client disconnects is
+    interrupted as if by Ctrl-C the next time it writes output.
+    """
+    
+    def __init__(self, socket_path: Optional[str] = None, warm_networks: Iterable[str] = ()):
+        """
+        Initialize the daemon.
+        
+        Args:
+            socket_path: Path of the socket to listen on (default: default_socket_path())
+            warm_networks: Networks to connect to before accepting commands
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.warm_networks = list(warm_networks)
+        self.requests = 0
+        self.started_at = time.time()
+        self._environment = _environment_fingerprint()
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="proveit-command")
+        self._busy = threading.Lock()
+        self._listener: Optional[socket.socket] = None
+        self._stopping = threading.Event()
+    
+    def serve_forever(self) -> None:
+        """
+        Warm up, then serve commands until a stop request arrives.
+        
+        Raises:
+            RuntimeError: If another daemon is already listening on the socket
+        """
+        self._worker.submit(self._warm_up).result()
+        
+        self._listener = self._listen()
+        try:
+            while not self._stopping.is_set():
+                try:
+                    connection, _ = self._listener.accept()
+                except OSError:
+                    # The listener was closed by stop()
+                    break
+                threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+        finally:
+            self.stop()
+            self._worker.shutdown()
+    
+    def stop(self) -> None:
+        """Stop accepting commands and remove the socket."""
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        
+        if self._listener is not None:
+            try:
+                self._listener.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._listener.close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+    
+    def status(self) -> Dict[str, Any]:
+        """
+        Describe the running daemon.
+        
+        Returns:
+            Dictionary with the pid, socket, uptime, number of commands served and warm networks
+        """
+        from . import cli
+        
+        return {
+            "pid": os.getpid(),
+            "socket": self.socket_path,
+            "uptime": round(time.time() - self.started_at, 1),
+            "requests": self.requests,
+            "networks": sorted(cli._shared_provers or {})
+        }
+    
+    def _warm_up(self) -> None:
+        from . import cli
+        from .certificate import REPORTLAB_AVAILABLE, _certificate_layout
+        
+        cli._shared_provers = {}
+        for network in self.warm_networks:
+            cli._get_prover(network)
+        
+        if REPORTLAB_AVAILABLE:
+            _certificate_layout()
+    
+    def _listen(self) -> socket.socket:
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        
+        if os.path.exists(self.socket_path):
+            if _connect(self.socket_path) is not None:
+                raise RuntimeError(f"A ProveIt daemon is already listening on {self.socket_path}")
+            # Left behind by a daemon that did not shut down cleanly
+            os.unlink(self.socket_path)
+        
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            listener.bind(self.socket_path)
+        finally:
+            os.umask(umask)
+        listener.listen(64)
+        return listener
+    
+    def _handle(self, connection: socket.socket) -> None:
+        with connection:
+            if not _same_user(connection):
+                return
+            
+            try:
+                request = next(_frames(connection), None)
+                if request is None:
+                    return
+                
+                control = request.get("control")
+                if control == "status":
+                    _send(connection, self.status())
+                elif control == "stop":
+                    _send(connection, {"stopping": True})
+                    self.stop()
+                elif "argv" in request and request.get("environment") != self._environment:
+                    _send(connection, {"local": True})
+                elif "argv" in request:
+                    if not self._busy.acquire(blocking=False):
+                        # Running locally is faster than waiting for the command in progress
+                        _send(connection, {"local": True})
+                        return
+                    try:
+                        exit_code = self._worker.submit(self._run, request["argv"], request["cwd"], connection).result()
+                    finally:
+                        self._busy.release()
+                    _send(connection, {"exit": exit_code})
+            except (OSError, ValueError):
+                # The client went away, or sent something that is not a request
+                pass
+            except Exception:
+                traceback.print_exc()
+                try:
+                    _send(connection, {"err": "Error: internal error in the ProveIt daemon\n", "exit": 1})
+                except OSError:
+                    pass
+    
+    def _run(self, argv: List[str], cwd: str, connection: socket.socket) -> int:
+        from .cli import main
+        
+        streams = sys.stdin, sys.stdout, sys.stderr
+        working_directory = os.getcwd()
+        sys.stdin = io.StringIO()
+        sys.stdout = _frame_writer(connection, "out")
+        sys.stderr = _frame_writer(connection, "err")
+        
+        try:
+            os.chdir(cwd)
+            main.main(args=argv, prog_name="proveit")
+            exit_code = 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                exit_code = e.code or 0
+            else:
+                sys.stderr.write(f"{e.code}\n")
+                exit_code = 1
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            sys.stdin, sys.stdout, sys.stderr = streams
+            os.chdir(working_directory)
+            self.requests += 1
+        
+        return exit_code
+
+
+class _FrameStream(io.RawIOBase):
+    """
+    Binary stream sending what is written to a client as frames.
+    
+    When the client goes away, the write raises KeyboardInterrupt so that the
+    command stops as it would on Ctrl-C in a local run; later writes are dropped.
+    """
+    
+    def __init__(self, connection: socket.socket, name: str):
+        self._connection = connection
+        self._name = name
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._disconnected = False
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        text = self._decoder.decode(bytes(data))
+        if text and not self._disconnected:
+            try:
+                _send(self._connection, {self._name: text})
+            except OSError:
+                self._disconnected = True
+                raise KeyboardInterrupt
+        return len(data)
+
+
+def _frame_writer(connection: socket.socket, name: str) -> io.TextIOWrapper:
+    return io.TextIOWrapper(
+        io.BufferedWriter(_FrameStream(connection, name)),
+        encoding="utf-8",
+        line_buffering=True
+    )
+
+
+def _reads_stdin(arg: str) -> bool:
+    # "--from -" and "--from=-" both read the client's standard input, which the daemon cannot see
+    return arg == "-" or arg.endswith("=-")
+
+
+def _environment_fingerprint() -> str:
+    # Only a digest is sent, so the credentials never cross the socket
+    values = {name: os.environ.get(name) for name in CONNECTOR_ENVIRONMENT}
+    return hashlib.sha256(json.dumps(values, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _connect(socket_path: str) -> Optional[socket.socket]:
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+    
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path)
+    except OSError:
+        connection.close()
+        return None
+    return connection
+
+
+def _send(connection: socket.socket, frame: Dict[str, Any]) -> None:
+    connection.sendall(json.dumps(frame).encode("utf-8") + b"\n")
+
+
+def _frames(connection: socket.socket):
+    with connection.makefile("rb") as stream:
+        for line in stream:
+            yield json.loads(line)
+
+
+def _same_user(connection: socket.socket) -> bool:
+    # The socket is only writable by its owner; on Linux, check the peer as well
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True
+    credentials = connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", credentials)
+    return uid == os.getuid()
@@ -1,21 +1,142 @@
 """
 Hashing utilities for the ProveIt package.
 
-This module provides functions for hashing files and content using SHA-256.
+This module provides functions for hashing files and content. SHA-256 is the
+default; other algorithms with a 32-byte digest, which fits the contract's
+bytes32 hashes, can be used through the algorithm registry.
 """
 
+import glob
 import hashlib
+import os
+import stat as stat_module
+import tarfile
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
 from pathlib import Path
-from typing import Union, BinaryIO
+from typing import (
+    IO, TYPE_CHECKING, Any, Callable, Union, BinaryIO, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+)
 
+if TYPE_CHECKING:
+    import numpy
 
-def hash_file(file_path: Union[str, Path], chunk_size: int = 8192) -> str:
+# Algorithm of hashes registered without an algorithm tag
+DEFAULT_ALGORITHM = "sha256"
+
+# A hashlib-style hasher, with update(), digest(), hexdigest() and digest_size;
+# hashlib's own hasher types are private and differ between algorithms
+Hasher = Any
+
+# Hash algorithms by name; each factory returns a new hasher with a 32-byte digest
+HASH_ALGORITHMS: Dict[str, Callable[[], Hasher]] = {
+    "sha256": hashlib.sha256,
+    "sha3-256": hashlib.sha3_256,
+    "blake2b-256": lambda: hashlib.blake2b(digest_size=32),
+    "blake2s-256": hashlib.blake2s,
+}
+
+# The algorithms every process knows; ones added by register_algorithm only exist
+# in the process that added them, and worker processes may not inherit them
+_BUILTIN_ALGORITHMS = dict(HASH_ALGORITHMS)
+
+# Prefix of the algorithm tag at the start of registration metadata
+ALGORITHM_TAG_PREFIX = "alg:"
+
+# Size in bytes of every registered digest
+DIGEST_SIZE = 32
+
+# Number of candidate duplicates compared with a reference file in one pass,
+# which bounds the number of files open at once
+_COMPARE_BATCH = 16
+
+
+def register_algorithm(name: str, factory: Callable[[], Hasher]) -> None:
+    """
+    Add a hash algorithm to the registry.
+    
+    Args:
+        name: Name of the algorithm, as recorded in the algorithm tag
+        factory: Callable returning a new hasher with update() and hexdigest()
+    
+    Raises:
+        ValueError: If the name is not usable in a tag or the digest is not 32 bytes long
+    """
+    if not name or any(c in name for c in ";: "):
+        raise ValueError(f"Invalid algorithm name: {name!r}")
+    if factory().digest_size != 32:
+        raise ValueError(f"Algorithm {name} does not produce a 32-byte digest")
+    HASH_ALGORITHMS[name] = factory
+
+
+def new_hasher(algorithm: str = DEFAULT_ALGORITHM) -> Hasher:
+    """
+    Create a hasher for a registered algorithm.
+    
+    Args:
+        algorithm: Name of the algorithm (default: sha256)
+    
+    Returns:
+        A new hasher
+    
+    Raises:
+        ValueError: If the algorithm is not registered
+    """
+    try:
+        return HASH_ALGORITHMS[algorithm]()
+    except KeyError:
+        raise ValueError(f"Unknown hash algorithm: {algorithm} (available: {', '.join(HASH_ALGORITHMS)})")
+
+
+def tag_metadata(metadata: str, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    """
+    Record the hash algorithm in registration metadata.
+    
+    SHA-256 registrations are left untagged, as they were before algorithms
+    could be chosen.
+    
+    Args:
+        metadata: Metadata to register
+        algorithm: Algorithm of the registered hash
+    
+    Returns:
+        The metadata, prefixed with "alg:<algorithm>;" unless the algorithm is SHA-256
+    """
+    if algorithm == DEFAULT_ALGORITHM:
+        return metadata
+    return f"{ALGORITHM_TAG_PREFIX}{algorithm};{metadata}"
+
+
+def split_metadata_tag(metadata: Optional[str]) -> Tuple[str, str]:
+    """
+    Split the algorithm tag from registration metadata.
+    
+    Args:
+        metadata: Registered metadata, possibly None
+    
+    Returns:
+        (algorithm, metadata without the tag); untagged metadata means SHA-256
+    """
+    metadata = metadata or ""
+    if metadata.startswith(ALGORITHM_TAG_PREFIX):
+        algorithm, separator, rest = metadata[len(ALGORITHM_TAG_PREFIX):].partition(";")
+        if separator and algorithm in HASH_ALGORITHMS:
+            return algorithm, rest
+    return DEFAULT_ALGORITHM, metadata
+
+
+def hash_file(file_path: Union[str, Path], chunk_size: int = 8192, algorithm: str = DEFAULT_ALGORITHM) -> str:
     """
     Calculate the SHA-256 hash of a file.
     
     Args:
         file_path: Path to the file to hash
         chunk_size: Size of chunks to read from the file (in bytes)
+        algorithm: Hash algorithm to use instead of SHA-256, see HASH_ALGORITHMS
         
     Returns:
         The hexadecimal representation of the hash, prefixed with '0x'
@@ -23,6 +144,7 @@ def hash_file(file_path: Union[str, Path], chunk_size: int = 8192) -> str:
     Raises:
         FileNotFoundError: If the file does not exist
         PermissionError: If the file cannot be read
+        ValueError: If the algorithm is not registered
     """
     file_path = Path(file_path)
     
@@ -32,13 +154,320 @@ def hash_file(file_path: Union[str, Path], chunk_size: int = 8192) -> str:
     if not file_path.is_file():
         raise ValueError(f"Not a file: {file_path}")
     
-    hasher = hashlib.sha256()
+    hasher = new_hasher(algorithm)
     
     with open(file_path, 'rb') as f:
         return _hash_file_object(f, hasher, chunk_size)
 
 
-def _hash_file_object(file_obj: BinaryIO, hasher: 'hashlib._Hash', chunk_size: int) -> str:
+def hash_file_multi(
+    file_path: Union[str, Path],
+    algorithms: Sequence[str],
+    chunk_size: int = 1024 * 1024
+) -> Dict[str, str]:
+    """
+    Calculate several hashes of a file with a single read.
+    
+    Each chunk read from the file is fed to one hasher per algorithm, so a
+    file can be checked against registrations made with different
+    algorithms without being read once per algorithm.
+    
+    Args:
+        file_path: Path to the file to hash
+        algorithms: Names of the algorithms, see HASH_ALGORITHMS
+        chunk_size: Size of chunks to read from the file (in bytes)
+    
+    Returns:
+        Dictionary mapping each algorithm to the 0x-prefixed hash
+    
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If one of the algorithms is not registered
+    """
+    file_path = Path(file_path)
+    
+    if not file_path.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+    
+    if not file_path.is_file():
+        raise ValueError(f"Not a file: {file_path}")
+    
+    hashers = {algorithm: new_hasher(algorithm) for algorithm in algorithms}
+    
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            for hasher in hashers.values():
+                hasher.update(chunk)
+    
+    return {algorithm: '0x' + hasher.hexdigest() for algorithm, hasher in hashers.items()}
+
+
+def hash_files(
+    file_paths: Iterable[Union[str, Path]],
+    workers: Optional[int] = None,
+    chunk_size: int = 1024 * 1024
+) -> Iterator[Tuple[Path, str]]:
+    """
+    Calculate the SHA-256 hashes of many files in parallel.
+    
+    hashlib releases the GIL while hashing large chunks, so a pool of threads
+    hashes several files at once. Only a bounded number of files are in flight
+    at any time, so the paths can come from an arbitrarily long iterator.
+    
+    Args:
+        file_paths: Paths of the files to hash
+        workers: Number of hashing threads (default: number of CPUs)
+        chunk_size: Size of chunks to read from the files (in bytes)
+    
+    Yields:
+        (path, hash) pairs, in the same order as file_paths
+    
+    Raises:
+        FileNotFoundError: If one of the files does not exist
+    """
+    workers = workers or os.cpu_count() or 1
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight: Deque[Tuple[Path, Future]] = deque()
+        
+        for file_path in file_paths:
+            file_path = Path(file_path)
+            in_flight.append((file_path, executor.submit(hash_file, file_path, chunk_size)))
+            
+            if len(in_flight) >= workers * 4:
+                path, future = in_flight.popleft()
+                yield path, future.result()
+        
+        while in_flight:
+            path, future = in_flight.popleft()
+            yield path, future.result()
+
+
+def hash_files_deduplicated(
+    file_paths: Iterable[Union[str, Path]],
+    workers: Optional[int] = None,
+    chunk_size: int = 1024 * 1024,
+    sample_size: int = 4096
+) -> Tuple[Dict[Path, str], List[List[Path]]]:
+    """
+    Calculate the SHA-256 hashes of many files, hashing each content once.
+    
+    Files are grouped by size, and files of the same size by a hash of their
+    first and last sample_size bytes. One file of each group is hashed while
+    the others are compared with it chunk by chunk, which costs far less than
+    hashing, so every file is read once; a file that turns out to differ is
+    hashed from where it diverged. Hard links to the same file are read once,
+    and a file with a size no other file has is hashed without sampling.
+    
+    Args:
+        file_paths: Paths of the files to hash
+        workers: Number of threads (default: number of CPUs)
+        chunk_size: Size of chunks to read from the files (in bytes)
+        sample_size: Number of bytes sampled at each end of a file (in bytes)
+    
+    Returns:
+        (hashes, duplicates): the hash of each path, and the groups of paths
+        with identical content, in the order of file_paths
+    
+    Raises:
+        FileNotFoundError: If one of the files does not exist
+        ValueError: If one of the paths is not a file
+    """
+    workers = workers or os.cpu_count() or 1
+    
+    unique_paths = list(dict.fromkeys(Path(p) for p in file_paths))
+    
+    # Files of each size, as lists of paths linked to the same inode
+    by_size: Dict[int, Dict[Tuple[int, int], List[Path]]] = {}
+    for file_path in unique_paths:
+        stat = file_path.stat()
+        if not stat_module.S_ISREG(stat.st_mode):
+            raise ValueError(f"Not a file: {file_path}")
+        by_size.setdefault(stat.st_size, {}).setdefault((stat.st_dev, stat.st_ino), []).append(file_path)
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        candidates: List[List[List[Path]]] = []
+        sampled: List[Tuple[int, List[Path]]] = []
+        
+        for size, inodes in by_size.items():
+            if len(inodes) == 1:
+                candidates.append(list(inodes.values()))
+            else:
+                sampled.extend((size, aliases) for aliases in inodes.values())
+        
+        by_sample: Dict[Tuple[int, bytes], List[List[Path]]] = {}
+        samples = executor.map(lambda entry: _sample_file(entry[1][0], entry[0], sample_size), sampled)
+        for (size, aliases), sample in zip(sampled, samples):
+            by_sample.setdefault((size, sample), []).append(aliases)
+        candidates.extend(by_sample.values())
+        
+        hashes: Dict[Path, str] = {}
+        for group in executor.map(lambda inodes: _hash_candidates(inodes, chunk_size), candidates):
+            for aliases, file_hash in group:
+                hashes.update((alias, file_hash) for alias in aliases)
+    
+    by_hash: Dict[str, List[Path]] = {}
+    for file_path in unique_paths:
+        by_hash.setdefault(hashes[file_path], []).append(file_path)
+    
+    duplicates = [paths for paths in by_hash.values() if len(paths) > 1]
+    return {file_path: hashes[file_path] for file_path in unique_paths}, duplicates
+
+
+def _sample_file(file_path: Path, size: int, sample_size: int) -> bytes:
+    """
+    Hash the first and last sample_size bytes of a file.
+    
+    Args:
+        file_path: Path of the file
+        size: Size of the file
+        sample_size: Number of bytes sampled at each end
+    
+    Returns:
+        The SHA-256 digest of the samples
+    """
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        hasher.update(f.read(sample_size))
+        if size > sample_size:
+            f.seek(max(sample_size, size - sample_size))
+            hasher.update(f.read(sample_size))
+    return hasher.digest()
+
+
+def _hash_candidates(inodes: List[List[Path]], chunk_size: int) -> List[Tuple[List[Path], str]]:
+    """
+    Hash files that are probably identical.
+    
+    Args:
+        inodes: Candidate files, each as the list of its hard links
+        chunk_size: Size of chunks to read from the files (in bytes)
+    
+    Returns:
+        (hard links, hash) pairs for every candidate
+    """
+    reference = inodes[0]
+    if len(inodes) == 1:
+        return [(reference, hash_file(reference[0], chunk_size))]
+    
+    results: List[Tuple[List[Path], str]] = []
+    for start in range(1, len(inodes), _COMPARE_BATCH):
+        batch = inodes[start:start + _COMPARE_BATCH]
+        reference_hash, batch_hashes = _hash_alike(reference[0], [aliases[0] for aliases in batch], chunk_size)
+        results.extend(zip(batch, batch_hashes))
+    
+    return [(reference, reference_hash)] + results
+
+
+def _hash_alike(reference: Path, others: List[Path], chunk_size: int) -> Tuple[str, List[str]]:
+    """
+    Hash a file while comparing other files with it, reading each file once.
+    
+    Args:
+        reference: Path of the file to hash
+        others: Paths of the files to compare with it
+        chunk_size: Size of chunks to read from the files (in bytes)
+    
+    Returns:
+        (hash of reference, hashes of others in order)
+    """
+    hasher = hashlib.sha256()
+    hashes: Dict[int, str] = {}
+    
+    with ExitStack() as stack:
+        reference_file = stack.enter_context(open(reference, 'rb'))
+        matching = [(index, stack.enter_context(open(path, 'rb'))) for index, path in enumerate(others)]
+        
+        while True:
+            chunk = reference_file.read(chunk_size)
+            still_matching = []
+            for index, other_file in matching:
+                other_chunk = other_file.read(chunk_size)
+                if other_chunk == chunk:
+                    still_matching.append((index, other_file))
+                else:
+                    # Everything before this chunk matched, so carry on from the reference's state
+                    diverged = hasher.copy()
+                    diverged.update(other_chunk)
+                    hashes[index] = _hash_file_object(other_file, diverged, chunk_size)
+            matching = still_matching
+            
+            if not chunk:
+                break
+            hasher.update(chunk)
+    
+    reference_hash = '0x' + hasher.hexdigest()
+    return reference_hash, [hashes.get(index, reference_hash) for index in range(len(others))]
+
+
+def expand_paths(inputs: Iterable[Union[str, Path]]) -> Iterator[Path]:
+    """
+    Expand files, directories and glob patterns into a list of files.
+    
+    Directories are walked recursively, glob patterns may use '**', and each
+    file is listed once even if several inputs match it.
+    
+    Args:
+        inputs: Files, directories or glob patterns
+    
+    Yields:
+        Paths of the matching files, in sorted order within each input
+    
+    Raises:
+        FileNotFoundError: If an input is neither an existing path nor a matching pattern
+    """
+    seen = set()
+    
+    for entry in inputs:
+        entry = str(entry)
+        
+        matches: Iterable[str]
+        if os.path.isdir(entry):
+            matches = (
+                os.path.join(root, name)
+                for root, dirs, names in _sorted_walk(entry)
+                for name in names
+            )
+        elif os.path.exists(entry):
+            matches = [entry]
+        else:
+            matches = sorted(glob.glob(entry, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"No files match: {entry}")
+        
+        for match in matches:
+            path = Path(match)
+            key = os.path.realpath(match)
+            if key not in seen and path.is_file():
+                seen.add(key)
+                yield path
+
+
+def _sorted_walk(directory: str):
+    for root, dirs, names in os.walk(directory):
+        dirs.sort()
+        yield root, dirs, sorted(names)
+
+
+def hash_stream(stream: BinaryIO, chunk_size: int = 8192, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    """
+    Calculate the SHA-256 hash of a binary stream.
+    
+    Args:
+        stream: Binary file object to read until EOF
+        chunk_size: Size of chunks to read from the stream (in bytes)
+        algorithm: Hash algorithm to use instead of SHA-256, see HASH_ALGORITHMS
+    
+    Returns:
+        The hexadecimal representation of the hash, prefixed with '0x'
+    """
+    return _hash_file_object(stream, new_hasher(algorithm), chunk_size)
+
+
+def _hash_file_object(file_obj: IO[bytes], hasher: Hasher, chunk_size: int) -> str:
     """
     Hash a file object using the provided hasher.
     
@@ -59,20 +488,387 @@ def _hash_file_object(file_obj: BinaryIO, hasher: 'hashlib._Hash', chunk_size: i
     return '0x' + hasher.hexdigest()
 
 
-def hash_content(content: Union[str, bytes]) -> str:
+def hash_archive(
+    archive_path: Union[str, Path],
+    workers: Optional[int] = None,
+    chunk_size: int = 1024 * 1024
+) -> Iterator[Tuple[str, str]]:
+    """
+    Calculate the SHA-256 hashes of the files inside a zip or tar archive.
+    
+    Members are streamed from the archive through the hasher without being
+    extracted. Zip members are hashed in parallel, each thread reading the
+    archive through its own handle; a tar archive, possibly compressed, is
+    read once from start to end. Directories, links and other special
+    members are skipped.
+    
+    Args:
+        archive_path: Path of a .zip, .tar, .tar.gz, .tar.bz2 or .tar.xz archive
+        workers: Number of hashing threads for zip archives (default: number of CPUs)
+        chunk_size: Size of chunks to read from the members (in bytes)
+    
+    Yields:
+        (member path, hash) pairs, in archive order
+    
+    Raises:
+        FileNotFoundError: If the archive does not exist
+        ValueError: If the file is not a zip or tar archive
+    """
+    archive_path = Path(archive_path)
+    
+    if not archive_path.exists():
+        raise FileNotFoundError(f"File not found: {archive_path}")
+    
+    if zipfile.is_zipfile(archive_path):
+        return _hash_zip_members(archive_path, workers or os.cpu_count() or 1, chunk_size)
+    if tarfile.is_tarfile(archive_path):
+        return _hash_tar_members(archive_path, chunk_size)
+    raise ValueError(f"Not a zip or tar archive: {archive_path}")
+
+
+def _hash_zip_members(archive_path: Path, workers: int, chunk_size: int) -> Iterator[Tuple[str, str]]:
+    handles = threading.local()
+    opened = []
+    
+    def hash_member(info: zipfile.ZipInfo) -> str:
+        archive = getattr(handles, "archive", None)
+        if archive is None:
+            archive = handles.archive = zipfile.ZipFile(archive_path)
+            opened.append(archive)
+        with archive.open(info) as member:
+            return _hash_file_object(member, hashlib.sha256(), chunk_size)
+    
+    with zipfile.ZipFile(archive_path) as archive:
+        members = [info for info in archive.infolist() if not info.is_dir()]
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight: Deque[Tuple[str, Future]] = deque()
+            
+            for info in members:
+                in_flight.append((info.filename, executor.submit(hash_member, info)))
+                
+                if len(in_flight) >= workers * 4:
+                    name, future = in_flight.popleft()
+                    yield name, future.result()
+            
+            while in_flight:
+                name, future = in_flight.popleft()
+                yield name, future.result()
+    finally:
+        for archive in opened:
+            archive.close()
+
+
+def _hash_tar_members(archive_path: Path, chunk_size: int) -> Iterator[Tuple[str, str]]:
+    # Stream mode reads the archive once, without seeking back for the member index
+    with tarfile.open(archive_path, mode='r|*') as archive:
+        for info in archive:
+            member = archive.extractfile(info) if info.isfile() else None
+            if member is not None:
+                yield info.name, _hash_file_object(member, hashlib.sha256(), chunk_size)
+
+
+class Hash32(str):
+    """
+    A 32-byte hash: its canonical 0x-prefixed hex string, with the raw bytes kept alongside.
+    
+    The contract takes bytes32 values while users see 0x-prefixed hex strings.
+    A Hash32 is parsed once and keeps both forms, so bulk paths do not encode
+    and decode the same hash at every step. It is a str holding the lowercase
+    hex form, so it serializes, slices, compares and hashes like that string
+    and can be used wherever a hash string is expected.
+    """
+    
+    __slots__ = ("_raw",)
+    _raw: bytes
+    
+    def __new__(cls, raw: bytes) -> 'Hash32':
+        """
+        Wrap a raw digest.
+        
+        Args:
+            raw: The 32 bytes of the hash
+        
+        Raises:
+            ValueError: If the value is not 32 bytes long
+        """
+        raw = bytes(raw)
+        if len(raw) != DIGEST_SIZE:
+            raise ValueError(f"Invalid hash: expected {DIGEST_SIZE} bytes, got {len(raw)}")
+        instance = super().__new__(cls, '0x' + raw.hex())
+        instance._raw = raw
+        return instance
+    
+    @classmethod
+    def from_hex(cls, file_hash: str) -> 'Hash32':
+        """
+        Parse a hex hash.
+        
+        Args:
+            file_hash: Hash to parse, with or without the '0x' prefix, in any case
+        
+        Returns:
+            The parsed Hash32
+        
+        Raises:
+            ValueError: If the value is not a 32-byte hexadecimal hash
+        """
+        value = file_hash.strip().lower()
+        
+        if value.startswith('0x'):
+            value = value[2:]
+        
+        if len(value) != DIGEST_SIZE * 2:
+            raise ValueError(f"Invalid hash: {file_hash}")
+        
+        try:
+            raw = bytes.fromhex(value)
+        except ValueError:
+            raise ValueError(f"Invalid hash: {file_hash}")
+        
+        instance = str.__new__(cls, '0x' + value)
+        instance._raw = raw
+        return instance
+    
+    @classmethod
+    def coerce(cls, file_hash: Union['Hash32', str, bytes]) -> 'Hash32':
+        """
+        Convert a hash given in any supported form, without copying a Hash32.
+        
+        Args:
+            file_hash: Hash32, hex string or raw 32 bytes
+        
+        Returns:
+            The hash as a Hash32
+        
+        Raises:
+            ValueError: If the value is not a valid 32-byte hash
+        """
+        if isinstance(file_hash, Hash32):
+            return file_hash
+        if isinstance(file_hash, str):
+            return cls.from_hex(file_hash)
+        return cls(file_hash)
+    
+    @property
+    def raw(self) -> bytes:
+        """The 32 bytes of the hash, as passed to the contract."""
+        return self._raw
+    
+    @property
+    def hex(self) -> str:
+        """The lowercase hexadecimal representation of the hash, prefixed with '0x', as a plain str."""
+        return str.__str__(self)
+    
+    def __bytes__(self) -> bytes:
+        return self._raw
+    
+    def __repr__(self) -> str:
+        return f"Hash32({self.hex!r})"
+    
+    def __reduce__(self):
+        return Hash32, (self._raw,)
+
+
+def normalize_hash(file_hash: Union[str, Hash32]) -> str:
+    """
+    Normalize a hash to its canonical form.
+    
+    Args:
+        file_hash: Hash to normalize, with or without the '0x' prefix, or a Hash32
+    
+    Returns:
+        The lowercase hexadecimal representation of the hash, prefixed with '0x'
+    
+    Raises:
+        ValueError: If the value is not a 32-byte hexadecimal hash
+    """
+    if isinstance(file_hash, Hash32):
+        return file_hash.hex
+    
+    value = file_hash.strip().lower()
+    
+    if value.startswith('0x'):
+        value = value[2:]
+    
+    if len(value) != 64:
+        raise ValueError(f"Invalid hash: {file_hash}")
+    
+    try:
+        bytes.fromhex(value)
+    except ValueError:
+        raise ValueError(f"Invalid hash: {file_hash}")
+    
+    return '0x' + value
+
+
+def hash_content(content: Union[str, bytes], algorithm: str = DEFAULT_ALGORITHM) -> str:
     """
     Calculate the SHA-256 hash of content.
     
     Args:
         content: Content to hash (string or bytes)
+        algorithm: Hash algorithm to use instead of SHA-256, see HASH_ALGORITHMS
         
     Returns:
         The hexadecimal representation of the hash, prefixed with '0x'
+    
+    Raises:
+        ValueError: If the algorithm is not registered
     """
-    hasher = hashlib.sha256()
+    hasher = new_hasher(algorithm)
     
     if isinstance(content, str):
         content = content.encode('utf-8')
     
     hasher.update(content)
     return '0x' + hasher.hexdigest()
+
+
+class DigestArray:
+    """
+    Raw 32-byte digests stored back to back in one contiguous buffer.
+    
+    Digests are only converted to 0x-prefixed hex strings when asked for, so
+    millions of them take 32 bytes each instead of a Python string each.
+    """
+    
+    def __init__(self, buffer: Union[bytes, bytearray] = b""):
+        """
+        Wrap a buffer of concatenated digests.
+        
+        Args:
+            buffer: Concatenated raw digests
+        
+        Raises:
+            ValueError: If the buffer length is not a multiple of the digest size
+        """
+        if len(buffer) % DIGEST_SIZE:
+            raise ValueError(f"Buffer length {len(buffer)} is not a multiple of {DIGEST_SIZE}")
+        self.buffer = bytes(buffer)
+    
+    def __len__(self) -> int:
+        return len(self.buffer) // DIGEST_SIZE
+    
+    def __getitem__(self, index: int) -> bytes:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("digest index out of range")
+        return self.buffer[index * DIGEST_SIZE:(index + 1) * DIGEST_SIZE]
+    
+    def __iter__(self) -> Iterator[bytes]:
+        view = memoryview(self.buffer)
+        for start in range(0, len(self.buffer), DIGEST_SIZE):
+            yield bytes(view[start:start + DIGEST_SIZE])
+    
+    def hex(self, index: int) -> str:
+        """
+        Get one digest as a hash string.
+        
+        Args:
+            index: Position of the digest
+        
+        Returns:
+            The hexadecimal representation of the digest, prefixed with '0x'
+        """
+        return '0x' + self[index].hex()
+    
+    def hexes(self) -> Iterator[str]:
+        """
+        Iterate over the digests as hash strings, converting them on the fly.
+        
+        Yields:
+            The hexadecimal representation of each digest, prefixed with '0x'
+        """
+        view = memoryview(self.buffer)
+        step = DIGEST_SIZE * 4096
+        for start in range(0, len(self.buffer), step):
+            text = view[start:start + step].hex()
+            for offset in range(0, len(text), DIGEST_SIZE * 2):
+                yield '0x' + text[offset:offset + DIGEST_SIZE * 2]
+    
+    def to_numpy(self) -> 'numpy.ndarray':
+        """
+        View the digests as a NumPy array of dtype S32, without copying them.
+        
+        Returns:
+            A read-only array with one 32-byte element per digest
+        
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        # Imported here, so that importing this module stays fast for the CLI
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError(
+                "numpy is required for NumPy digest arrays. "
+                "Install it with: pip install numpy"
+            )
+        return numpy.frombuffer(self.buffer, dtype=f'S{DIGEST_SIZE}')
+
+
+def hash_contents(
+    contents: Iterable[Union[str, bytes]],
+    workers: Optional[int] = None,
+    algorithm: str = DEFAULT_ALGORITHM,
+    chunk_records: int = 10000
+) -> DigestArray:
+    """
+    Hash many small records, such as database rows, in worker processes.
+    
+    The records are sent to the workers in chunks and every chunk comes back
+    as one buffer of raw digests, so the per-record cost is the hashing
+    itself rather than building a hex string. Inputs that fit in a single
+    chunk, and algorithms added with register_algorithm, which worker
+    processes do not know, are hashed in this process.
+    
+    Args:
+        contents: Records to hash (strings or bytes), in order
+        workers: Number of worker processes (default: number of CPUs)
+        algorithm: Hash algorithm to use instead of SHA-256, see HASH_ALGORITHMS
+        chunk_records: Number of records sent to a worker at a time (default: 10000)
+    
+    Returns:
+        DigestArray holding the digest of each record, in input order
+    
+    Raises:
+        ValueError: If the algorithm is not registered
+    """
+    new_hasher(algorithm)
+    workers = workers or os.cpu_count() or 1
+    records = iter(contents)
+    buffer = bytearray()
+    
+    first = list(islice(records, chunk_records))
+    builtin = HASH_ALGORITHMS[algorithm] is _BUILTIN_ALGORITHMS.get(algorithm)
+    if workers == 1 or len(first) < chunk_records or not builtin:
+        buffer += _digest_records(first, algorithm)
+        for chunk in iter(lambda: list(islice(records, chunk_records)), []):
+            buffer += _digest_records(chunk, algorithm)
+        return DigestArray(buffer)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded number of chunks in flight, so the input is read lazily
+        pending = deque([executor.submit(_digest_records, first, algorithm)])
+        for chunk in iter(lambda: list(islice(records, chunk_records)), []):
+            pending.append(executor.submit(_digest_records, chunk, algorithm))
+            if len(pending) >= workers * 2:
+                buffer += pending.popleft().result()
+        while pending:
+            buffer += pending.popleft().result()
+    
+    return DigestArray(buffer)
+
+
+def _digest_records(records: List[Union[str, bytes]], algorithm: str) -> bytes:
+    # Copying an empty hasher is cheaper than looking up and calling its factory
+    copy = new_hasher(algorithm).copy
+    digests = []
+    for record in records:
+        hasher = copy()
+        hasher.update(record.encode('utf-8') if isinstance(record, str) else record)
+        digests.append(hasher.digest())
+    return b"".join(digests)
@@ -0,0 +1,136 @@
+"""
+Registration journal for the ProveIt package.
+
+Bulk registrations record every step in an append-only JSON Lines file: each
+file's hash, each transaction before it is sent, and each confirmation. An
+interrupted run replays the journal to skip files that were already hashed
+and hashes that were already submitted, so resuming never rehashes unchanged
+files nor sends a registration twice.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+# Journal states after which a hash needs no further work
+FINAL_STATES = ("confirmed", "registered")
+
+
+class RegistrationJournal:
+    """
+    Append-only log of the progress of a bulk registration.
+    """
+    
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open a journal, replaying the records of earlier runs.
+        
+        Args:
+            path: Path of the journal file, created if it does not exist
+        """
+        self.path = Path(path)
+        self._files: Dict[str, Tuple[int, int, str]] = {}
+        self._states: Dict[str, Dict[str, Any]] = {}
+        
+        if self.path.exists():
+            self._replay()
+        
+        self._file = open(self.path, 'a', encoding='utf-8')
+        
+        # Terminate a torn last line so the next record starts on a line of its own
+        if self._file.tell() > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._file.write('\n')
+    
+    def _replay(self) -> None:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn last line from an interrupted write
+                    continue
+                
+                if record.get("event") == "hashed":
+                    self._files[record["path"]] = (record["size"], record["mtime_ns"], record["hash"])
+                elif "hash" in record:
+                    self._states[record["hash"]] = record
+    
+    def cached_hash(self, path: Path, stat: os.stat_result) -> Optional[str]:
+        """
+        Look up the hash of a file recorded by an earlier run.
+        
+        Args:
+            path: Path of the file
+            stat: Current stat of the file
+        
+        Returns:
+            The recorded hash, or None if the file was not hashed or has changed since
+        """
+        entry = self._files.get(str(path))
+        if entry is None or entry[:2] != (stat.st_size, stat.st_mtime_ns):
+            return None
+        return entry[2]
+    
+    def record_hash(self, path: Path, stat: os.stat_result, file_hash: str) -> None:
+        """
+        Record the hash of a file.
+        
+        Args:
+            path: Path of the file
+            stat: Stat of the file when it was hashed
+            file_hash: Hash of the file
+        """
+        self._files[str(path)] = (stat.st_size, stat.st_mtime_ns, file_hash)
+        self._write({
+            "event": "hashed",
+            "path": str(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": file_hash
+        })
+    
+    def state(self, file_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the last recorded registration step of a hash.
+        
+        Args:
+            file_hash: Normalized hash
+        
+        Returns:
+            The last record for the hash, with its "event" and step details, or None
+        """
+        return self._states.get(file_hash)
+    
+    def record(self, file_hash: str, event: str, durable: bool = False, **details: Any) -> None:
+        """
+        Record a registration step.
+        
+        Args:
+            file_hash: Normalized hash
+            event: "submitted", "confirmed", "registered" (already on chain) or "failed"
+            durable: Flush the record to disk before returning, e.g. before sending a transaction
+            **details: Additional JSON-serializable fields, such as tx_hash or nonce
+        """
+        record = {"event": event, "hash": file_hash, **details}
+        self._states[file_hash] = record
+        self._write(record, durable)
+    
+    def _write(self, record: Dict[str, Any], durable: bool = False) -> None:
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        if durable:
+            os.fsync(self._file.fileno())
+    
+    def close(self) -> None:
+        """Close the journal file."""
+        self._file.close()
+    
+    def __enter__(self) -> "RegistrationJournal":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -3,9 +3,11 @@ Data models for the ProveIt package.
 """
 
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+from .hash import Hash32
 
 
 class NetworkType(Enum):
@@ -20,7 +22,7 @@ class NetworkType(Enum):
 @dataclass
 class RegistrationResult:
     """Result of a file registration operation."""
-    hash: str
+    hash: Hash32
     tx_hash: str
     owner: str
     timestamp: datetime
@@ -44,20 +46,25 @@ class RegistrationResult:
 @dataclass
 class VerificationResult:
     """Result of a file verification operation."""
-    hash: str
+    # None for a file that could not be read, which is named by path
+    hash: Optional[Hash32]
     is_registered: bool
     owner: Optional[str] = None
     timestamp: Optional[datetime] = None
     metadata: Optional[str] = None
     network: Optional[NetworkType] = None
+    path: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the verification result to a dictionary."""
-        result = {
+        result: Dict[str, Any] = {
             "hash": self.hash,
             "is_registered": self.is_registered
         }
         
+        if self.path is not None:
+            result["path"] = self.path
+        
         if self.is_registered:
             result.update({
                 "owner": self.owner,
@@ -69,6 +76,62 @@ class VerificationResult:
         return result
 
 
+@dataclass
+class BulkRegistrationSummary:
+    """Outcome of a bulk registration."""
+    files: int = 0
+    hashes: int = 0
+    confirmed: int = 0
+    already_registered: int = 0
+    pending: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the summary to a dictionary."""
+        return {
+            "files": self.files,
+            "hashes": self.hashes,
+            "confirmed": self.confirmed,
+            "already_registered": self.already_registered,
+            "pending": self.pending,
+            "failed": dict(self.failed)
+        }
+
+
+@dataclass
+class AuditReport:
+    """Differences found by an archive audit since the previous audit."""
+    files: int = 0
+    unchanged: int = 0
+    rehashed: int = 0
+    queried: int = 0
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    newly_registered: List[str] = field(default_factory=list)
+    unregistered: List[str] = field(default_factory=list)
+    
+    @property
+    def ok(self) -> bool:
+        """Whether every file is unchanged and registered."""
+        return not (self.modified or self.missing or self.unregistered)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the report to a dictionary."""
+        return {
+            "ok": self.ok,
+            "files": self.files,
+            "unchanged": self.unchanged,
+            "rehashed": self.rehashed,
+            "queried": self.queried,
+            "added": list(self.added),
+            "modified": list(self.modified),
+            "missing": list(self.missing),
+            "newly_registered": list(self.newly_registered),
+            "unregistered": list(self.unregistered)
+        }
+
+
 @dataclass
 class Certificate:
     """Certificate of registration."""
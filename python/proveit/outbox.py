@@ -0,0 +1,313 @@
+"""
+Registration outbox for the ProveIt package.
+
+Registering a hash needs the RPC endpoint to be up, and takes as long as the
+chain takes to mine it. The outbox decouples the two: registrations are
+written to a local SQLite database in a few milliseconds, and a flusher
+submits them later, in batches, whenever the network is reachable.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from .blockchain import parse_network
+from .hash import hash_file, normalize_hash
+from .models import BulkRegistrationSummary
+
+# Outbox states; "confirmed" and "registered" (already on chain) are final
+OUTBOX_STATES = ("queued", "submitted", "confirmed", "registered", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS registrations (
+    network TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '',
+    path TEXT,
+    state TEXT NOT NULL DEFAULT 'queued',
+    tx_hash TEXT,
+    nonce INTEGER,
+    block_number INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (network, hash)
+);
+CREATE INDEX IF NOT EXISTS registrations_state ON registrations (network, state, enqueued_at);
+"""
+
+
+class RegistrationOutbox:
+    """
+    Durable queue of registrations waiting to be submitted, backed by SQLite.
+    
+    The outbox can be shared between threads, and between processes through
+    the same database file: one process may enqueue while another flushes.
+    """
+    
+    def __init__(self, path: Union[str, Path], max_attempts: int = 5):
+        """
+        Open an outbox, creating the database if needed.
+        
+        Args:
+            path: Path of the SQLite database
+            max_attempts: Number of failed sends after which a registration is
+                given up and marked as failed (default: 5)
+        """
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        
+        self._db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # Every commit reaches the disk before enqueue() returns
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(_SCHEMA)
+    
+    def enqueue(self, file_hash: str, metadata: str = "", network: str = "polygon", path: Optional[str] = None) -> bool:
+        """
+        Add a registration to the outbox.
+        
+        Args:
+            file_hash: Hash to register
+            metadata: Optional metadata to associate with the hash
+            network: Network to register the hash on (default: polygon)
+            path: Optional path of the file, kept for reference
+        
+        Returns:
+            True if the hash was added, False if it was already in the outbox for the network
+        
+        Raises:
+            ValueError: If the hash is not a valid SHA-256 hash, or the network is unknown
+        """
+        return self.enqueue_many([(file_hash, metadata, path)], network) == 1
+    
+    def enqueue_many(self, entries: Iterable[Tuple[str, str, Optional[str]]], network: str = "polygon") -> int:
+        """
+        Add registrations to the outbox in one transaction.
+        
+        Args:
+            entries: (hash, metadata, path) tuples; path may be None
+            network: Network to register the hashes on (default: polygon)
+        
+        Returns:
+            Number of hashes added; hashes already in the outbox are left as they are
+        
+        Raises:
+            ValueError: If a hash is not a valid SHA-256 hash, or the network is unknown
+        """
+        network = parse_network(network).value
+        now = time.time()
+        rows = [(network, normalize_hash(h), metadata or "", path, now, now) for h, metadata, path in entries]
+        
+        with self._lock, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO registrations (network, hash, metadata, path, enqueued_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return self._db.total_changes - before
+    
+    def enqueue_file(self, file_path: Union[str, Path], metadata: str = "", network: str = "polygon") -> str:
+        """
+        Hash a file and add its registration to the outbox.
+        
+        Args:
+            file_path: Path of the file
+            metadata: Optional metadata to associate with the file
+            network: Network to register the file on (default: polygon)
+        
+        Returns:
+            The hash of the file
+        
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        file_hash = hash_file(file_path, 1024 * 1024)
+        self.enqueue(file_hash, metadata, network, str(file_path))
+        return file_hash
+    
+    def get(self, file_hash: str, network: str = "polygon") -> Optional[Dict[str, Any]]:
+        """
+        Look up a registration in the outbox.
+        
+        Args:
+            file_hash: Hash to look up
+            network: Network of the registration (default: polygon)
+        
+        Returns:
+            The outbox entry as a dictionary, or None if the hash is not in the outbox
+        
+        Raises:
+            ValueError: If the network is unknown
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM registrations WHERE network = ? AND hash = ?",
+                (parse_network(network).value, normalize_hash(file_hash))
+            ).fetchone()
+        return dict(row) if row is not None else None
+    
+    def counts(self, network: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count the registrations in each state.
+        
+        Args:
+            network: Only count the registrations for this network (default: all networks)
+        
+        Returns:
+            Dictionary with the number of registrations in each of OUTBOX_STATES
+        
+        Raises:
+            ValueError: If the network is unknown
+        """
+        query = "SELECT state, COUNT(*) FROM registrations"
+        params: Tuple[Any, ...] = ()
+        if network is not None:
+            query += " WHERE network = ?"
+            params = (parse_network(network).value,)
+        
+        with self._lock:
+            counts = dict(self._db.execute(query + " GROUP BY state", params).fetchall())
+        return {state: counts.get(state, 0) for state in OUTBOX_STATES}
+    
+    def flush(
+        self,
+        prover,
+        batch_size: int = 500,
+        max_pending: int = 16,
+        confirm_timeout: float = 120
+    ) -> BulkRegistrationSummary:
+        """
+        Submit the waiting registrations for the prover's network.
+        
+        Registrations are taken in the order they were enqueued, batch_size at
+        a time, and go through ProveIt.register_hashes: hashes already on
+        chain are skipped after a bulk lookup and the others are sent with
+        consecutive nonces. Transactions sent by an earlier flush are followed
+        up rather than sent again.
+        
+        Args:
+            prover: ProveIt instance used to register the hashes
+            batch_size: Number of registrations per batch (default: 500)
+            max_pending: Maximum number of unconfirmed transactions (default: 16)
+            confirm_timeout: Seconds to wait for each transaction to be mined (default: 120)
+        
+        Returns:
+            BulkRegistrationSummary of the flush
+        
+        Raises:
+            Exception: Whatever the RPC layer raised when the network is unreachable;
+                the outbox keeps every registration that was not confirmed
+        """
+        network = prover.blockchain.network.value
+        journal = _OutboxJournal(self, network)
+        total = BulkRegistrationSummary()
+        last_key: Tuple[float, str] = (-1.0, "")
+        
+        while True:
+            # Page on the enqueue order, so that registrations left queued for a retry are not taken twice
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT hash, metadata, enqueued_at FROM registrations "
+                    "WHERE network = ? AND state IN ('queued', 'submitted') AND (enqueued_at, hash) > (?, ?) "
+                    "ORDER BY enqueued_at, hash LIMIT ?",
+                    (network, *last_key, batch_size)
+                ).fetchall()
+            if not rows:
+                break
+            last_key = (rows[-1]["enqueued_at"], rows[-1]["hash"])
+            
+            summary = prover.register_hashes(
+                [row["hash"] for row in rows],
+                {row["hash"]: row["metadata"] for row in rows},
+                journal=journal,
+                max_pending=max_pending,
+                confirm_timeout=confirm_timeout
+            )
+            
+            total.hashes += summary.hashes
+            total.confirmed += summary.confirmed
+            total.already_registered += summary.already_registered
+            total.pending += summary.pending
+            total.failed.update(summary.failed)
+        
+        return total
+    
+    def purge(self, network: Optional[str] = None) -> int:
+        """
+        Remove the registrations that need no further work.
+        
+        Args:
+            network: Only purge the registrations for this network (default: all networks)
+        
+        Returns:
+            Number of registrations removed
+        
+        Raises:
+            ValueError: If the network is unknown
+        """
+        query = "DELETE FROM registrations WHERE state IN ('confirmed', 'registered')"
+        params: Tuple[Any, ...] = ()
+        if network is not None:
+            query += " AND network = ?"
+            params = (parse_network(network).value,)
+        
+        with self._lock:
+            return self._db.execute(query, params).rowcount
+    
+    def _update(self, network: str, file_hash: str, state: str, **fields: Any) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(
+                f"UPDATE registrations SET state = ?, updated_at = ?{', ' if fields else ''}{assignments} "
+                "WHERE network = ? AND hash = ?",
+                (state, time.time(), *fields.values(), network, file_hash)
+            )
+    
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+    
+    def __enter__(self) -> "RegistrationOutbox":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class _OutboxJournal:
+    """Journal interface of register_hashes, backed by the outbox of one network."""
+    
+    def __init__(self, outbox: RegistrationOutbox, network: str):
+        self.outbox = outbox
+        self.network = network
+    
+    def state(self, file_hash: str) -> Optional[Dict[str, Any]]:
+        entry = self.outbox.get(file_hash, self.network)
+        if entry is None or entry["state"] == "queued":
+            return None
+        return {"event": entry["state"], "hash": file_hash, "tx_hash": entry["tx_hash"]}
+    
+    def record(self, file_hash: str, event: str, durable: bool = False, **details: Any) -> None:
+        # Every update is committed synchronously, so durable needs no special handling
+        fields: Dict[str, Any] = {name: details[name] for name in ("tx_hash", "nonce", "block_number") if name in details}
+        
+        if event == "failed":
+            entry = self.outbox.get(file_hash, self.network) or {}
+            attempts = entry.get("attempts", 0) + 1
+            fields.update(attempts=attempts, error=details.get("error"))
+            # A failed send is retried by a later flush; a reverted transaction is not
+            if "tx_hash" not in details and attempts < self.outbox.max_attempts:
+                event = "queued"
+        elif event in ("confirmed", "registered"):
+            fields["error"] = None
+        
+        self.outbox._update(self.network, file_hash, event, **fields)
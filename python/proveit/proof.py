@@ -0,0 +1,509 @@
+"""
+Offline-verifiable registration proofs for the ProveIt package.
+
+A proof certificate embeds everything needed to check a registration without
+querying the blockchain: the header of the block the registration was mined
+in, the receipt of the registering transaction and a Merkle-Patricia proof
+that the receipt is part of the block's receipt trie. Checking a certificate
+only needs a trusted list of block hashes, which can be shared by thousands
+of certificates.
+"""
+
+import json
+from datetime import datetime
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+import rlp
+from eth_abi import decode as abi_decode
+from eth_utils import keccak, to_checksum_address
+
+# Version of the proof certificate format
+PROOF_VERSION = 1
+
+# Topic of the contract's HashRegistered(bytes32,address,uint256,string) event
+HASH_REGISTERED_TOPIC = keccak(text="HashRegistered(bytes32,address,uint256,string)")
+
+# Block header fields, in RLP order. Fields from later forks are appended when present.
+_HEADER_FIELDS = (
+    "parentHash", "sha3Uncles", "miner", "stateRoot", "transactionsRoot",
+    "receiptsRoot", "logsBloom", "difficulty", "number", "gasLimit", "gasUsed",
+    "timestamp", "extraData", "mixHash", "nonce", "baseFeePerGas",
+    "withdrawalsRoot", "blobGasUsed", "excessBlobGas", "parentBeaconBlockRoot",
+    "requestsHash",
+)
+_HEADER_REQUIRED_FIELDS = 15
+_HEADER_RECEIPTS_ROOT = 5
+_HEADER_NUMBER = 8
+
+
+class ProofError(ValueError):
+    """Raised when a proof certificate is malformed or does not prove what it claims."""
+
+
+def encode_block_header(block: Mapping[str, Any]) -> bytes:
+    """
+    RLP-encode a block header.
+    
+    Args:
+        block: Block as returned by eth_getBlockByNumber or eth_getBlockByHash
+    
+    Returns:
+        The encoded header, whose Keccak-256 hash is the block hash
+    """
+    fields = []
+    
+    for index, name in enumerate(_HEADER_FIELDS):
+        if index >= _HEADER_REQUIRED_FIELDS and block.get(name) is None:
+            break
+        fields.append(_to_rlp_value(block[name]))
+    
+    return rlp.encode(fields)
+
+
+def encode_receipt(receipt: Mapping[str, Any]) -> bytes:
+    """
+    Encode a transaction receipt the way it is stored in the receipt trie.
+    
+    Args:
+        receipt: Receipt as returned by eth_getTransactionReceipt
+    
+    Returns:
+        The consensus encoding of the receipt (EIP-2718 typed receipts are prefixed with their type)
+    """
+    if receipt.get("root") is not None:
+        # Receipts from before the Byzantium fork carry a state root instead of a status
+        outcome = _to_rlp_value(receipt["root"])
+    else:
+        outcome = _to_rlp_value(receipt["status"])
+    
+    logs = [
+        [
+            _to_rlp_value(log["address"]),
+            [_to_rlp_value(topic) for topic in log["topics"]],
+            _to_rlp_value(log["data"]),
+        ]
+        for log in receipt["logs"]
+    ]
+    
+    encoded = rlp.encode([
+        outcome,
+        _to_rlp_value(receipt["cumulativeGasUsed"]),
+        _to_rlp_value(receipt["logsBloom"]),
+        logs,
+    ])
+    
+    receipt_type = _to_int(receipt.get("type") or 0)
+    return encoded if receipt_type == 0 else bytes([receipt_type]) + encoded
+
+
+def build_receipt_proof(
+    receipts: Sequence[Mapping[str, Any]],
+    transaction_index: int
+) -> Tuple[bytes, List[bytes]]:
+    """
+    Build the receipt trie of a block and a proof for one of its receipts.
+    
+    Args:
+        receipts: All receipts of the block, in transaction order
+        transaction_index: Index of the transaction whose receipt should be proven
+    
+    Returns:
+        (receipts_root, proof) tuple, where proof lists the RLP-encoded trie nodes from the root down
+    """
+    items = sorted(
+        (_to_nibbles(rlp.encode(index)), encode_receipt(receipt))
+        for index, receipt in enumerate(receipts)
+    )
+    
+    nodes: Dict[bytes, bytes] = {}
+    root = rlp.encode(_build_trie_node(items, 0, nodes))
+    root_hash = keccak(root)
+    nodes[root_hash] = root
+    
+    proof: List[bytes] = []
+    _walk_trie(root_hash, rlp.encode(transaction_index), nodes, proof)
+    
+    return root_hash, proof
+
+
+def verify_receipt_proof(receipts_root: bytes, transaction_index: int, proof: List[bytes]) -> bytes:
+    """
+    Check a receipt trie proof.
+    
+    Args:
+        receipts_root: Receipts root of the block
+        transaction_index: Index of the transaction in the block
+        proof: RLP-encoded trie nodes
+    
+    Returns:
+        The encoded receipt proven to be in the trie
+    
+    Raises:
+        ProofError: If the proof is invalid
+    """
+    nodes = {keccak(node): node for node in proof}
+    return _walk_trie(receipts_root, rlp.encode(transaction_index), nodes)
+
+
+def create_proof_certificate(
+    file_hash: str,
+    contract_address: str,
+    network: str,
+    tx_hash: str,
+    block: Mapping[str, Any],
+    receipts: Sequence[Mapping[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Assemble a proof certificate for a registration.
+    
+    Args:
+        file_hash: Registered hash
+        contract_address: Address of the ProveIt contract
+        network: Network the registration was made on
+        tx_hash: Hash of the registering transaction
+        block: Block the transaction was mined in
+        receipts: All receipts of the block, in transaction order
+    
+    Returns:
+        Dictionary with the certificate, ready to be serialized as JSON
+    
+    Raises:
+        ProofError: If the transaction did not register the hash with the given contract
+    """
+    header = encode_block_header(block)
+    block_hash = keccak(header)
+    
+    if block_hash != _to_bytes(block["hash"]):
+        raise ProofError(f"Could not reproduce the header of block {_to_int(block['number'])}")
+    
+    tx_hash_bytes = _to_bytes(tx_hash)
+    transaction_index = next(
+        (index for index, receipt in enumerate(receipts) if _to_bytes(receipt["transactionHash"]) == tx_hash_bytes),
+        None
+    )
+    if transaction_index is None:
+        raise ProofError(f"Transaction {tx_hash} is not in block {_to_int(block['number'])}")
+    
+    receipts_root, proof = build_receipt_proof(receipts, transaction_index)
+    
+    if receipts_root != _to_bytes(block["receiptsRoot"]):
+        raise ProofError(f"Could not reproduce the receipts root of block {_to_int(block['number'])}")
+    
+    receipt = encode_receipt(receipts[transaction_index])
+    log_index = _find_registration_log(_decode_receipt_logs(receipt), contract_address, file_hash)
+    
+    if log_index is None:
+        raise ProofError(f"Transaction {tx_hash} did not register {file_hash}")
+    
+    return {
+        "version": PROOF_VERSION,
+        "hash": _to_hex(_to_bytes(file_hash)),
+        "network": network,
+        "contract": to_checksum_address(contract_address),
+        "tx_hash": _to_hex(tx_hash_bytes),
+        "block_number": _to_int(block["number"]),
+        "block_hash": _to_hex(block_hash),
+        "transaction_index": transaction_index,
+        "log_index": log_index,
+        "block_header": _to_hex(header),
+        "receipt": _to_hex(receipt),
+        "receipt_proof": [_to_hex(node) for node in proof],
+    }
+
+
+def verify_proof_certificate(
+    certificate: Dict[str, Any],
+    trusted_block_hashes: Optional[Set[str]],
+    contract_address: str
+) -> Dict[str, Any]:
+    """
+    Check a proof certificate without querying the blockchain.
+    
+    The expected contract is required: anyone can deploy a contract emitting
+    the same HashRegistered event and get it mined in a genuine block, so the
+    contract named in the certificate proves nothing by itself.
+    
+    Args:
+        certificate: Proof certificate, as created by create_proof_certificate
+        trusted_block_hashes: Block hashes known to be part of the chain, or None to not anchor the block
+        contract_address: Address of the ProveIt contract the registration must have been made with
+    
+    Returns:
+        Dictionary with the proven registration: hash, owner, timestamp, metadata,
+        network, contract, tx_hash, block_number and block_hash
+    
+    Raises:
+        ValueError: If no contract address is given
+        ProofError: If the certificate is malformed, its proof is invalid, its
+            block is not one of the trusted blocks, or the registration was made
+            with another contract
+    """
+    if not contract_address:
+        raise ValueError("The address of the ProveIt contract is required")
+    
+    if certificate.get("version") != PROOF_VERSION:
+        raise ProofError(f"Unsupported proof certificate version: {certificate.get('version')}")
+    
+    try:
+        header = _to_bytes(certificate["block_header"])
+        receipt = _to_bytes(certificate["receipt"])
+        proof = [_to_bytes(node) for node in certificate["receipt_proof"]]
+        transaction_index = int(certificate["transaction_index"])
+        log_index = int(certificate["log_index"])
+        file_hash = _to_bytes(certificate["hash"])
+        certified_contract = certificate["contract"]
+    except (KeyError, TypeError, ValueError) as e:
+        raise ProofError(f"Malformed proof certificate: {e}") from e
+    
+    block_hash = _to_hex(keccak(header))
+    
+    if block_hash != _to_hex(_to_bytes(certificate.get("block_hash", block_hash))):
+        raise ProofError("Block header does not match the block hash")
+    
+    if trusted_block_hashes is not None and block_hash not in trusted_block_hashes:
+        raise ProofError(f"Block {block_hash} is not a trusted block")
+    
+    if _to_bytes(contract_address) != _to_bytes(certified_contract):
+        raise ProofError(f"Registration was made with contract {certified_contract}, not {contract_address}")
+    
+    try:
+        fields = rlp.decode(header)
+        receipts_root = fields[_HEADER_RECEIPTS_ROOT]
+        block_number = _to_int(fields[_HEADER_NUMBER])
+    except (rlp.DecodingError, IndexError, TypeError) as e:
+        raise ProofError(f"Malformed block header: {e}") from e
+    
+    if verify_receipt_proof(receipts_root, transaction_index, proof) != receipt:
+        raise ProofError("Receipt does not match the receipt proof")
+    
+    logs = _decode_receipt_logs(receipt)
+    if _find_registration_log(logs[log_index:log_index + 1], certified_contract, file_hash) is None:
+        raise ProofError("Receipt does not contain the registration")
+    
+    address, topics, data = logs[log_index]
+    timestamp, metadata = abi_decode(["uint256", "string"], data)
+    
+    return {
+        "hash": _to_hex(file_hash),
+        "owner": to_checksum_address(topics[2][-20:]),
+        "timestamp": datetime.fromtimestamp(timestamp),
+        "metadata": metadata,
+        "network": certificate.get("network"),
+        "contract": to_checksum_address(address),
+        "tx_hash": certificate.get("tx_hash"),
+        "block_number": block_number,
+        "block_hash": block_hash,
+    }
+
+
+def load_trusted_block_hashes(path: str) -> Set[str]:
+    """
+    Read a list of trusted block hashes.
+    
+    The file is either a JSON list of block hashes or a text file with one
+    block hash per line. Text lines may start with the block number, as in
+    "19000000 0xabc...", and lines starting with '#' are ignored.
+    
+    Args:
+        path: Path to the file
+    
+    Returns:
+        Set of lowercase, 0x-prefixed block hashes
+    """
+    with open(path, "r") as f:
+        content = f.read()
+    
+    if content.lstrip().startswith("["):
+        entries: Iterable[str] = json.loads(content)
+    else:
+        entries = (
+            line.replace(",", " ").split()[-1]
+            for line in content.splitlines()
+            if line.strip() and not line.lstrip().startswith("#")
+        )
+    
+    return {_to_hex(_to_bytes(entry)) for entry in entries}
+
+
+def _find_registration_log(
+    logs: List[Tuple[bytes, List[bytes], bytes]],
+    contract_address: Union[str, bytes],
+    file_hash: Union[str, bytes]
+) -> Optional[int]:
+    contract_address = _to_bytes(contract_address)
+    file_hash = _to_bytes(file_hash)
+    
+    for index, (address, topics, _) in enumerate(logs):
+        if (
+            address == contract_address
+            and len(topics) == 3
+            and topics[0] == HASH_REGISTERED_TOPIC
+            and topics[1] == file_hash
+        ):
+            return index
+    
+    return None
+
+
+def _decode_receipt_logs(receipt: bytes) -> List[Tuple[bytes, List[bytes], bytes]]:
+    try:
+        # Typed receipts start with their type, legacy receipts with an RLP list prefix
+        fields = rlp.decode(receipt[1:] if receipt and receipt[0] < 0x7f else receipt)
+        return [(log[0], list(log[1]), log[2]) for log in fields[3]]
+    except (rlp.DecodingError, IndexError, TypeError, ValueError) as e:
+        raise ProofError(f"Malformed receipt: {e}") from e
+
+
+def _build_trie_node(items: List[Tuple[Tuple[int, ...], bytes]], depth: int, nodes: Dict[bytes, bytes]) -> Any:
+    """
+    Build a Merkle-Patricia trie node.
+    
+    Args:
+        items: Sorted (key nibbles, value) pairs below this node
+        depth: Number of key nibbles consumed above this node
+        nodes: Receives the encoded nodes referenced by hash, keyed by their hash
+    
+    Returns:
+        The node, as a structure ready to be RLP-encoded
+    """
+    if not items:
+        return b""
+    
+    if len(items) == 1:
+        key, value = items[0]
+        return [_encode_path(key[depth:], True), value]
+    
+    first, last = items[0][0], items[-1][0]
+    prefix = 0
+    while depth + prefix < min(len(first), len(last)) and first[depth + prefix] == last[depth + prefix]:
+        prefix += 1
+    
+    if prefix:
+        child = _build_trie_node(items, depth + prefix, nodes)
+        return [_encode_path(first[depth:depth + prefix], False), _node_reference(child, nodes)]
+    
+    branch: List[Any] = [b""] * 17
+    for nibble, grouped in groupby(items, key=lambda item: item[0][depth] if len(item[0]) > depth else 16):
+        group = list(grouped)
+        if nibble == 16:
+            branch[16] = group[0][1]
+        else:
+            branch[nibble] = _node_reference(_build_trie_node(group, depth + 1, nodes), nodes)
+    
+    return branch
+
+
+def _node_reference(node: Any, nodes: Dict[bytes, bytes]) -> Any:
+    # Nodes shorter than a hash are embedded in their parent instead of being referenced
+    encoded = rlp.encode(node)
+    if len(encoded) < 32:
+        return node
+    
+    node_hash = keccak(encoded)
+    nodes[node_hash] = encoded
+    return node_hash
+
+
+def _walk_trie(root_hash: bytes, key: bytes, nodes: Dict[bytes, bytes], proof: Optional[List[bytes]] = None) -> bytes:
+    """
+    Look up a key in a Merkle-Patricia trie.
+    
+    Args:
+        root_hash: Hash of the root node
+        key: Key to look up
+        nodes: Encoded nodes, keyed by their hash
+        proof: Receives the encoded nodes visited, if given
+    
+    Returns:
+        The value stored under the key
+    
+    Raises:
+        ProofError: If a node is missing or malformed, or the key is not in the trie
+    """
+    nibbles = _to_nibbles(key)
+    position = 0
+    reference: Any = root_hash
+    
+    while True:
+        if isinstance(reference, list):
+            node = reference
+        else:
+            encoded = nodes.get(bytes(reference))
+            if encoded is None:
+                raise ProofError(f"Missing trie node {_to_hex(reference)}")
+            if proof is not None:
+                proof.append(encoded)
+            try:
+                node = rlp.decode(encoded)
+            except rlp.DecodingError as e:
+                raise ProofError(f"Malformed trie node: {e}") from e
+        
+        if len(node) == 17:
+            if position == len(nibbles):
+                if not node[16]:
+                    raise ProofError("Key is not in the trie")
+                return node[16]
+            reference = node[nibbles[position]]
+            position += 1
+        elif len(node) == 2:
+            path, is_leaf = _decode_path(node[0])
+            if tuple(nibbles[position:position + len(path)]) != path:
+                raise ProofError("Key is not in the trie")
+            position += len(path)
+            if is_leaf:
+                if position != len(nibbles):
+                    raise ProofError("Key is not in the trie")
+                return node[1]
+            reference = node[1]
+        else:
+            raise ProofError("Malformed trie node")
+        
+        if reference == b"":
+            raise ProofError("Key is not in the trie")
+
+
+def _encode_path(nibbles: Tuple[int, ...], is_leaf: bool) -> bytes:
+    # Hex-prefix encoding: the first nibble flags leaf nodes and odd-length paths
+    flag = 2 if is_leaf else 0
+    if len(nibbles) % 2:
+        nibbles = (flag + 1,) + tuple(nibbles)
+    else:
+        nibbles = (flag, 0) + tuple(nibbles)
+    return bytes(nibbles[i] << 4 | nibbles[i + 1] for i in range(0, len(nibbles), 2))
+
+
+def _decode_path(encoded: bytes) -> Tuple[Tuple[int, ...], bool]:
+    if not encoded:
+        raise ProofError("Malformed trie node")
+    nibbles = _to_nibbles(encoded)
+    flag = nibbles[0]
+    return nibbles[1 if flag & 1 else 2:], bool(flag & 2)
+
+
+def _to_nibbles(key: bytes) -> Tuple[int, ...]:
+    return tuple(n for byte in key for n in (byte >> 4, byte & 0x0f))
+
+
+def _to_rlp_value(value: Any) -> Union[int, bytes]:
+    if isinstance(value, int):
+        return value
+    return _to_bytes(value)
+
+
+def _to_bytes(value: Union[str, bytes]) -> bytes:
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith(("0x", "0X")) else value)
+    return bytes(value)
+
+
+def _to_int(value: Union[int, str, bytes]) -> int:
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return int(value, 16)
+    return int.from_bytes(value, "big")
+
+
+def _to_hex(value: bytes) -> str:
+    return "0x" + bytes(value).hex()
@@ -0,0 +1,123 @@
+"""
+Tests for the admission module and RPC deadlines.
+"""
+
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from proveit.admission import AdmissionGate, RPCOverloadedError
+from proveit.blockchain import BlockchainConnector, _DeadlineHTTPProvider, RPCDeadlineExceededError, remaining_deadline, rpc_deadline
+
+
+class TestAdmissionGate(unittest.TestCase):
+    """Test cases for the admission gate."""
+    
+    def test_rejects_when_queue_is_full(self):
+        """Test that calls beyond the concurrency and queue limits fail fast."""
+        gate = AdmissionGate(max_concurrent=1, max_queue=0, retry_after=7)
+        
+        with gate.admit():
+            start = time.monotonic()
+            with self.assertRaises(RPCOverloadedError) as context:
+                with gate.admit():
+                    pass
+            self.assertLess(time.monotonic() - start, 0.5)
+            self.assertEqual(context.exception.retry_after, 7)
+        
+        # The slot is free again
+        with gate.admit():
+            pass
+    
+    def test_queued_call_gets_freed_slot(self):
+        """Test that a queued call proceeds once a slot is released."""
+        gate = AdmissionGate(max_concurrent=1, max_queue=1, queue_timeout=5)
+        entered = threading.Event()
+        release = threading.Event()
+        
+        def hold():
+            with gate.admit():
+                entered.set()
+                release.wait()
+        
+        holder = threading.Thread(target=hold)
+        holder.start()
+        entered.wait()
+        
+        threading.Timer(0.1, release.set).start()
+        with gate.admit():
+            pass
+        holder.join()
+        self.assertEqual(gate.waiting, 0)
+    
+    def test_queued_call_times_out(self):
+        """Test that a queued call gives up after the queue timeout."""
+        gate = AdmissionGate(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+        
+        with gate.admit():
+            with self.assertRaises(RPCOverloadedError):
+                with gate.admit():
+                    pass
+
+
+class TestRegisterAdmission(unittest.TestCase):
+    """Test cases for admission control around registrations."""
+    
+    def test_slot_is_released_while_waiting_for_the_receipt(self):
+        """Test that a registration waiting to be mined does not hold an admission slot."""
+        gate = AdmissionGate(max_concurrent=1, max_queue=0)
+        connector = BlockchainConnector(network="localhost", admission=gate)
+        connector.web3 = mock.MagicMock()
+        connector.account = mock.Mock(address="0x" + "11" * 20)
+        
+        def wait_for_registration(tx_hash, timeout=120):
+            # Fails with RPCOverloadedError if the registration still holds the only slot
+            with gate.admit():
+                pass
+            return {"tx_hash": tx_hash, "status": 1, "block_number": 1, "timestamp": datetime(2025, 1, 1)}
+        
+        with mock.patch.multiple(
+            connector,
+            get_pending_nonce=mock.Mock(return_value=0),
+            sign_registration=mock.Mock(),
+            send_registration=mock.Mock(return_value="0x" + "22" * 32),
+            wait_for_registration=mock.Mock(side_effect=wait_for_registration)
+        ):
+            result = connector.register("0x" + "ab" * 32)
+        
+        self.assertEqual(result["block_number"], 1)
+
+
+class TestRPCDeadline(unittest.TestCase):
+    """Test cases for per-request RPC deadlines."""
+    
+    def test_nested_deadline_only_shortens(self):
+        """Test that an inner deadline cannot extend the outer one."""
+        self.assertIsNone(remaining_deadline())
+        
+        with rpc_deadline(1):
+            with rpc_deadline(60):
+                self.assertLessEqual(remaining_deadline(), 1)
+            self.assertLessEqual(remaining_deadline(), 1)
+        
+        self.assertIsNone(remaining_deadline())
+    
+    def test_request_timeout_follows_deadline(self):
+        """Test that HTTP request timeouts are capped by the deadline."""
+        provider = _DeadlineHTTPProvider("http://localhost:8545", request_kwargs={"timeout": 30})
+        
+        # web3 unpacks the request kwargs with **, so they must be a mapping
+        self.assertEqual(provider.get_request_kwargs()["timeout"], 30)
+        
+        with rpc_deadline(2):
+            self.assertLessEqual(provider.get_request_kwargs()["timeout"], 2)
+        
+        with rpc_deadline(-1):
+            with self.assertRaises(RPCDeadlineExceededError):
+                provider.get_request_kwargs()
+
+
+if __name__ == "__main__":
+    unittest.main()
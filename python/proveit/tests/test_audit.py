@@ -0,0 +1,94 @@
+"""
+Tests for the audit module.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from proveit.audit import AuditManifest, audit
+from proveit.blockchain import BlockchainConnector
+from proveit.core import ProveIt
+from proveit.hash import hash_content
+
+
+class TestAudit(unittest.TestCase):
+    """Test cases for incremental archive audits."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        
+        self.archive = os.path.join(self.directory.name, "archive")
+        os.mkdir(self.archive)
+        for name in ("a.txt", "b.txt", "c.txt"):
+            self.write(name, name)
+        
+        self.manifest_path = os.path.join(self.directory.name, "manifest.json")
+        self.registered = {hash_content("a.txt"), hash_content("b.txt")}
+        self.queried = []
+        
+        def verify_many(connector, file_hashes, batch_size=100):
+            self.queried.extend(file_hashes)
+            return [{"hash": h, "is_registered": h in self.registered, "owner": "0x" + "11" * 20,
+                     "timestamp": datetime(2024, 1, 1), "metadata": "", "network": "localhost"}
+                    for h in file_hashes]
+        
+        patcher = mock.patch.object(BlockchainConnector, "verify_many", autospec=True, side_effect=verify_many)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        self.prover = ProveIt(network="localhost")
+        self.prover.blockchain.web3 = mock.MagicMock()
+    
+    def write(self, name, content):
+        path = os.path.join(self.archive, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+    
+    def run_audit(self, inputs=()):
+        return audit(self.prover, AuditManifest(self.manifest_path), inputs)
+    
+    def test_first_audit_records_every_file(self):
+        """Test that the first audit hashes and looks up every file."""
+        report = self.run_audit([self.archive])
+        
+        self.assertEqual((report.files, report.rehashed, report.queried), (3, 3, 3))
+        self.assertEqual(len(report.added), 3)
+        self.assertEqual([os.path.basename(p) for p in report.unregistered], ["c.txt"])
+        self.assertFalse(report.ok)
+        
+        manifest = AuditManifest(self.manifest_path)
+        self.assertEqual(manifest.network, "localhost")
+        self.assertEqual(len(manifest.entries), 3)
+    
+    def test_later_audit_is_incremental(self):
+        """Test that a later audit only rehashes changed files and looks up unregistered hashes."""
+        self.run_audit([self.archive])
+        self.queried.clear()
+        
+        self.registered.add(hash_content("c.txt"))
+        modified = self.write("a.txt", "tampered")
+        os.utime(modified, ns=(1, 1))
+        os.remove(os.path.join(self.archive, "b.txt"))
+        
+        report = self.run_audit()
+        
+        self.assertEqual((report.files, report.unchanged, report.rehashed), (2, 1, 1))
+        self.assertEqual(sorted(self.queried), sorted([hash_content("c.txt"), hash_content("tampered")]))
+        self.assertEqual(report.modified, [modified])
+        self.assertEqual([os.path.basename(p) for p in report.missing], ["b.txt"])
+        self.assertEqual([os.path.basename(p) for p in report.newly_registered], ["c.txt"])
+        self.assertEqual(report.unregistered, [modified])
+    
+    def test_nothing_to_audit(self):
+        """Test that a first audit needs inputs."""
+        with self.assertRaises(ValueError):
+            self.run_audit()
+
+
+if __name__ == "__main__":
+    unittest.main()
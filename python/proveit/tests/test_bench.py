@@ -0,0 +1,50 @@
+"""
+Tests for the bench module.
+"""
+
+import json
+import unittest
+from unittest import mock
+
+from proveit.bench import format_report, run_benchmarks
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Test cases for the benchmark suite."""
+    
+    def test_report_is_json(self):
+        """Test that a quick run produces a serializable report with every section."""
+        prover = mock.Mock()
+        prover.network = "localhost"
+        prover.blockchain.verify_many.side_effect = lambda hashes: [{"hash": h, "is_registered": False} for h in hashes]
+        
+        report = run_benchmarks(
+            ["hash", "rpc", "certificates", "web"],
+            prover=prover,
+            duration=0.01,
+            samples=4,
+            file_sizes=[4096],
+            chunk_sizes=[1024, 4096]
+        )
+        
+        report = json.loads(json.dumps(report))
+        results = report["results"]
+        self.assertEqual(report["schema"], 1)
+        self.assertEqual([entry["chunk_size"] for entry in results["hash_file"]], [1024, 4096])
+        self.assertGreater(results["hash_content"][0]["ops_per_s"], 0)
+        self.assertEqual(results["rpc"]["verify"]["samples"], 4)
+        self.assertEqual(prover.blockchain.verify.call_count, 4)
+        self.assertIn("GET /api/networks", results["web"])
+        self.assertIn("json", results["certificates"])
+        self.assertIn("hash_file:", format_report(report))
+    
+    def test_rpc_needs_prover(self):
+        """Test that the RPC benchmarks refuse to run without a node."""
+        with self.assertRaises(ValueError):
+            run_benchmarks(["rpc"])
+        with self.assertRaises(ValueError):
+            run_benchmarks(["disk"])
+
+
+if __name__ == "__main__":
+    unittest.main()
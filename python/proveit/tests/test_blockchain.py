@@ -0,0 +1,116 @@
+"""
+Tests for the blockchain module.
+"""
+
+import threading
+import unittest
+from unittest import mock
+
+from proveit.blockchain import BlockchainConnector
+
+FILE_HASH = "0x" + "ab" * 32
+TX_HASH = "0x" + "ef" * 32
+
+# Two blocks per timestamp from block 10 on, as on a local development chain
+TIMESTAMPS = [1000 + number if number < 10 else 1010 + (number - 10) // 2 for number in range(1000)]
+
+
+class TestFindRegistrationTransaction(unittest.TestCase):
+    """Test cases for looking up registration transactions."""
+    
+    def setUp(self):
+        self.connector = BlockchainConnector(network="localhost")
+        self.eth = mock.MagicMock()
+        self.eth.block_number = len(TIMESTAMPS) - 1
+        self.eth.get_block.side_effect = lambda number: {"timestamp": TIMESTAMPS[number]}
+        self.eth.get_logs.return_value = [{"transactionHash": bytes.fromhex(TX_HASH[2:])}]
+        self.connector.web3 = mock.MagicMock(eth=self.eth)
+    
+    def test_bisects_to_registration_block(self):
+        """Test that the log filter covers exactly the blocks mined at the registration time."""
+        tx_hash = self.connector.find_registration_transaction(FILE_HASH, 1100)
+        
+        self.assertEqual(tx_hash, TX_HASH)
+        log_filter = self.eth.get_logs.call_args[0][0]
+        self.assertEqual((log_filter["fromBlock"], log_filter["toBlock"]), (190, 191))
+        self.assertEqual(log_filter["topics"][1], FILE_HASH)
+    
+    def test_lookups_are_cached(self):
+        """Test that block timestamps and resolved transactions are reused."""
+        self.connector.find_registration_transaction(FILE_HASH, 1100)
+        first_probes = self.eth.get_block.call_count
+        
+        self.connector.find_registration_transaction("0x" + "cd" * 32, 1101)
+        self.assertLess(self.eth.get_block.call_count - first_probes, first_probes)
+        
+        calls = self.eth.get_logs.call_count
+        self.assertEqual(self.connector.find_registration_transaction(FILE_HASH, 1100), TX_HASH)
+        self.assertEqual(self.eth.get_logs.call_count, calls)
+    
+    def test_batched_lookup(self):
+        """Test that registrations in nearby blocks are found with one log query."""
+        other_hash = "0x" + "cd" * 32
+        other_tx = "0x" + "12" * 32
+        self.eth.get_logs.return_value = [
+            {"topics": [b"", bytes.fromhex(other_hash[2:])], "transactionHash": bytes.fromhex(other_tx[2:])},
+            {"topics": [b"", bytes.fromhex(FILE_HASH[2:])], "transactionHash": bytes.fromhex(TX_HASH[2:])},
+        ]
+        
+        found = self.connector.find_registration_transactions([(FILE_HASH, 1100), (other_hash, 1101), ("0x" + "ee" * 32, 1105)])
+        
+        self.assertEqual(found, {FILE_HASH: TX_HASH, other_hash: other_tx, "0x" + "ee" * 32: None})
+        self.assertEqual(self.eth.get_logs.call_count, 1)
+        log_filter = self.eth.get_logs.call_args[0][0]
+        self.assertEqual((log_filter["fromBlock"], log_filter["toBlock"]), (190, 201))
+        self.assertEqual(sorted(log_filter["topics"][1]), sorted([FILE_HASH, other_hash, "0x" + "ee" * 32]))
+        
+        # Resolved transactions are cached for the single lookup too
+        self.assertEqual(self.connector.find_registration_transaction(other_hash, 1101), other_tx)
+        self.assertEqual(self.eth.get_logs.call_count, 1)
+    
+    def test_not_found(self):
+        """Test that a missing registration event yields None."""
+        self.eth.get_logs.return_value = []
+        self.assertIsNone(self.connector.find_registration_transaction(FILE_HASH, 1100))
+
+
+
+class TestReserveNonce(unittest.TestCase):
+    """Test cases for handing out nonces to threads sharing a connector."""
+    
+    def setUp(self):
+        self.connector = BlockchainConnector(network="localhost")
+        patcher = mock.patch.object(BlockchainConnector, "get_pending_nonce", autospec=True, return_value=5)
+        self.get_pending_nonce = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_threads_get_distinct_nonces(self):
+        """Test that concurrent reservations never hand out the same nonce."""
+        nonces = []
+        
+        def reserve():
+            for _ in range(50):
+                with self.connector.reserve_nonce() as nonce:
+                    nonces.append(nonce)
+        
+        threads = [threading.Thread(target=reserve) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(sorted(nonces), list(range(5, 405)))
+        self.get_pending_nonce.assert_called_once()
+    
+    def test_failed_send_releases_nonce(self):
+        """Test that a nonce reserved by a failed send is handed out again after asking the node."""
+        with self.assertRaises(ConnectionError):
+            with self.connector.reserve_nonce():
+                raise ConnectionError("RPC endpoint unreachable")
+        
+        with self.connector.reserve_nonce() as nonce:
+            self.assertEqual(nonce, 5)
+        self.assertEqual(self.get_pending_nonce.call_count, 2)
+
+if __name__ == "__main__":
+    unittest.main()
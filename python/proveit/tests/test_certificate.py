@@ -0,0 +1,81 @@
+"""
+Tests for certificate rendering.
+"""
+
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from proveit import certificate as certificate_module
+from proveit.certificate import REPORTLAB_AVAILABLE, render_certificate
+from proveit.hash import tag_metadata
+from proveit.models import Certificate
+
+
+def _certificate(index: int = 0) -> Certificate:
+    return Certificate(
+        hash="0x" + f"{index:064x}",
+        owner="0x" + "11" * 20,
+        timestamp=datetime(2024, 1, 1, 12, 0, 0),
+        tx_hash="0x" + "22" * 32,
+        network="sepolia",
+        metadata="Chapter 1" if index % 2 else None,
+        file_name=f"file-{index}.txt"
+    )
+
+
+@unittest.skipUnless(REPORTLAB_AVAILABLE, "reportlab is not installed")
+class TestPDFRendering(unittest.TestCase):
+    """Test cases for PDF certificate rendering."""
+    
+    def test_render_pdf(self):
+        """Test that a certificate renders to a PDF document."""
+        content = render_certificate(_certificate(1))
+        
+        self.assertTrue(content.startswith(b"%PDF-"))
+        self.assertIn(b"%%EOF", content[-16:])
+    
+    def test_cached_layout_matches_fresh_layout(self):
+        """Test that reusing the layout does not change the rendered text."""
+        fresh = certificate_module._CertificateLayout()
+        cached = certificate_module._certificate_layout()
+        render_certificate(_certificate(1))
+        
+        for name in ("title", "intro", "verification", "disclaimer"):
+            paragraph = getattr(cached, name)
+            width, height = paragraph.wrap(6.5 * 72, 1000)
+            self.assertEqual((width, height), getattr(fresh, name).wrap(6.5 * 72, 1000))
+            self.assertEqual(paragraph.getPlainText(), getattr(fresh, name).getPlainText())
+    
+    def test_reused_layout_renders_identical_pages(self):
+        """Test that a render through the cached layout matches one through a fresh layout."""
+        from reportlab import rl_config
+        
+        # Invariant mode leaves out the creation date and random document ID
+        with mock.patch.object(rl_config, "invariant", 1):
+            certificate_module._layouts.layout = None
+            fresh = render_certificate(_certificate(1))
+            
+            # Render something else through the same layout in between
+            other = render_certificate(_certificate(2))
+            reused = render_certificate(_certificate(1))
+        
+        self.assertTrue(fresh.startswith(b"%PDF"))
+        self.assertNotEqual(other, fresh)
+        self.assertEqual(reused, fresh)
+
+    
+    def test_hash_label_names_the_algorithm(self):
+        """Test that the hash label names the algorithm from the metadata tag."""
+        certificate = _certificate(3)
+        certificate.metadata = tag_metadata("Chapter 3", "blake2b-256")
+        layout = certificate_module._certificate_layout()
+        
+        render_certificate(certificate)
+        
+        self.assertEqual(layout.hash_labels["blake2b-256"].getPlainText(), "Hash (BLAKE2b-256):")
+        self.assertEqual(layout.hash_label("sha256").getPlainText(), "Hash (SHA-256):")
+
+
+if __name__ == "__main__":
+    unittest.main()
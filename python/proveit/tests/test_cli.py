@@ -0,0 +1,90 @@
+"""
+Tests for the command-line interface.
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+from datetime import datetime
+from unittest import mock
+
+from click.testing import CliRunner
+
+from proveit.blockchain import BlockchainConnector
+from proveit.cli import _read_certificate_manifest, main
+from proveit.hash import hash_content
+
+
+class TestVerifyMany(unittest.TestCase):
+    """Test cases for verifying several files at once."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        
+        for name, content in [("a.txt", "alpha"), ("b.txt", "beta"), ("sub/c.bin", "gamma")]:
+            path = os.path.join(self.directory.name, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(content)
+        
+        registered = {hash_content("alpha"), hash_content("gamma")}
+        
+        def verify_many(connector, file_hashes, batch_size=100):
+            return [
+                {"hash": h, "is_registered": True, "owner": "0x" + "11" * 20, "timestamp": datetime(2024, 1, 1),
+                 "metadata": "", "network": "localhost"} if h in registered else {"hash": h, "is_registered": False}
+                for h in file_hashes
+            ]
+        
+        patcher = mock.patch.object(BlockchainConnector, "verify_many", autospec=True, side_effect=verify_many)
+        self.verify_many = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_ndjson_output(self):
+        """Test that every file gets an NDJSON line and misses set the exit code."""
+        result = CliRunner().invoke(main, ["verify", self.directory.name, "--network", "localhost", "--format", "ndjson"])
+        
+        self.assertEqual(result.exit_code, 2)
+        rows = [json.loads(line) for line in result.output.splitlines()]
+        self.assertEqual(
+            {os.path.basename(row["path"]): row["is_registered"] for row in rows},
+            {"a.txt": True, "b.txt": False, "c.bin": True}
+        )
+        self.verify_many.assert_called_once()
+    
+    def test_csv_output_for_glob(self):
+        """Test CSV output for a glob pattern whose files are all registered."""
+        pattern = os.path.join(self.directory.name, "**", "*.bin")
+        result = CliRunner().invoke(main, ["verify", pattern, "--network", "localhost", "--format", "csv"])
+        
+        self.assertEqual(result.exit_code, 0)
+        rows = list(csv.DictReader(io.StringIO(result.output)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["hash"], hash_content("gamma"))
+        self.assertEqual(rows[0]["is_registered"], "True")
+
+    
+    def test_hash_archive_manifest_for_certificates(self):
+        """Test that a verified hash-archive manifest with quoted names is read by certificates --from."""
+        archive = os.path.join(self.directory.name, "delivery.zip")
+        with zipfile.ZipFile(archive, "w") as f:
+            f.writestr("alpha, final.txt", "alpha")
+            f.writestr("b.txt", "beta")
+        manifest = os.path.join(self.directory.name, "delivery.csv")
+        
+        result = CliRunner().invoke(main, ["hash-archive", archive, "--verify", "--network", "localhost", "-o", manifest])
+        
+        self.assertEqual(result.exit_code, 2)
+        self.assertEqual(
+            list(_read_certificate_manifest(manifest)),
+            [(hash_content("alpha"), "alpha, final.txt"), (hash_content("beta"), "b.txt")]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
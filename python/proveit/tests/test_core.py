@@ -0,0 +1,235 @@
+"""
+Tests for the core module.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from proveit.blockchain import BlockchainConnector
+from proveit.core import ProveIt
+from proveit.hash import Hash32, hash_content
+from proveit.journal import RegistrationJournal
+
+
+class TestRegisterMany(unittest.TestCase):
+    """Test cases for bulk registration."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        
+        self.paths = []
+        for name, content in [("a.txt", "alpha"), ("b.txt", "beta"), ("copy.txt", "alpha"), ("old.txt", "old")]:
+            path = os.path.join(self.directory.name, name)
+            with open(path, "w") as f:
+                f.write(content)
+            self.paths.append(path)
+        
+        self.journal_path = os.path.join(self.directory.name, "journal.jsonl")
+        self.registered = {hash_content("old")}
+        self.sent = []
+        self.pending = set()
+        
+        def verify_many(connector, file_hashes, batch_size=100):
+            return [{"hash": h, "is_registered": h in self.registered, "owner": "0x" + "11" * 20,
+                     "timestamp": None, "metadata": "", "network": "localhost"} for h in file_hashes]
+        
+        def sign_registration(connector, file_hash, metadata="", nonce=None, gas_price=None):
+            return SimpleNamespace(hash=bytes.fromhex(file_hash[2:]), raw_transaction=file_hash)
+        
+        def send_registration(connector, signed_tx):
+            self.sent.append(signed_tx.raw_transaction)
+            self.pending.add("0x" + signed_tx.hash.hex())
+        
+        for name, side_effect in [
+            ("verify_many", verify_many),
+            ("sign_registration", sign_registration),
+            ("send_registration", send_registration),
+            ("get_pending_nonce", lambda connector: 7),
+            ("get_transaction_state", lambda connector, tx_hash: "pending" if tx_hash in self.pending else "unknown"),
+        ]:
+            patcher = mock.patch.object(BlockchainConnector, name, autospec=True, side_effect=side_effect)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        patcher = mock.patch.object(
+            BlockchainConnector, "wait_for_registration", autospec=True,
+            return_value={"status": 1, "block_number": 10}
+        )
+        self.wait = patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        self.prover = ProveIt(network="localhost")
+        self.prover.blockchain.web3 = mock.MagicMock()
+    
+    def test_registers_new_hashes_once(self):
+        """Test that duplicates and already registered hashes are not sent."""
+        with RegistrationJournal(self.journal_path) as journal:
+            summary = self.prover.register_many(self.paths, journal=journal, workers=2)
+        
+        self.assertEqual((summary.files, summary.hashes), (4, 3))
+        self.assertEqual(summary.confirmed, 2)
+        self.assertEqual(summary.already_registered, 1)
+        self.assertEqual(sorted(self.sent), sorted([hash_content("alpha"), hash_content("beta")]))
+    
+    def test_resumes_without_rehashing_or_resending(self):
+        """Test that an interrupted run resumes from its journal."""
+        self.wait.side_effect = KeyboardInterrupt
+        with RegistrationJournal(self.journal_path) as journal:
+            with self.assertRaises(KeyboardInterrupt):
+                self.prover.register_many(self.paths, journal=journal, max_pending=1)
+        self.assertEqual(len(self.sent), 1)
+        
+        self.wait.side_effect = None
+        with mock.patch("proveit.core.hash_files") as hash_files:
+            with RegistrationJournal(self.journal_path) as journal:
+                summary = self.prover.register_many(self.paths, journal=journal, max_pending=1)
+        
+        hash_files.assert_called_once()
+        self.assertEqual(list(hash_files.call_args[0][0]), [])
+        self.assertEqual(len(self.sent), 2)
+        self.assertEqual(len(set(self.sent)), 2)
+        self.assertEqual(summary.confirmed, 2)
+
+
+
+class TestIterVerifyFiles(unittest.TestCase):
+    """Test cases for streaming verification."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        
+        self.path = os.path.join(self.directory.name, "a.txt")
+        with open(self.path, "w") as f:
+            f.write("alpha")
+        
+        def verify_many(connector, file_hashes, batch_size=100):
+            return [{"hash": h, "is_registered": True, "owner": "0x" + "11" * 20,
+                     "timestamp": None, "metadata": "", "network": "localhost"} for h in file_hashes]
+        
+        patcher = mock.patch.object(BlockchainConnector, "verify_many", autospec=True, side_effect=verify_many)
+        self.verify_many = patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        self.prover = ProveIt(network="localhost")
+        self.prover.blockchain.web3 = mock.MagicMock()
+    
+    def test_yields_every_path(self):
+        """Test that every path gets a result, including unreadable ones."""
+        missing = os.path.join(self.directory.name, "missing.txt")
+        results = dict(self.prover.iter_verify_files([self.path, missing], batch_size=2))
+        
+        self.assertEqual(set(results), {Path(self.path), Path(missing)})
+        self.assertTrue(results[Path(self.path)].is_registered)
+        self.assertIsNone(results[Path(missing)].hash)
+        self.assertEqual(results[Path(missing)].path, missing)
+    
+    def test_batch_verify_names_missing_files(self):
+        """Test that a missing file gets a result without a hash that names its path."""
+        missing = os.path.join(self.directory.name, "missing.txt")
+        found, not_found = self.prover.batch_verify_files([self.path, missing])
+        
+        self.assertEqual(found.hash, hash_content("alpha"))
+        self.assertIsNone(not_found.hash)
+        self.assertEqual(not_found.to_dict(), {"hash": None, "is_registered": False, "path": missing})
+    
+    def test_pulls_paths_lazily(self):
+        """Test that paths are pulled only as the in-flight window frees up."""
+        pulled = []
+        
+        def paths():
+            for index in range(1000):
+                pulled.append(index)
+                yield self.path
+        
+        results = self.prover.iter_verify_files(paths(), workers=1, batch_size=2)
+        next(results)
+        self.assertLess(len(pulled), 20)
+        
+        self.assertEqual(sum(1 for _ in results), 999)
+    
+    def test_lookups_fan_out_over_max_workers(self):
+        """Test that a large batch verification is split into concurrent bulk lookups."""
+        prover = ProveIt(network="localhost", max_workers=4)
+        self.addCleanup(prover.close)
+        hashes = [hash_content(str(index)) for index in range(250)]
+        
+        results = prover.verify_hashes(hashes)
+        
+        self.assertEqual([result.hash for result in results], hashes)
+        self.assertIsInstance(results[0].hash, Hash32)
+        self.assertEqual(results[0].to_dict()["hash"], hashes[0])
+        self.assertEqual(sorted(len(call.args[1]) for call in self.verify_many.call_args_list), [50, 100, 100])
+
+
+class TestGenerateCertificates(unittest.TestCase):
+    """Test cases for generating certificates in bulk."""
+    
+    def test_certificates_carry_the_registering_transaction(self):
+        """Test that batch certificates get their transaction hash from one bulk log lookup."""
+        registered = {hash_content("alpha"): "0x" + "22" * 32, hash_content("beta"): "0x" + "33" * 32}
+        
+        def verify_many(connector, file_hashes, batch_size=100):
+            return [{"hash": h, "is_registered": h in registered, "owner": "0x" + "11" * 20,
+                     "timestamp": datetime(2024, 1, 1), "metadata": "", "network": "localhost"} for h in file_hashes]
+        
+        def find_registration_transactions(connector, registrations, max_blocks=1000):
+            return {file_hash: registered[file_hash] for file_hash, _ in registrations}
+        
+        with mock.patch.object(BlockchainConnector, "verify_many", autospec=True, side_effect=verify_many), \
+                mock.patch.object(BlockchainConnector, "find_registration_transactions", autospec=True,
+                                  side_effect=find_registration_transactions) as find:
+            prover = ProveIt(network="localhost")
+            entries = [(hash_content("alpha"), "a.txt"), (hash_content("gamma"), None), (hash_content("beta"), "b.txt")]
+            certificates = dict(prover.generate_certificates(entries))
+        
+        self.assertIsNone(certificates[hash_content("gamma")])
+        self.assertEqual(certificates[hash_content("alpha")].tx_hash, "0x" + "22" * 32)
+        self.assertEqual(certificates[hash_content("beta")].tx_hash, "0x" + "33" * 32)
+        find.assert_called_once()
+
+
+class TestHashAlgorithms(unittest.TestCase):
+    """Test cases for registering and verifying with other hash algorithms."""
+    
+    def setUp(self):
+        self.registered = {}
+        
+        def register(connector, file_hash, metadata=""):
+            self.registered[file_hash] = metadata
+            return {"hash": file_hash, "tx_hash": "0x" + "22" * 32, "owner": "0x" + "11" * 20,
+                    "timestamp": None, "block_number": 1, "network": "localhost", "metadata": metadata}
+        
+        def verify_many(connector, file_hashes, batch_size=100):
+            return [{"hash": h, "is_registered": h in self.registered, "owner": "0x" + "11" * 20,
+                     "timestamp": None, "metadata": self.registered.get(h), "network": "localhost"}
+                    for h in file_hashes]
+        
+        for name, side_effect in [("register", register), ("verify_many", verify_many)]:
+            patcher = mock.patch.object(BlockchainConnector, name, autospec=True, side_effect=side_effect)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def test_verifies_new_and_legacy_registrations(self):
+        """Test that a prover using BLAKE2b still finds files registered with SHA-256."""
+        prover = ProveIt(network="localhost", hash_algorithm="blake2b-256")
+        
+        result = prover.register_content("new", "Report")
+        self.assertEqual(result.hash, hash_content("new", "blake2b-256"))
+        self.assertEqual(self.registered[result.hash], "alg:blake2b-256;Report")
+        
+        self.registered[hash_content("legacy")] = "Old report"
+        
+        self.assertEqual(prover.verify_content("new").hash, hash_content("new", "blake2b-256"))
+        self.assertTrue(prover.verify_content("legacy").is_registered)
+        self.assertFalse(prover.verify_content("other").is_registered)
+
+
+if __name__ == "__main__":
+    unittest.main()
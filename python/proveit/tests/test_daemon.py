@@ -0,0 +1,126 @@
+"""
+Tests for the daemon module.
+"""
+
+import contextlib
+import io
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import proveit
+from proveit.daemon import ProveItDaemon, _frame_writer, _frames, _send, daemon_request, forward
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+class TestDaemon(unittest.TestCase):
+    """Test cases for forwarding commands to the daemon."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.socket_path = os.path.join(cls.directory.name, "daemon.sock")
+        cls.process = subprocess.Popen(
+            [sys.executable, "-m", "proveit.cli", "daemon", "start", "--foreground", "--socket", cls.socket_path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(proveit.__file__)))
+        )
+        
+        deadline = time.monotonic() + 30
+        while daemon_request({"control": "status"}, cls.socket_path) is None:
+            if time.monotonic() > deadline or cls.process.poll() is not None:
+                cls.process.kill()
+                raise RuntimeError("The daemon did not start")
+            time.sleep(0.05)
+    
+    @classmethod
+    def tearDownClass(cls):
+        if cls.process.poll() is None:
+            daemon_request({"control": "stop"}, cls.socket_path)
+            cls.process.wait(10)
+        cls.directory.cleanup()
+    
+    def _forward(self, argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exit_code = forward(argv, self.socket_path)
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+    
+    def test_forwards_output_and_exit_status(self):
+        exit_code, stdout, _ = self._forward(["proof", "--help"])
+        self.assertEqual(exit_code, 0)
+        self.assertIn("Usage: proveit proof", stdout)
+        
+        exit_code, _, stderr = self._forward(["verify", os.path.join(self.directory.name, "missing.txt")])
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Error:", stderr)
+    
+    def test_runs_in_client_directory(self):
+        working_directory = os.getcwd()
+        self.addCleanup(os.chdir, working_directory)
+        os.chdir(self.directory.name)
+        
+        exit_code, _, _ = self._forward(["bench", "--only", "certificates", "--quick", "-o", "bench.json"])
+        
+        self.assertEqual(exit_code, 0)
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, "bench.json")))
+    
+    def test_local_commands_are_not_forwarded(self):
+        self.assertIsNone(forward(["serve"], self.socket_path))
+        self.assertIsNone(forward(["register-many", "--from", "-"], self.socket_path))
+        self.assertIsNone(forward(["register-many", "--from=-"], self.socket_path))
+        self.assertIsNone(forward(["outbox", "flush", "--watch=5"], self.socket_path))
+        self.assertIsNone(forward(["verify", "file.txt"], os.path.join(self.directory.name, "none.sock")))
+    
+    def test_different_credentials_run_locally(self):
+        with mock.patch.dict(os.environ, {"PRIVATE_KEY": "0x" + "11" * 32}):
+            self.assertIsNone(forward(["proof", "--help"], self.socket_path))
+        
+        status = daemon_request({"control": "status"}, self.socket_path)
+        exit_code, _, _ = self._forward(["proof", "--help"])
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(daemon_request({"control": "status"}, self.socket_path)["requests"], status["requests"] + 1)
+    
+    def test_status(self):
+        status = daemon_request({"control": "status"}, self.socket_path)
+        self.assertEqual(status["pid"], self.process.pid)
+        self.assertEqual(status["socket"], self.socket_path)
+
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+class TestDaemonConnection(unittest.TestCase):
+    """Test cases for the daemon side of a connection."""
+    
+    def test_busy_daemon_sends_command_back(self):
+        daemon = ProveItDaemon(os.path.join(tempfile.gettempdir(), "unused.sock"))
+        self.addCleanup(daemon._worker.shutdown)
+        client, server = socket.socketpair()
+        self.addCleanup(client.close)
+        
+        with daemon._busy:
+            _send(client, {"argv": ["proof", "--help"], "cwd": os.getcwd(), "environment": daemon._environment})
+            daemon._handle(server)
+        
+        self.assertEqual(next(_frames(client)), {"local": True})
+    
+    def test_disconnected_client_interrupts_command(self):
+        client, server = socket.socketpair()
+        self.addCleanup(server.close)
+        stream = _frame_writer(server, "out")
+        client.close()
+        
+        with self.assertRaises(KeyboardInterrupt):
+            stream.write("progress\n")
+        stream.write("Aborted!\n")
+        stream.flush()
+
+
+if __name__ == "__main__":
+    unittest.main()
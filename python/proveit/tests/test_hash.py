@@ -2,12 +2,24 @@
 Tests for the hash module.
 """
 
+import hashlib
+import io
+import json
 import os
+import pickle
+import tarfile
 import tempfile
 import unittest
+import zipfile
 from pathlib import Path
 
-from proveit.hash import hash_file, hash_content
+from unittest import mock
+
+from proveit import hash as hash_module
+from proveit.hash import (
+    HASH_ALGORITHMS, DigestArray, Hash32, hash_archive, hash_file, hash_file_multi, hash_content, hash_contents,
+    hash_files_deduplicated, normalize_hash, register_algorithm, split_metadata_tag, tag_metadata
+)
 
 
 class TestHash(unittest.TestCase):
@@ -71,6 +83,152 @@ class TestHash(unittest.TestCase):
             with self.assertRaises(ValueError):
                 hash_file(temp_dir)
 
+    
+    def test_hash_files_deduplicated(self):
+        """Test that duplicate files are hashed once and reported together."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            contents = {
+                "a": b"x" * 10000,
+                "b": b"x" * 10000,
+                "c": b"x" * 5000 + b"y" + b"x" * 4999,  # Same size and samples as a
+                "d": b"unique",
+            }
+            paths = {}
+            for name, content in contents.items():
+                paths[name] = Path(temp_dir) / name
+                paths[name].write_bytes(content)
+            paths["link"] = Path(temp_dir) / "link"
+            os.link(paths["a"], paths["link"])
+            
+            order = ["a", "b", "c", "d", "link"]
+            with mock.patch.object(hash_module, "hash_file", wraps=hash_file) as hashed:
+                hashes, duplicates = hash_files_deduplicated([paths[name] for name in order])
+            
+            self.assertEqual(list(hashes), [paths[name] for name in order])
+            for name, content in contents.items():
+                self.assertEqual(hashes[paths[name]], hash_content(content))
+            self.assertEqual(duplicates, [[paths["a"], paths["b"], paths["link"]]])
+            # Only d is hashed on its own; b and c are compared with a while a is hashed
+            self.assertEqual(hashed.call_count, 1)
+    
+    def test_hash_files_deduplicated_large_group(self):
+        """Test that groups larger than one comparison pass are hashed correctly."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for index in range(hash_module._COMPARE_BATCH * 2 + 3):
+                path = Path(temp_dir) / f"{index:02}"
+                # Every fifth file differs in its middle chunk only
+                path.write_bytes(b"a" * 100 + (b"b" if index % 5 else b"c") + b"a" * 100)
+                paths.append(path)
+            
+            hashes, duplicates = hash_files_deduplicated(paths, chunk_size=64, sample_size=16)
+            
+            for path in paths:
+                self.assertEqual(hashes[path], hash_content(path.read_bytes()))
+            self.assertEqual(sorted(len(group) for group in duplicates), [7, 28])
+    
+    def test_hash_archive(self):
+        """Test hashing the members of zip and tar archives without extracting them."""
+        members = {"a.txt": b"alpha", "sub/b.bin": os.urandom(100000)}
+        expected = [(name, hash_content(content)) for name, content in members.items()]
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            zip_path = os.path.join(temp_dir, "delivery.zip")
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr("sub/", b"")
+                for name, content in members.items():
+                    archive.writestr(name, content)
+            
+            tar_path = os.path.join(temp_dir, "delivery.tar.gz")
+            with tarfile.open(tar_path, "w:gz") as archive:
+                for name, content in members.items():
+                    info = tarfile.TarInfo(name)
+                    info.size = len(content)
+                    archive.addfile(info, io.BytesIO(content))
+            
+            self.assertEqual(list(hash_archive(zip_path, workers=2)), expected)
+            self.assertEqual(list(hash_archive(tar_path)), expected)
+            
+            with self.assertRaises(ValueError):
+                hash_archive(__file__)
+    
+    def test_hash_algorithms(self):
+        """Test hashing with several algorithms in one read, and tagging metadata with the algorithm."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "file.bin"
+            path.write_bytes(b"content" * 100000)
+            
+            digests = hash_file_multi(path, ["sha256", "sha3-256", "blake2b-256"])
+            
+            for algorithm, digest in digests.items():
+                self.assertEqual(digest, hash_file(path, algorithm=algorithm))
+            self.assertEqual(digests["sha256"], hash_file(path))
+            self.assertEqual(len(set(digests.values())), 3)
+            with self.assertRaises(ValueError):
+                hash_content("content", "md5")
+        
+        self.assertEqual(tag_metadata("Report", "sha256"), "Report")
+        self.assertEqual(split_metadata_tag(tag_metadata("Report", "blake2b-256")), ("blake2b-256", "Report"))
+        self.assertEqual(split_metadata_tag("alg:unknown;Report"), ("sha256", "alg:unknown;Report"))
+    
+    def test_hash_contents(self):
+        """Test hashing records in chunks across processes into one buffer of raw digests."""
+        records = [f"row {i}" for i in range(50)] + [b"\x00" * 10]
+        
+        for workers in (1, 2):
+            digests = hash_contents(iter(records), workers=workers, chunk_records=8)
+            
+            self.assertIsInstance(digests, DigestArray)
+            self.assertEqual(len(digests.buffer), 32 * len(records))
+            self.assertEqual(list(digests.hexes()), [hash_content(record) for record in records])
+        
+        self.assertEqual(digests[0], bytes.fromhex(hash_content("row 0")[2:]))
+        self.assertEqual(digests.hex(-1), hash_content(b"\x00" * 10))
+        self.assertEqual(hash_contents(["row 0"], algorithm="sha3-256").hex(0), hash_content("row 0", "sha3-256"))
+        self.assertEqual(len(hash_contents([])), 0)
+        with self.assertRaises(IndexError):
+            digests[len(records)]
+    
+    def test_hash_contents_with_registered_algorithm(self):
+        """Test that algorithms added with register_algorithm are hashed in this process."""
+        register_algorithm("sha256-salted", lambda: hashlib.sha256(b"salt"))
+        self.addCleanup(HASH_ALGORITHMS.pop, "sha256-salted")
+        records = [f"row {i}" for i in range(20)]
+        
+        with mock.patch.object(hash_module, "ProcessPoolExecutor") as pool:
+            digests = hash_contents(records, workers=2, algorithm="sha256-salted", chunk_records=8)
+        
+        pool.assert_not_called()
+        self.assertEqual(list(digests.hexes()), [hash_content("salt" + record) for record in records])
+    
+    def test_hash32(self):
+        """Test that Hash32 parses a hash once and stays interchangeable with its hex string."""
+        text = hash_content("content")
+        file_hash = Hash32.from_hex(text[2:].upper())
+        
+        self.assertEqual(file_hash.raw, bytes.fromhex(text[2:]))
+        self.assertEqual(str(file_hash), text)
+        self.assertEqual(f"{file_hash}", text)
+        self.assertEqual(file_hash, text)
+        self.assertEqual(file_hash, Hash32(file_hash.raw))
+        self.assertIn(text, {file_hash})
+        self.assertEqual({text: 1}[file_hash], 1)
+        self.assertIs(Hash32.coerce(file_hash), file_hash)
+        self.assertEqual(normalize_hash(file_hash), text)
+        
+        # A str for every string operation callers may apply to result.hash
+        self.assertIsInstance(file_hash, str)
+        self.assertEqual(json.dumps({"hash": file_hash}), json.dumps({"hash": text}))
+        self.assertEqual(file_hash[:10], text[:10])
+        self.assertTrue(file_hash.startswith("0x"))
+        self.assertEqual(len(file_hash), 66)
+        self.assertEqual(pickle.loads(pickle.dumps(file_hash)).raw, file_hash.raw)
+        
+        for invalid in ("0x1234", "zz" * 32):
+            with self.assertRaises(ValueError):
+                Hash32.from_hex(invalid)
+        with self.assertRaises(ValueError):
+            Hash32(b"short")
 
 if __name__ == "__main__":
     import proveit.hash
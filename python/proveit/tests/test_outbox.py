@@ -0,0 +1,120 @@
+"""
+Tests for the outbox module.
+"""
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from proveit.blockchain import BlockchainConnector
+from proveit.core import ProveIt
+from proveit.hash import hash_content
+from proveit.outbox import RegistrationOutbox
+
+
+class TestRegistrationOutbox(unittest.TestCase):
+    """Test cases for the registration outbox."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        
+        self.outbox = RegistrationOutbox(os.path.join(self.directory.name, "outbox.sqlite"))
+        self.addCleanup(self.outbox.close)
+        
+        self.registered = {hash_content("old")}
+        self.sent = []
+        self.send_error = None
+        
+        def verify_many(connector, file_hashes, batch_size=100):
+            return [{"hash": h, "is_registered": h in self.registered, "owner": "0x" + "11" * 20,
+                     "timestamp": None, "metadata": "", "network": "localhost"} for h in file_hashes]
+        
+        def sign_registration(connector, file_hash, metadata="", nonce=None, gas_price=None):
+            return SimpleNamespace(hash=bytes.fromhex(file_hash[2:]), raw_transaction=(file_hash, metadata))
+        
+        def send_registration(connector, signed_tx):
+            if self.send_error is not None:
+                raise self.send_error
+            self.sent.append(signed_tx.raw_transaction)
+        
+        for name, side_effect in [
+            ("verify_many", verify_many),
+            ("sign_registration", sign_registration),
+            ("send_registration", send_registration),
+            ("get_pending_nonce", lambda connector: 0),
+            ("get_transaction_state", lambda connector, tx_hash: "unknown"),
+            ("wait_for_registration", lambda connector, tx_hash, timeout=120: {"status": 1, "block_number": 10}),
+        ]:
+            patcher = mock.patch.object(BlockchainConnector, name, autospec=True, side_effect=side_effect)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.prover = ProveIt(network="localhost")
+        self.prover.blockchain.web3 = mock.MagicMock()
+    
+    def test_enqueue_is_idempotent(self):
+        """Test that a hash is queued once per network."""
+        self.assertTrue(self.outbox.enqueue(hash_content("alpha"), "first", network="localhost"))
+        self.assertFalse(self.outbox.enqueue(hash_content("alpha")[2:], "second", network="localhost"))
+        self.assertTrue(self.outbox.enqueue(hash_content("alpha"), network="polygon"))
+        
+        self.assertEqual(self.outbox.get(hash_content("alpha"), "localhost")["metadata"], "first")
+        self.assertEqual(self.outbox.counts()["queued"], 2)
+        with self.assertRaises(ValueError):
+            self.outbox.enqueue("not a hash")
+    
+    def test_network_names_are_canonical(self):
+        """Test that network aliases share a queue and unknown networks are rejected when queued."""
+        self.outbox.enqueue(hash_content("alpha"), network="hardhat")
+        
+        self.assertEqual(self.outbox.get(hash_content("alpha"), "localhost")["network"], "localhost")
+        self.assertEqual(self.outbox.counts("hardhat")["queued"], 1)
+        self.assertEqual(self.outbox.flush(self.prover).hashes, 1)
+        with self.assertRaises(ValueError):
+            self.outbox.enqueue(hash_content("beta"), network="polygn")
+    
+    def test_flush_registers_queued_hashes(self):
+        """Test that a flush skips hashes already on chain and sends the others once."""
+        self.outbox.enqueue_many(
+            [(hash_content("alpha"), "a", None), (hash_content("beta"), "b", None), (hash_content("old"), "", None)],
+            network="localhost"
+        )
+        self.outbox.enqueue(hash_content("gamma"), network="polygon")
+        
+        summary = self.outbox.flush(self.prover, batch_size=2)
+        
+        self.assertEqual((summary.hashes, summary.confirmed, summary.already_registered), (3, 2, 1))
+        self.assertEqual(sorted(self.sent), [(hash_content("alpha"), "a"), (hash_content("beta"), "b")])
+        self.assertEqual(self.outbox.counts("localhost"), {
+            "queued": 0, "submitted": 0, "confirmed": 2, "registered": 1, "failed": 0
+        })
+        self.assertEqual(self.outbox.get(hash_content("alpha"), "localhost")["block_number"], 10)
+        self.assertEqual(self.outbox.counts("polygon")["queued"], 1)
+        
+        self.assertEqual(self.outbox.flush(self.prover).hashes, 0)
+        self.assertEqual(len(self.sent), 2)
+    
+    def test_failed_send_is_retried(self):
+        """Test that a registration that could not be sent stays queued for the next flush."""
+        self.outbox.enqueue(hash_content("alpha"), network="localhost")
+        
+        self.send_error = ConnectionError("RPC endpoint unreachable")
+        summary = self.outbox.flush(self.prover)
+        
+        self.assertEqual(len(summary.failed), 1)
+        entry = self.outbox.get(hash_content("alpha"), "localhost")
+        self.assertEqual((entry["state"], entry["attempts"]), ("queued", 1))
+        self.assertIn("unreachable", entry["error"])
+        
+        self.send_error = None
+        summary = self.outbox.flush(self.prover)
+        
+        self.assertEqual(summary.confirmed, 1)
+        self.assertEqual(self.outbox.get(hash_content("alpha"), "localhost")["state"], "confirmed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+"""
+Tests for the proof module.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import rlp
+from eth_abi import encode as abi_encode
+from click.testing import CliRunner
+from eth_utils import keccak
+
+from proveit.cli import main
+
+from proveit.proof import (
+    HASH_REGISTERED_TOPIC, ProofError, _build_trie_node, _to_nibbles, _walk_trie,
+    build_receipt_proof, create_proof_certificate, encode_block_header, encode_receipt,
+    verify_proof_certificate, verify_receipt_proof
+)
+
+CONTRACT = "0x5FbDB2315678afecb367f032d93F642f64180aa3"
+OWNER = "0x" + "11" * 20
+FILE_HASH = "0x" + "ab" * 32
+TX_HASH = "0x" + "77" * 32
+EMPTY_ROOT = "0x56e81f171bcc55a6ff8345e692c0f86e5b48e01b996cadc001622fb5e363b421"
+
+
+def _receipt(index, logs=(), receipt_type=2):
+    return {
+        "transactionHash": TX_HASH if index == 1 else "0x" + f"{index + 1000:064x}",
+        "type": receipt_type,
+        "status": 1,
+        "cumulativeGasUsed": 21000 * (index + 1),
+        "logsBloom": "0x" + "00" * 256,
+        "logs": list(logs),
+    }
+
+
+def _registration_log(metadata="Chapter 1", contract=CONTRACT, file_hash=FILE_HASH):
+    return {
+        "address": contract,
+        "topics": [HASH_REGISTERED_TOPIC, file_hash, "0x" + "00" * 12 + OWNER[2:]],
+        "data": abi_encode(["uint256", "string"], [1700000000, metadata]),
+    }
+
+
+def _block(receipts):
+    receipts_root, _ = build_receipt_proof(receipts, 0)
+    block = {
+        "parentHash": "0x" + "01" * 32,
+        "sha3Uncles": "0x1dcc4de8dec75d7aab85b567b6ccd41ad312451b948a7413f0a142fd40d49347",
+        "miner": "0x" + "22" * 20,
+        "stateRoot": "0x" + "03" * 32,
+        "transactionsRoot": "0x" + "04" * 32,
+        "receiptsRoot": receipts_root,
+        "logsBloom": "0x" + "00" * 256,
+        "difficulty": 0,
+        "number": 19000000,
+        "gasLimit": 30000000,
+        "gasUsed": 21000 * len(receipts),
+        "timestamp": 1700000000,
+        "extraData": b"",
+        "mixHash": "0x" + "05" * 32,
+        "nonce": "0x0000000000000000",
+        "baseFeePerGas": 7,
+        "withdrawalsRoot": EMPTY_ROOT,
+    }
+    block["hash"] = keccak(encode_block_header(block))
+    return block
+
+
+class TestTrie(unittest.TestCase):
+    """Test cases for the Merkle-Patricia trie."""
+    
+    def test_known_root(self):
+        """Test the trie against the reference vector from the Ethereum tests."""
+        items = sorted(
+            (_to_nibbles(key), value)
+            for key, value in [(b"do", b"verb"), (b"dog", b"puppy"), (b"doge", b"coin"), (b"horse", b"stallion")]
+        )
+        nodes = {}
+        root = rlp.encode(_build_trie_node(items, 0, nodes))
+        root_hash = keccak(root)
+        nodes[root_hash] = root
+        
+        self.assertEqual(root_hash.hex(), "5991bb8c6514148a29db676a14ac506cd2cd5775ace63c30a4fe457715e9ac84")
+        self.assertEqual(_walk_trie(root_hash, b"doge", nodes), b"coin")
+        with self.assertRaises(ProofError):
+            _walk_trie(root_hash, b"cat", nodes)
+    
+    def test_receipt_proofs(self):
+        """Test that every receipt of a large block can be proven."""
+        receipts = [_receipt(i, receipt_type=i % 3) for i in range(300)]
+        
+        for index in (0, 1, 127, 128, 299):
+            root, proof = build_receipt_proof(receipts, index)
+            self.assertEqual(verify_receipt_proof(root, index, proof), encode_receipt(receipts[index]))
+            with self.assertRaises(ProofError):
+                verify_receipt_proof(root, index, proof[:-1])
+    
+    def test_genesis_header(self):
+        """Test that the mainnet genesis header hashes to the genesis block hash."""
+        genesis = {
+            "parentHash": "0x" + "00" * 32,
+            "sha3Uncles": "0x1dcc4de8dec75d7aab85b567b6ccd41ad312451b948a7413f0a142fd40d49347",
+            "miner": "0x" + "00" * 20,
+            "stateRoot": "0xd7f8974fb5ac78d9ac099b9ad5018bedc2ce0a72dad1827a1709da30580f0544",
+            "transactionsRoot": EMPTY_ROOT,
+            "receiptsRoot": EMPTY_ROOT,
+            "logsBloom": "0x" + "00" * 256,
+            "difficulty": 17179869184,
+            "number": 0,
+            "gasLimit": 5000,
+            "gasUsed": 0,
+            "timestamp": 0,
+            "extraData": "0x11bbe8db4e347b4e8c937c1c8370e4b5ed33adb3db69cbdb7a38e1e50b1b82fa",
+            "mixHash": "0x" + "00" * 32,
+            "nonce": "0x0000000000000042",
+        }
+        
+        self.assertEqual(
+            keccak(encode_block_header(genesis)).hex(),
+            "d4e56740f876aef8c010b86a40d5f56745a118d0906a34e69aec8c0db1cb8fa3"
+        )
+
+
+class TestProofCertificate(unittest.TestCase):
+    """Test cases for proof certificates."""
+    
+    def setUp(self):
+        self.receipts = [
+            _receipt(0, receipt_type=0),
+            _receipt(1, logs=[_registration_log(contract="0x" + "99" * 20), _registration_log()]),
+            _receipt(2),
+        ]
+        self.block = _block(self.receipts)
+        self.block_hash = "0x" + self.block["hash"].hex()
+        self.certificate = create_proof_certificate(FILE_HASH, CONTRACT, "localhost", TX_HASH, self.block, self.receipts)
+    
+    def test_round_trip(self):
+        """Test that a certificate verifies against its trusted block."""
+        result = verify_proof_certificate(self.certificate, {self.block_hash}, CONTRACT)
+        
+        self.assertEqual(self.certificate["log_index"], 1)
+        self.assertEqual(result["hash"], FILE_HASH)
+        self.assertEqual(result["owner"].lower(), OWNER)
+        self.assertEqual(result["metadata"], "Chapter 1")
+        self.assertEqual(result["timestamp"].timestamp(), 1700000000)
+        self.assertEqual(result["block_number"], 19000000)
+    
+    def test_rejects_untrusted_block(self):
+        """Test that a certificate from an unknown block is rejected."""
+        with self.assertRaises(ProofError):
+            verify_proof_certificate(self.certificate, {"0x" + "00" * 32}, CONTRACT)
+    
+    def test_rejects_other_contract(self):
+        """Test that a registration made with another contract is rejected."""
+        with self.assertRaises(ProofError):
+            verify_proof_certificate(self.certificate, {self.block_hash}, "0x" + "99" * 20)
+    
+    def test_rejects_foreign_contract_in_trusted_block(self):
+        """Test that a genuine block does not vouch for a registration made with another contract."""
+        foreign = create_proof_certificate(FILE_HASH, "0x" + "99" * 20, "localhost", TX_HASH, self.block, self.receipts)
+        
+        with self.assertRaises(ProofError):
+            verify_proof_certificate(foreign, {self.block_hash}, CONTRACT)
+        
+        # The command line checks against the configured network's contract when --contract is not given
+        with tempfile.TemporaryDirectory() as directory:
+            paths = {}
+            for name, certificate in [("genuine", self.certificate), ("foreign", foreign)]:
+                paths[name] = os.path.join(directory, f"{name}.proof.json")
+                with open(paths[name], "w") as f:
+                    json.dump(certificate, f)
+            trusted = os.path.join(directory, "trusted.txt")
+            with open(trusted, "w") as f:
+                f.write(self.block_hash + "\n")
+            
+            prover = SimpleNamespace(blockchain=SimpleNamespace(contract=SimpleNamespace(address=CONTRACT)))
+            with mock.patch("proveit.cli._get_prover", return_value=prover):
+                result = CliRunner().invoke(main, ["verify-certificate", paths["genuine"], paths["foreign"], "--trusted-blocks", trusted])
+        
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn(f"Valid: {paths['genuine']}", result.output)
+        self.assertIn(f"Invalid: {paths['foreign']}", result.output)
+    
+    def test_rejects_tampered_receipt(self):
+        """Test that a receipt that is not in the receipt trie is rejected."""
+        forged = [_receipt(0, receipt_type=0), _receipt(1, logs=[_registration_log(metadata="Forged")]), _receipt(2)]
+        forged_certificate = create_proof_certificate(FILE_HASH, CONTRACT, "localhost", TX_HASH, _block(forged), forged)
+        certificate = dict(self.certificate, receipt=forged_certificate["receipt"], log_index=0)
+        
+        with self.assertRaises(ProofError):
+            verify_proof_certificate(certificate, {self.block_hash}, CONTRACT)
+    
+    def test_rejects_transaction_without_registration(self):
+        """Test that a certificate cannot be created for a transaction that did not register the hash."""
+        with self.assertRaises(ProofError):
+            create_proof_certificate("0x" + "cd" * 32, CONTRACT, "localhost", TX_HASH, self.block, self.receipts)
+
+
+if __name__ == "__main__":
+    unittest.main()
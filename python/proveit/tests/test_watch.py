@@ -0,0 +1,178 @@
+"""
+Tests for the watch module.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from proveit.hash import hash_content
+from proveit.journal import RegistrationJournal
+from proveit.models import BulkRegistrationSummary
+from proveit.watch import FolderRegistrar, InotifyWatcher, PollingWatcher
+
+
+def _write(path, content):
+    with open(path, "w") as f:
+        f.write(content)
+
+
+class _FakeWatcher:
+    """Watcher reporting the paths queued by the test."""
+    
+    def __init__(self):
+        self.changes = []
+    
+    def poll(self, timeout):
+        changed, self.changes = set(self.changes), []
+        return changed
+    
+    def close(self):
+        pass
+
+
+class TestWatchers(unittest.TestCase):
+    """Test cases for the directory watchers."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.root = self.directory.name
+        _write(os.path.join(self.root, "existing.txt"), "existing")
+    
+    def test_polling_watcher(self):
+        watcher = PollingWatcher(self.root, interval=0)
+        self.assertEqual(watcher.poll(0), set())
+        
+        path = os.path.join(self.root, "new.txt")
+        _write(path, "new")
+        self.assertEqual(watcher.poll(0), {Path(path)})
+        self.assertEqual(watcher.poll(0), set())
+        
+        _write(path, "changed content")
+        self.assertEqual(watcher.poll(0), {Path(path)})
+    
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_inotify_watcher(self):
+        try:
+            watcher = InotifyWatcher(self.root)
+        except OSError as e:
+            self.skipTest(f"inotify unavailable: {e}")
+        self.addCleanup(watcher.close)
+        
+        path = os.path.join(self.root, "new.txt")
+        _write(path, "new")
+        subdirectory = os.path.join(self.root, "sub")
+        os.mkdir(subdirectory)
+        nested = os.path.join(subdirectory, "nested.txt")
+        _write(nested, "nested")
+        
+        changed = set()
+        for _ in range(5):
+            changed |= watcher.poll(0.2)
+        
+        self.assertIn(Path(path), changed)
+        self.assertIn(Path(nested), changed)
+        self.assertNotIn(Path(self.root, "existing.txt"), changed)
+
+
+class TestFolderRegistrar(unittest.TestCase):
+    """Test cases for batched registration of watched files."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.root = self.directory.name
+        
+        self.journal = RegistrationJournal(os.path.join(self.root, ".proveit-journal.jsonl"))
+        self.addCleanup(self.journal.close)
+        
+        self.batches = []
+        self.names = {}
+        self.messages = []
+        
+        def register_hashes(file_hashes, metadata="", journal=None):
+            self.batches.append(sorted(self.names[h] for h in file_hashes))
+            for file_hash in file_hashes:
+                journal.record(file_hash, "confirmed")
+            return BulkRegistrationSummary(hashes=len(file_hashes), confirmed=len(file_hashes))
+        
+        self.prover = mock.Mock()
+        self.prover.register_hashes.side_effect = register_hashes
+        self.watcher = _FakeWatcher()
+        self.registrar = FolderRegistrar(
+            self.prover, self.watcher, self.journal, settle=0, batch_interval=3600, batch_size=2, workers=2,
+            echo=self.messages.append
+        )
+    
+    def _write(self, name, content=None):
+        path = Path(self.root, name)
+        _write(path, name if content is None else content)
+        self.names[hash_content(name if content is None else content)] = name
+        return path
+    
+    def _run_until_idle(self):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            self.registrar.step(timeout=0)
+            if not self.registrar._hashing and not self.registrar._changed:
+                break
+            # Give the hashing threads time to finish
+            time.sleep(0.01)
+    
+    def test_batches_changed_files(self):
+        paths = [self._write(name) for name in ("a.txt", "b.txt", "c.txt", ".hidden", "d.part")]
+        self.watcher.changes = paths + [Path(self.journal.path)]
+        
+        self._run_until_idle()
+        
+        # The batch fills up at two files; the third waits for the interval or a flush
+        self.assertEqual([len(batch) for batch in self.batches], [2])
+        self.registrar.flush()
+        self.assertEqual([len(batch) for batch in self.batches], [2, 1])
+        self.assertEqual(sorted(sum(self.batches, [])), ["a.txt", "b.txt", "c.txt"])
+        self.assertEqual(self.journal.cached_hash(paths[2], paths[2].stat()), hash_content("c.txt"))
+    
+    def test_skips_unchanged_registered_files(self):
+        path = self._write("a.txt", "alpha")
+        self.watcher.changes = [path]
+        self._run_until_idle()
+        self.registrar.flush()
+        self.assertEqual(self.batches, [["a.txt"]])
+        
+        # A touch without a content change is reported again but not registered
+        self.registrar = FolderRegistrar(self.prover, self.watcher, self.journal, settle=0, batch_interval=0)
+        self.watcher.changes = [path]
+        self._run_until_idle()
+        self.registrar.flush()
+        self.assertEqual(len(self.batches), 1)
+    
+    def test_failed_batch_is_retried(self):
+        """Test that a batch whose submission fails, or whose files were deleted, is kept and retried."""
+        paths = [self._write(name) for name in ("a.txt", "b.txt")]
+        self.watcher.changes = paths
+        self.registrar.batch_size = 100
+        self.registrar.batch_interval = 0
+        
+        register_hashes = self.prover.register_hashes.side_effect
+        self.prover.register_hashes.side_effect = ConnectionError("RPC endpoint unreachable")
+        self._run_until_idle()
+        self.assertIn("unreachable", self.messages[-1])
+        self.assertEqual(len(self.registrar._batch), 2)
+        
+        # The journaled hashes are registered even though a file is gone meanwhile
+        os.remove(paths[0])
+        self.prover.register_hashes.side_effect = register_hashes
+        self.registrar.step(timeout=0)
+        
+        self.assertEqual(self.batches, [["a.txt", "b.txt"]])
+        self.assertEqual(self.registrar._batch, [])
+        self.registrar.flush()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,410 @@
+"""
+Tests for the web interface.
+"""
+
+import gzip
+import io
+import json
+import threading
+import time
+import unittest
+import zipfile
+from datetime import datetime
+from unittest import mock
+
+from web3.exceptions import TimeExhausted
+
+from proveit.admission import RPCOverloadedError
+from proveit.blockchain import BlockchainConnector
+from proveit.hash import hash_content
+from proveit.web import create_app
+from proveit.web.server import GUNICORN_AVAILABLE, build_production_server
+
+
+REGISTERED_HASH = "0x" + "ab" * 32
+UNREGISTERED_HASH = "0x" + "cd" * 32
+TX_HASH = "0x" + "ef" * 32
+
+
+def fake_verify_many(self, file_hashes, batch_size=100):
+    """Pretend that only REGISTERED_HASH is registered."""
+    results = []
+    for file_hash in file_hashes:
+        if file_hash == REGISTERED_HASH:
+            results.append({
+                "hash": file_hash,
+                "is_registered": True,
+                "owner": "0x" + "11" * 20,
+                "timestamp": datetime(2025, 4, 15, 12, 0, 0),
+                "metadata": "thesis",
+                "network": self.network.value
+            })
+        else:
+            results.append({"hash": file_hash, "is_registered": False})
+    return results
+
+
+class TestVerifyBatch(unittest.TestCase):
+    """Test cases for the batch verification endpoint."""
+    
+    def setUp(self):
+        self.app = create_app({"TESTING": True, "VERIFY_BATCH_MAX_HASHES": 3})
+        self.client = self.app.test_client()
+        patcher = mock.patch.object(BlockchainConnector, "verify_many", autospec=True, side_effect=fake_verify_many)
+        self.verify_many = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_json_batch_preserves_order(self):
+        """Test that results are returned in request order."""
+        response = self.client.post("/api/verify/batch", json={
+            "hashes": [UNREGISTERED_HASH, REGISTERED_HASH.upper().replace("0X", ""), "nonsense"],
+            "network": "localhost"
+        })
+        
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()["results"]
+        self.assertEqual([r.get("is_registered") for r in results], [False, True, None])
+        self.assertEqual(results[1]["hash"], REGISTERED_HASH)
+        self.assertEqual(results[1]["owner"], "0x" + "11" * 20)
+        self.assertEqual(results[2]["error"], "Invalid hash")
+        self.verify_many.assert_called_once()
+    
+    def test_ndjson_batch_streams_ndjson(self):
+        """Test that NDJSON input produces NDJSON output."""
+        body = "\n".join([REGISTERED_HASH, json.dumps({"hash": UNREGISTERED_HASH}), ""])
+        response = self.client.post(
+            "/api/verify/batch?network=localhost",
+            data=body,
+            content_type="application/x-ndjson"
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([line["is_registered"] for line in lines], [True, False])
+    
+    def test_batch_uses_verification_cache(self):
+        """Test that registered hashes are answered from the cache."""
+        payload = {"hashes": [REGISTERED_HASH], "network": "localhost"}
+        self.client.post("/api/verify/batch", json=payload)
+        self.client.post("/api/verify/batch", json=payload)
+        
+        self.verify_many.assert_called_once()
+    
+    def test_concurrent_first_requests_share_prover(self):
+        """Test that concurrent first requests on a network build a single prover."""
+        from proveit.web import routes
+        
+        def slow_prover(**kwargs):
+            time.sleep(0.05)
+            return mock.sentinel.prover
+        
+        provers = []
+        
+        def first_request():
+            with self.app.app_context():
+                provers.append(routes._get_prover("localhost"))
+        
+        with mock.patch.object(routes, "ProveIt", side_effect=slow_prover) as prover_class:
+            threads = [threading.Thread(target=first_request) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        self.assertEqual(prover_class.call_count, 1)
+        self.assertEqual(provers, [mock.sentinel.prover] * 4)
+    
+    def test_network_aliases_share_prover(self):
+        """Test that network aliases get the same prover and unknown networks are rejected."""
+        from proveit.web import routes
+        
+        with self.app.app_context(), mock.patch.object(routes, "ProveIt") as prover_class:
+            self.assertIs(routes._get_prover("hardhat"), routes._get_prover("localhost"))
+            with self.assertRaises(ValueError):
+                routes._get_prover("polygn")
+        
+        prover_class.assert_called_once()
+        self.assertEqual(list(self.app.extensions["proveit_provers"]), ["localhost"])
+    
+    def test_batch_too_large(self):
+        """Test that oversized batches are rejected."""
+        response = self.client.post("/api/verify/batch", json=[REGISTERED_HASH] * 4)
+        self.assertEqual(response.status_code, 413)
+    
+    def test_batch_without_hashes(self):
+        """Test that a request without hashes is rejected."""
+        response = self.client.post("/api/verify/batch", json={"network": "localhost"})
+        self.assertEqual(response.status_code, 400)
+
+
+
+class TestVerifyCaching(unittest.TestCase):
+    """Test cases for HTTP caching of verification responses."""
+    
+    def setUp(self):
+        self.app = create_app({"TESTING": True})
+        self.client = self.app.test_client()
+        patcher = mock.patch.object(
+            BlockchainConnector, "verify", autospec=True,
+            side_effect=lambda self, file_hash: fake_verify_many(self, [file_hash])[0]
+        )
+        self.verify = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_registered_hash_is_immutable(self):
+        """Test that positive answers are cached for a long time."""
+        response = self.client.get(f"/api/verify/{REGISTERED_HASH}?network=localhost")
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.get_json()["is_registered"])
+        self.assertTrue(response.cache_control.immutable)
+        self.assertEqual(response.cache_control.max_age, self.app.config["VERIFY_POSITIVE_MAX_AGE"])
+        self.assertIsNotNone(response.headers.get("ETag"))
+    
+    def test_unregistered_hash_is_cached_briefly(self):
+        """Test that negative answers get a short max-age."""
+        response = self.client.get(f"/api/verify/{UNREGISTERED_HASH}?network=localhost")
+        
+        self.assertFalse(response.get_json()["is_registered"])
+        self.assertFalse(response.cache_control.immutable)
+        self.assertEqual(response.cache_control.max_age, self.app.config["VERIFY_NEGATIVE_MAX_AGE"])
+    
+    def test_conditional_request(self):
+        """Test that a matching If-None-Match returns 304."""
+        url = f"/api/verify/{REGISTERED_HASH}?network=localhost"
+        etag = self.client.get(url).headers["ETag"]
+        
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+    
+    def test_overloaded_network(self):
+        """Test that overload is reported as 503 with Retry-After."""
+        self.verify.side_effect = RPCOverloadedError("Too many pending RPC calls", retry_after=5)
+        response = self.client.get(f"/api/verify/{UNREGISTERED_HASH}?network=localhost")
+        
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "5")
+    
+    def test_registration_not_mined_in_time(self):
+        """Test that a registration still unmined at its deadline is reported as 504."""
+        with mock.patch.object(BlockchainConnector, "register", side_effect=TimeExhausted("Not mined")):
+            response = self.client.post("/api/register", json={"hash": UNREGISTERED_HASH, "network": "localhost"})
+        
+        self.assertEqual(response.status_code, 504)
+    
+    def test_invalid_hash(self):
+        """Test that an invalid hash is rejected."""
+        response = self.client.get("/api/verify/not-a-hash")
+        self.assertEqual(response.status_code, 400)
+    
+    def test_networks_are_cacheable(self):
+        """Test that the network list is cacheable."""
+        response = self.client.get("/api/networks")
+        
+        self.assertEqual(response.cache_control.max_age, self.app.config["NETWORKS_MAX_AGE"])
+        self.assertIn("polygon", response.get_json())
+
+
+
+class TestCertificateEndpoint(unittest.TestCase):
+    """Test cases for the certificate endpoint."""
+    
+    def setUp(self):
+        self.app = create_app({"TESTING": True})
+        self.client = self.app.test_client()
+        patcher = mock.patch.object(
+            BlockchainConnector, "verify", autospec=True,
+            side_effect=lambda self, file_hash: fake_verify_many(self, [file_hash])[0]
+        )
+        self.verify = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            BlockchainConnector, "find_registration_transaction", autospec=True, return_value=TX_HASH
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_pdf_certificate_is_cached(self):
+        """Test that a certificate is rendered once and then served from the cache."""
+        payload = {"hash": REGISTERED_HASH, "network": "localhost", "filename": "thesis.pdf"}
+        first = self.client.post("/api/certificate", json=payload)
+        second = self.client.post("/api/certificate", json=payload)
+        
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.mimetype, "application/pdf")
+        self.assertTrue(first.data.startswith(b"%PDF"))
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(self.verify.call_count, 1)
+    
+    def test_json_certificate_from_form(self):
+        """Test that form submissions from the web pages are accepted."""
+        response = self.client.post("/api/certificate", data={
+            "hash": REGISTERED_HASH,
+            "network": "localhost",
+            "format": "json"
+        })
+        
+        self.assertEqual(response.status_code, 200)
+        certificate = json.loads(response.data)
+        self.assertEqual(certificate["hash"], REGISTERED_HASH)
+        self.assertEqual(certificate["metadata"], "thesis")
+        self.assertEqual(certificate["tx_hash"], TX_HASH)
+    
+    def test_certificate_archive(self):
+        """Test that many certificates are streamed into one zip archive."""
+        response = self.client.post("/api/certificates", json={
+            "certificates": [
+                {"hash": REGISTERED_HASH, "filename": "thesis.pdf"},
+                {"hash": UNREGISTERED_HASH, "filename": "draft.pdf"}
+            ],
+            "network": "localhost",
+            "format": "json"
+        })
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/zip")
+        with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+            self.assertEqual(archive.namelist(), ["thesis.pdf.json"])
+            self.assertEqual(json.loads(archive.read("thesis.pdf.json"))["hash"], REGISTERED_HASH)
+        self.app.extensions["proveit_render_pool"].shutdown()
+    
+    def test_certificate_archives_share_one_pool(self):
+        """Test that archive requests render with one long-lived pool instead of a pool each."""
+        payload = {"certificates": [{"hash": REGISTERED_HASH}], "network": "localhost", "format": "json"}
+        
+        self.assertEqual(self.client.post("/api/certificates", json=payload).status_code, 200)
+        pool = self.app.extensions["proveit_render_pool"]
+        self.addCleanup(pool.shutdown)
+        self.assertEqual(self.client.post("/api/certificates", json=payload).status_code, 200)
+        
+        self.assertIs(self.app.extensions["proveit_render_pool"], pool)
+        self.assertEqual(pool.submit(len, "alive").result(), 5)
+    
+    def test_unsupported_format(self):
+        """Test that unsupported formats are rejected."""
+        response = self.client.post("/api/certificate", json={"hash": REGISTERED_HASH, "format": "txt"})
+        self.assertEqual(response.status_code, 400)
+
+
+
+class TestHashing(unittest.TestCase):
+    """Test cases for file hashing in the web interface."""
+    
+    def setUp(self):
+        self.app = create_app({"TESTING": True})
+        self.client = self.app.test_client()
+    
+    def test_pages_hash_in_browser(self):
+        """Test that the upload pages load the client-side hashing script."""
+        for page in ("/register", "/verify"):
+            html = self.client.get(page).get_data(as_text=True)
+            self.assertIn("js/hashing.js", html)
+            self.assertIn("js/sha256-worker.js", html)
+    
+    def test_server_side_fallback(self):
+        """Test that /api/hash still hashes uploads."""
+        response = self.client.post("/api/hash", data={
+            "file": (io.BytesIO(b"Hello, world!"), "hello.txt")
+        })
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["hash"], hash_content(b"Hello, world!"))
+
+
+
+class TestStaticAssets(unittest.TestCase):
+    """Test cases for fingerprinted static assets and response compression."""
+    
+    def setUp(self):
+        self.app = create_app({"TESTING": True})
+        self.client = self.app.test_client()
+    
+    def _stylesheet_url(self):
+        html = self.client.get("/").get_data(as_text=True)
+        start = html.index("/assets/")
+        return html[start:html.index('"', start)]
+    
+    def test_fingerprinted_asset_is_immutable(self):
+        """Test that fingerprinted URLs are cached forever."""
+        url = self._stylesheet_url()
+        response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/css")
+        self.assertTrue(response.cache_control.immutable)
+        self.assertEqual(response.cache_control.max_age, self.app.config["ASSETS_MAX_AGE"])
+    
+    def test_stale_fingerprint_is_not_immutable(self):
+        """Test that an outdated fingerprint still serves the file, but briefly cached."""
+        response = self.client.get("/assets/000000000000/css/style.css")
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.cache_control.immutable)
+    
+    def test_asset_is_precompressed(self):
+        """Test that assets are served gzip-encoded to clients that accept it."""
+        url = self._stylesheet_url()
+        plain = self.client.get(url).data
+        response = self.client.get(url, headers={"Accept-Encoding": "gzip"})
+        
+        self.assertEqual(response.content_encoding, "gzip")
+        self.assertEqual(gzip.decompress(response.data), plain)
+    
+    def test_missing_asset(self):
+        """Test that unknown assets and path traversal return 404."""
+        self.assertEqual(self.client.get("/assets/0/css/missing.css").status_code, 404)
+        self.assertEqual(self.client.get("/assets/0/../__init__.py").status_code, 404)
+    
+    def test_html_response_is_compressed(self):
+        """Test that large rendered pages are compressed."""
+        response = self.client.get("/register", headers={"Accept-Encoding": "gzip"})
+        
+        self.assertEqual(response.content_encoding, "gzip")
+        self.assertIn(b"<html", gzip.decompress(response.data))
+    
+    def test_small_response_is_not_compressed(self):
+        """Test that responses below the size threshold are sent as they are."""
+        response = self.client.get("/api/networks", headers={"Accept-Encoding": "gzip"})
+        self.assertIsNone(response.content_encoding)
+
+
+
+@unittest.skipUnless(GUNICORN_AVAILABLE, "gunicorn is not installed")
+class TestProductionServer(unittest.TestCase):
+    """Test cases for the gunicorn production server."""
+    
+    def setUp(self):
+        self.app = create_app({"TESTING": True})
+    
+    def test_application_serves_the_app(self):
+        """Test that the gunicorn application is configured and loads the Flask app."""
+        server = build_production_server(self.app, ["127.0.0.1:0"], workers=2, threads=1, warm_networks=["localhost"])
+        
+        self.assertIs(server.load(), self.app)
+        self.assertEqual(server.cfg.workers, 2)
+        self.assertEqual(server.cfg.worker_class_str, "sync")
+        self.assertEqual(server.cfg.bind, ["127.0.0.1:0"])
+        
+        with mock.patch("proveit.web.server.warm_up") as warm_up:
+            server.cfg.post_worker_init(mock.Mock())
+        warm_up.assert_called_once_with(self.app, ["localhost"])
+    
+    def test_invalid_warm_network_fails_at_startup(self):
+        """Test that an unknown network is rejected before any worker starts."""
+        from click.testing import CliRunner
+        from proveit.cli import main
+        
+        with self.assertRaises(ValueError):
+            build_production_server(self.app, ["127.0.0.1:0"], warm_networks=["nowhere"])
+        
+        with mock.patch("proveit.web.server._GunicornApplication.run") as run:
+            result = CliRunner().invoke(main, ["serve", "--production", "--warm-network", "nowhere"])
+        
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Invalid network: nowhere", result.output)
+        run.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,403 @@
+"""
+Folder watching for the ProveIt package.
+
+This module registers files dropped into a folder as they appear. Changes are
+detected with inotify on Linux, or by polling file metadata elsewhere. A file
+is only processed once it has stopped changing, it is hashed on a bounded
+pool of threads, and registrations are submitted in periodic batches.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .hash import hash_file
+from .journal import FINAL_STATES, RegistrationJournal
+
+# File name patterns ignored by default: hidden files, editor swap files and partial downloads
+DEFAULT_IGNORE_PATTERNS = ('.*', '*~', '*.swp', '*.tmp', '*.part', '*.crdownload')
+
+# inotify constants, from <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_ONLYDIR
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """
+    Recursive directory watcher based on Linux inotify.
+    """
+    
+    def __init__(self, root: str):
+        """
+        Start watching a directory tree.
+        
+        Args:
+            root: Directory to watch
+        
+        Raises:
+            OSError: If inotify is not available
+        """
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        
+        self.root = root
+        self._directories: Dict[int, str] = {}
+        self._pending: Set[Path] = set()
+        self._add_tree(root, report=False)
+    
+    def poll(self, timeout: float) -> Set[Path]:
+        """
+        Wait for changes.
+        
+        Args:
+            timeout: Maximum number of seconds to wait
+        
+        Returns:
+            Paths of the files created, modified or moved in since the last call
+        """
+        changed, self._pending = self._pending, set()
+        
+        ready, _, _ = select.select([self._fd], [], [], 0 if changed else timeout)
+        if not ready:
+            return changed
+        
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b'\0')
+                offset += _EVENT_HEADER.size + length
+                
+                if mask & _IN_Q_OVERFLOW:
+                    # Events were lost; fall back to listing the tree once
+                    changed.update(_walk_files(self.root))
+                    continue
+                
+                if mask & _IN_IGNORED:
+                    self._directories.pop(wd, None)
+                    continue
+                
+                directory = self._directories.get(wd)
+                if directory is None or not name:
+                    continue
+                
+                path = os.path.join(directory, os.fsdecode(name))
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        # Files may have been written before the watch was added
+                        changed.update(self._add_tree(path, report=True))
+                else:
+                    changed.add(Path(path))
+        
+        return changed
+    
+    def _add_tree(self, root: str, report: bool) -> Set[Path]:
+        files: Set[Path] = set()
+        
+        for directory, dirs, names in os.walk(root):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error in (errno.ENOENT, errno.ENOTDIR):
+                    continue
+                raise OSError(error, f"Cannot watch {directory}: {os.strerror(error)}")
+            
+            self._directories[wd] = directory
+            if report:
+                files.update(Path(directory, name) for name in names)
+        
+        return files
+    
+    def close(self) -> None:
+        """Stop watching."""
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """
+    Recursive directory watcher that compares file sizes and modification times.
+    """
+    
+    def __init__(self, root: str, interval: float = 2.0):
+        """
+        Start watching a directory tree.
+        
+        Args:
+            root: Directory to watch
+            interval: Seconds between two looks at the tree (default: 2)
+        """
+        self.root = root
+        self.interval = interval
+        self._files = self._snapshot()
+        self._next = time.monotonic() + interval
+    
+    def poll(self, timeout: float) -> Set[Path]:
+        """
+        Wait for changes.
+        
+        Args:
+            timeout: Maximum number of seconds to wait
+        
+        Returns:
+            Paths of the files created or modified since the last call
+        """
+        delay = self._next - time.monotonic()
+        if delay > timeout:
+            time.sleep(max(timeout, 0))
+            return set()
+        
+        time.sleep(max(delay, 0))
+        self._next = time.monotonic() + self.interval
+        
+        files = self._snapshot()
+        changed = {path for path, signature in files.items() if self._files.get(path) != signature}
+        self._files = files
+        return changed
+    
+    def _snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        files = {}
+        for path in _walk_files(self.root):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files[path] = (stat.st_size, stat.st_mtime_ns)
+        return files
+    
+    def close(self) -> None:
+        """Stop watching."""
+
+
+def create_watcher(root: str, polling: bool = False, interval: float = 2.0):
+    """
+    Create the best available watcher for a directory tree.
+    
+    Args:
+        root: Directory to watch
+        polling: Always use the polling watcher (default: only if inotify is unavailable)
+        interval: Seconds between two looks at the tree when polling (default: 2)
+    
+    Returns:
+        An InotifyWatcher on Linux, a PollingWatcher otherwise
+    """
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            # No inotify (e.g. some containers), or the watch limit is reached
+            pass
+    
+    return PollingWatcher(root, interval)
+
+
+class FolderRegistrar:
+    """
+    Registers the files that appear or change in a watched folder.
+    
+    A file is hashed once no change has been seen for settle seconds. Hashed
+    files are registered in batches, when batch_size files are waiting or
+    batch_interval seconds after the previous batch. Hashes are recorded in the
+    journal, so a file whose content did not change is never registered twice.
+    A batch that cannot be submitted, e.g. while the RPC endpoint is down, is
+    kept and submitted again after the next interval.
+    """
+    
+    def __init__(
+        self,
+        prover,
+        watcher,
+        journal: RegistrationJournal,
+        metadata: str = "",
+        settle: float = 2.0,
+        batch_interval: float = 30.0,
+        batch_size: int = 100,
+        workers: Optional[int] = None,
+        ignore: Iterable[str] = DEFAULT_IGNORE_PATTERNS,
+        echo: Callable[[str], None] = lambda message: None
+    ):
+        """
+        Initialize the registrar.
+        
+        Args:
+            prover: ProveIt instance used to register the files
+            watcher: Watcher reporting changed files, see create_watcher
+            journal: Journal recording hashes and registrations
+            metadata: Optional metadata to associate with every file
+            settle: Seconds a file must stay unchanged before it is hashed (default: 2)
+            batch_interval: Maximum seconds between two batch submissions (default: 30)
+            batch_size: Number of waiting files that triggers a submission (default: 100)
+            workers: Number of hashing threads (default: number of CPUs)
+            ignore: File name patterns to ignore (default: hidden, swap and partial files)
+            echo: Called with a line of text for every submitted or failed batch
+        """
+        self.prover = prover
+        self.watcher = watcher
+        self.journal = journal
+        self.metadata = metadata
+        self.settle = settle
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        self.ignore = tuple(ignore)
+        self.echo = echo
+        self._executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self._changed: Dict[Path, float] = {}
+        self._hashing: Dict[Path, Tuple[os.stat_result, Future]] = {}
+        self._batch: List[Tuple[Path, str]] = []
+        self._last_submit = time.monotonic()
+    
+    def run(self, should_stop: Callable[[], bool] = lambda: False) -> None:
+        """
+        Watch the folder until should_stop returns True, then submit what is left.
+        
+        Args:
+            should_stop: Checked between two polls of the watcher
+        """
+        try:
+            while not should_stop():
+                self.step(timeout=min(self.settle, 1.0))
+        finally:
+            self.flush()
+    
+    def step(self, timeout: float = 1.0) -> None:
+        """
+        Process one round of changes.
+        
+        Args:
+            timeout: Maximum number of seconds to wait for changes
+        """
+        for path in self.watcher.poll(timeout):
+            if not self._ignored(path):
+                self._changed[path] = time.monotonic()
+        
+        now = time.monotonic()
+        
+        # Hash the files that have stopped changing
+        for path, changed_at in list(self._changed.items()):
+            if now - changed_at < self.settle or path in self._hashing:
+                continue
+            
+            del self._changed[path]
+            try:
+                stat = path.stat()
+            except OSError:
+                # Deleted or moved away before it settled
+                continue
+            
+            cached = self.journal.cached_hash(path, stat)
+            if cached is not None:
+                # Unchanged since it was hashed; queue it again unless it is already registered
+                state = self.journal.state(cached)
+                if state is None or state["event"] not in FINAL_STATES:
+                    self._batch.append((path, cached))
+                continue
+            
+            self._hashing[path] = (stat, self._executor.submit(hash_file, path, 1024 * 1024))
+        
+        # Record the hashes that are ready
+        for path, (stat, future) in list(self._hashing.items()):
+            if not future.done():
+                continue
+            
+            del self._hashing[path]
+            self._record(path, stat, future)
+        
+        while len(self._batch) >= self.batch_size:
+            if not self._submit(self.batch_size):
+                break
+        
+        if self._batch and now - self._last_submit >= self.batch_interval:
+            self._submit(len(self._batch))
+    
+    def flush(self) -> None:
+        """
+        Wait for the files being hashed and submit every waiting file.
+        
+        Files that cannot be submitted stay hashed in the journal, so
+        register-many with the same journal registers them without rehashing.
+        """
+        for path, (stat, future) in list(self._hashing.items()):
+            self._record(path, stat, future)
+        
+        self._hashing.clear()
+        
+        if self._batch and not self._submit(len(self._batch)):
+            self.echo(f"{len(self._batch)} files were not registered; run register-many with this journal to retry")
+        
+        self._executor.shutdown()
+    
+    def _record(self, path: Path, stat: os.stat_result, future: Future) -> None:
+        try:
+            file_hash = future.result()
+        except OSError:
+            # Deleted or moved away before it could be read
+            return
+        self.journal.record_hash(path, stat, file_hash)
+        self._batch.append((path, file_hash))
+    
+    def _submit(self, count: int) -> bool:
+        entries = self._batch[:count]
+        del self._batch[:count]
+        self._last_submit = time.monotonic()
+        
+        # The journaled hashes are registered, so files deleted or changed since they
+        # were hashed need no stat; changed files are picked up again by a later event
+        batch = list(dict.fromkeys(entries))
+        try:
+            summary = self.prover.register_hashes(
+                list(dict.fromkeys(file_hash for _, file_hash in batch)), self.metadata, journal=self.journal
+            )
+        except Exception as e:
+            # Keep the batch for the next interval
+            self._batch[:0] = entries
+            self.echo(f"Could not submit {len(batch)} files: {e}")
+            return False
+        
+        message = f"Registered {summary.confirmed} of {len(batch)} files"
+        if summary.already_registered:
+            message += f", {summary.already_registered} already registered"
+        if summary.pending:
+            message += f", {summary.pending} still pending"
+        if summary.failed:
+            message += f", {len(summary.failed)} failed"
+        self.echo(message)
+        return True
+    
+    def _ignored(self, path: Path) -> bool:
+        if path.name == self.journal.path.name and path.resolve() == self.journal.path.resolve():
+            return True
+        return any(fnmatch.fnmatch(path.name, pattern) for pattern in self.ignore)
+
+
+def _walk_files(root: str) -> Iterable[Path]:
+    for directory, _, names in os.walk(root):
+        for name in names:
+            yield Path(directory, name)
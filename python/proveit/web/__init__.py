@@ -5,8 +5,12 @@ This module provides a Flask web application for interacting with the ProveIt sy
 """
 
 import os
+import threading
+
 from flask import Flask
 
+from ..cache import CertificateCache, VerificationCache
+
 
 def create_app(test_config=None):
     """
@@ -23,6 +27,28 @@ def create_app(test_config=None):
     app.config.from_mapping(
         SECRET_KEY=os.environ.get('SECRET_KEY', 'dev'),
         DATABASE=os.path.join(app.instance_path, 'proveit.sqlite'),
+        VERIFY_BATCH_MAX_HASHES=1000,
+        VERIFY_BATCH_CHUNK_SIZE=100,
+        VERIFICATION_CACHE_SIZE=10000,
+        VERIFICATION_NEGATIVE_TTL=30,
+        VERIFY_POSITIVE_MAX_AGE=31536000,
+        VERIFY_NEGATIVE_MAX_AGE=30,
+        NETWORKS_MAX_AGE=86400,
+        CERTIFICATE_CACHE_SIZE=256,
+        CERTIFICATE_CACHE_MAX_BYTES=64 * 1024 * 1024,
+        CERTIFICATE_BATCH_MAX=1000,
+        CERTIFICATE_BATCH_WORKERS=2,
+        ASSETS_MAX_AGE=31536000,
+        COMPRESS_MIN_SIZE=1024,
+        COMPRESS_LEVEL=6,
+        COMPRESS_BROTLI_QUALITY=5,
+        RPC_MAX_CONCURRENCY=8,
+        RPC_MAX_QUEUE=32,
+        RPC_QUEUE_TIMEOUT=2,
+        RPC_RETRY_AFTER=5,
+        RPC_REQUEST_TIMEOUT=10,
+        RPC_REQUEST_DEADLINE=15,
+        RPC_REGISTER_DEADLINE=180,
     )
     
     if test_config is None:
@@ -38,8 +64,26 @@ def create_app(test_config=None):
     except OSError:
         pass
     
+    # Share the verification and certificate caches between all requests
+    app.extensions['proveit_verification_cache'] = VerificationCache(
+        maxsize=app.config['VERIFICATION_CACHE_SIZE'],
+        negative_ttl=app.config['VERIFICATION_NEGATIVE_TTL']
+    )
+    app.extensions['proveit_certificate_cache'] = CertificateCache(
+        maxsize=app.config['CERTIFICATE_CACHE_SIZE'],
+        max_bytes=app.config['CERTIFICATE_CACHE_MAX_BYTES']
+    )
+    app.extensions['proveit_provers'] = {}
+    app.extensions['proveit_provers_lock'] = threading.Lock()
+    app.extensions['proveit_render_pool'] = None
+    app.extensions['proveit_render_pool_lock'] = threading.Lock()
+    
     # Register blueprints
     from . import routes
     app.register_blueprint(routes.bp)
     
+    # Serve fingerprinted, precompressed static assets and compress large responses
+    from . import assets
+    assets.init_app(app)
+    
     return app
@@ -0,0 +1,240 @@
+"""
+Static asset and response compression support for the ProveIt web interface.
+
+This module serves static files under content-hashed URLs with far-future
+cache headers, precompresses them with gzip (and brotli, when installed) the
+first time they are requested, and compresses large HTML and JSON responses.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Dict, Optional, Tuple
+
+from flask import Blueprint, Response, abort, current_app, request, url_for
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Create blueprint
+bp = Blueprint('assets', __name__)
+
+# Content types compressed by the response compression hook
+COMPRESSIBLE_MIMETYPES = (
+    'text/html', 'text/css', 'text/plain', 'text/javascript',
+    'application/javascript', 'application/json', 'application/x-ndjson',
+    'image/svg+xml'
+)
+
+
+class StaticAssets:
+    """
+    Fingerprints and precompressed variants of the files in a static folder.
+    
+    Files are read, fingerprinted and compressed once, on first use, and kept
+    in memory afterwards. A file is re-read when its modification time changes.
+    """
+    
+    def __init__(self, static_folder: str):
+        """
+        Initialize the asset store.
+        
+        Args:
+            static_folder: Directory containing the static files
+        """
+        self.static_folder = static_folder
+        self._assets: Dict[str, Tuple[int, str, Dict[str, bytes]]] = {}
+    
+    def fingerprint(self, filename: str) -> str:
+        """
+        Get the content fingerprint of a static file.
+        
+        Args:
+            filename: Path of the file relative to the static folder
+        
+        Returns:
+            The first 12 hexadecimal characters of the file's SHA-256 hash
+        """
+        return self._load(filename)[1]
+    
+    def variants(self, filename: str) -> Dict[str, bytes]:
+        """
+        Get the encoded variants of a static file.
+        
+        Args:
+            filename: Path of the file relative to the static folder
+        
+        Returns:
+            Mapping of content coding ('identity', 'gzip' and possibly 'br') to file content
+        """
+        return self._load(filename)[2]
+    
+    def _load(self, filename: str) -> Tuple[int, str, Dict[str, bytes]]:
+        path = safe_join(self.static_folder, filename)
+        
+        if path is None or not os.path.isfile(path):
+            raise FileNotFoundError(filename)
+        
+        mtime = os.stat(path).st_mtime_ns
+        asset = self._assets.get(filename)
+        
+        if asset is None or asset[0] != mtime:
+            with open(path, 'rb') as f:
+                content = f.read()
+            
+            variants = {'identity': content}
+            
+            if _is_compressible(mimetypes.guess_type(filename)[0]):
+                variants['gzip'] = gzip.compress(content, compresslevel=9, mtime=0)
+                if BROTLI_AVAILABLE:
+                    variants['br'] = brotli.compress(content, quality=11)
+            
+            asset = (mtime, hashlib.sha256(content).hexdigest()[:12], variants)
+            self._assets[filename] = asset
+        
+        return asset
+
+
+def asset_url(filename: str) -> str:
+    """
+    Build the content-hashed URL of a static file.
+    
+    Args:
+        filename: Path of the file relative to the static folder
+    
+    Returns:
+        URL whose path changes whenever the file content changes
+    """
+    assets = current_app.extensions['proveit_assets']
+    
+    try:
+        fingerprint = assets.fingerprint(filename)
+    except FileNotFoundError:
+        return url_for('static', filename=filename)
+    
+    return url_for('assets.fingerprinted', fingerprint=fingerprint, filename=filename)
+
+
+@bp.route('/assets/<fingerprint>/<path:filename>')
+def fingerprinted(fingerprint, filename):
+    """
+    Serve a static file under its content-hashed URL.
+    
+    The URL changes with the content, so a matching fingerprint is cached
+    forever. A stale fingerprint still gets the current file, with the same
+    short cache lifetime as a regular static file.
+    """
+    assets = current_app.extensions['proveit_assets']
+    
+    try:
+        current = assets.fingerprint(filename)
+        variants = assets.variants(filename)
+    except FileNotFoundError:
+        abort(404)
+    
+    encoding = _negotiate_encoding(variants)
+    
+    response = Response(
+        variants[encoding],
+        mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    )
+    response.vary.add('Accept-Encoding')
+    response.set_etag(f"{current}-{encoding}")
+    response.cache_control.public = True
+    
+    if encoding != 'identity':
+        response.content_encoding = encoding
+    
+    if fingerprint == current:
+        response.cache_control.max_age = current_app.config['ASSETS_MAX_AGE']
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.max_age = current_app.get_send_file_max_age(filename) or 0
+    
+    return response.make_conditional(request)
+
+
+def compress_response(response: Response) -> Response:
+    """
+    Compress a large text response if the client accepts it.
+    
+    Registered as an after_request hook. Streamed responses, files and
+    responses that are already encoded are left untouched.
+    
+    Args:
+        response: Response to compress
+    
+    Returns:
+        The (possibly compressed) response
+    """
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or response.content_encoding
+        or not _is_compressible(response.mimetype)
+    ):
+        return response
+    
+    data = response.get_data()
+    if len(data) < current_app.config['COMPRESS_MIN_SIZE']:
+        return response
+    
+    encoding = _negotiate_encoding({'br': None, 'gzip': None} if BROTLI_AVAILABLE else {'gzip': None})
+    if encoding == 'identity':
+        return response
+    
+    if encoding == 'br':
+        data = brotli.compress(data, quality=current_app.config['COMPRESS_BROTLI_QUALITY'])
+    else:
+        data = gzip.compress(data, compresslevel=current_app.config['COMPRESS_LEVEL'])
+    
+    response.set_data(data)
+    response.content_encoding = encoding
+    response.vary.add('Accept-Encoding')
+    
+    # The compressed body is no longer byte-identical to the one the ETag was computed for
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    
+    return response
+
+
+def init_app(app) -> None:
+    """
+    Set up fingerprinted static assets and response compression for an application.
+    
+    Args:
+        app: Flask application
+    """
+    app.extensions['proveit_assets'] = StaticAssets(app.static_folder)
+    app.add_template_global(asset_url)
+    app.register_blueprint(bp)
+    app.after_request(compress_response)
+
+
+def _negotiate_encoding(variants: Dict[str, Optional[bytes]]) -> str:
+    """
+    Pick the best content coding the client accepts.
+    
+    Args:
+        variants: Available content codings, other than identity
+    
+    Returns:
+        'br', 'gzip' or 'identity'
+    """
+    for encoding in ('br', 'gzip'):
+        if encoding in variants and request.accept_encodings[encoding]:
+            return encoding
+    
+    return 'identity'
+
+
+def _is_compressible(mimetype: Optional[str]) -> bool:
+    return mimetype is not None and (mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES)
@@ -4,23 +4,144 @@ Routes for the ProveIt web interface.
 This module defines the routes for the Flask web application.
 """
 
-import os
+import atexit
+import io
 import json
-import tempfile
+import multiprocessing
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from flask import (
-    Blueprint, flash, g, redirect, render_template, request,
+    Blueprint, Response, flash, g, redirect, render_template, request,
     session, url_for, jsonify, send_file, current_app
 )
-from werkzeug.utils import secure_filename
+from web3.exceptions import TimeExhausted
 
+from ..admission import AdmissionGate, RPCOverloadedError
+from ..blockchain import RPCDeadlineExceededError, parse_network, rpc_deadline
+from ..certificate import iter_certificates_zip, render_certificate
 from ..core import ProveIt
+from ..hash import Hash32, normalize_hash
 from ..models import NetworkType
 
 # Create blueprint
 bp = Blueprint('proveit', __name__)
 
+# Content types accepted and produced for newline-delimited JSON
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+
+def _get_prover(network):
+    """
+    Get the shared ProveIt instance for a network.
+    
+    Instances are created on first use and reuse the application's
+    verification cache. Each instance gets its own admission gate, which
+    limits the number of concurrent calls to that network's RPC endpoint.
+    Aliases of a network, such as "hardhat" and "localhost", share one
+    instance; an unknown network raises ValueError.
+    """
+    network = parse_network(network).value
+    provers = current_app.extensions['proveit_provers']
+    prover = provers.get(network)
+    if prover is not None:
+        return prover
+    
+    # Concurrent first requests must share one connector, and with it its nonce lock
+    with current_app.extensions['proveit_provers_lock']:
+        prover = provers.get(network)
+        if prover is not None:
+            return prover
+        
+        config = current_app.config
+        prover = ProveIt(
+            network=network,
+            cache=current_app.extensions['proveit_verification_cache'],
+            request_timeout=config['RPC_REQUEST_TIMEOUT'],
+            admission=AdmissionGate(
+                max_concurrent=config['RPC_MAX_CONCURRENCY'],
+                max_queue=config['RPC_MAX_QUEUE'],
+                queue_timeout=config['RPC_QUEUE_TIMEOUT'],
+                retry_after=config['RPC_RETRY_AFTER']
+            )
+        )
+        provers[network] = prover
+        return prover
+
+
+def _get_render_pool():
+    """
+    Get the pool of processes rendering certificate archives.
+    
+    The pool is shared by all requests of the serving process and created on
+    first use, so under gunicorn each worker gets its own after it has been
+    forked. Its processes stay up, and keep their certificate layout, until
+    the serving process exits. They are started by a fork server, or spawned
+    where there is none, rather than forked from the threaded server: a fork
+    would copy locks held by other request threads in their locked state.
+    """
+    pool = current_app.extensions['proveit_render_pool']
+    if pool is not None:
+        return pool
+    
+    with current_app.extensions['proveit_render_pool_lock']:
+        pool = current_app.extensions['proveit_render_pool']
+        if pool is None:
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            pool = ProcessPoolExecutor(
+                max_workers=current_app.config['CERTIFICATE_BATCH_WORKERS'],
+                mp_context=multiprocessing.get_context(start_method)
+            )
+            atexit.register(pool.shutdown, wait=False)
+            current_app.extensions['proveit_render_pool'] = pool
+        return pool
+
+
+def _rpc_error_response(error):
+    """
+    Build the response for an RPC call that was rejected or ran out of time.
+    
+    Overloaded networks get a fast 503 telling the client when to retry, and
+    calls cut off by their deadline get a 504.
+    """
+    response = jsonify({'error': str(error)})
+    
+    if isinstance(error, RPCOverloadedError):
+        response.status_code = 503
+        response.headers['Retry-After'] = str(error.retry_after)
+    else:
+        response.status_code = 504
+    
+    return response
+
+
+def _verify_entries(prover, hashes):
+    """
+    Verify a list of hashes, reporting invalid entries in place.
+    
+    Args:
+        prover: ProveIt instance to verify with
+        hashes: Hashes as received from the client
+    
+    Returns:
+        List of result dictionaries, in the same order as hashes
+    """
+    results = [None] * len(hashes)
+    valid_indexes = []
+    valid_hashes = []
+    
+    for index, file_hash in enumerate(hashes):
+        try:
+            valid_hashes.append(normalize_hash(file_hash))
+            valid_indexes.append(index)
+        except (ValueError, AttributeError):
+            results[index] = {'hash': file_hash, 'error': 'Invalid hash'}
+    
+    for index, result in zip(valid_indexes, prover.verify_hashes(valid_hashes)):
+        results[index] = result.to_dict()
+    
+    return results
+
 
 @bp.route('/')
 def index():
@@ -45,9 +166,14 @@ def hash_file():
     """
     Hash a file.
     
-    This endpoint accepts a file upload and returns the hash of the file.
+    This endpoint accepts a file upload and returns the hash of the file. The
+    web pages hash files in the browser and only fall back to this endpoint
+    when the browser cannot. Werkzeug parses the multipart body before the
+    view runs, keeping small uploads in memory and spooling larger ones to a
+    temporary file; the upload is then hashed in 1 MiB chunks rather than
+    read into memory at once.
     """
-    from ..hash import hash_file as hash_file_func
+    from ..hash import hash_stream
     
     # Check if a file was uploaded
     if 'file' not in request.files:
@@ -59,14 +185,9 @@ def hash_file():
     if file.filename == '':
         return jsonify({'error': 'Empty file'}), 400
     
-    # Save the file to a temporary location
-    temp_dir = tempfile.mkdtemp()
-    temp_path = os.path.join(temp_dir, secure_filename(file.filename))
-    file.save(temp_path)
-    
     try:
         # Hash the file
-        file_hash = hash_file_func(temp_path)
+        file_hash = hash_stream(file.stream, chunk_size=1024 * 1024)
         
         # Return the hash
         return jsonify({
@@ -75,10 +196,6 @@ def hash_file():
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        # Clean up the temporary file
-        os.unlink(temp_path)
-        os.rmdir(temp_dir)
 
 
 @bp.route('/api/register', methods=['POST'])
@@ -99,11 +216,12 @@ def register_hash():
     network = data.get('network', 'polygon')
     
     try:
-        # Initialize ProveIt
-        prover = ProveIt(network=network)
+        # Get the shared ProveIt instance for the network
+        prover = _get_prover(network)
         
         # Register the hash
-        result = prover.register_hash(file_hash, metadata)
+        with rpc_deadline(current_app.config['RPC_REGISTER_DEADLINE']):
+            result = prover.register_hash(file_hash, metadata)
         
         # Return the result
         return jsonify({
@@ -115,6 +233,9 @@ def register_hash():
             'network': result.network.value,
             'metadata': result.metadata
         })
+    except (RPCOverloadedError, RPCDeadlineExceededError, TimeExhausted) as e:
+        # A transaction not mined before the deadline is reported like the other deadline errors
+        return _rpc_error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -132,33 +253,159 @@ def verify_hash():
     if not data or 'hash' not in data:
         return jsonify({'error': 'No hash provided'}), 400
     
-    file_hash = data['hash']
-    network = data.get('network', 'polygon')
+    return _verification_response(data['hash'], data.get('network', 'polygon'))
+
+
+@bp.route('/api/verify/<file_hash>', methods=['GET'])
+def verify_hash_get(file_hash):
+    """
+    Verify a hash on the blockchain.
     
+    This is the cacheable form of /api/verify: the hash is part of the URL and
+    the network is taken from the ``network`` query parameter.
+    """
+    return _verification_response(file_hash, request.args.get('network', 'polygon'))
+
+
+def _verification_response(file_hash, network):
+    """
+    Verify a hash and build a response with HTTP caching headers.
+    
+    A registration can never be removed from the contract, so a positive
+    answer is marked immutable. A negative answer may change as soon as the
+    hash is registered and is only cached briefly.
+    """
     try:
-        # Initialize ProveIt
-        prover = ProveIt(network=network)
+        file_hash = normalize_hash(file_hash)
+    except (ValueError, AttributeError):
+        return jsonify({'error': 'Invalid hash'}), 400
+    
+    try:
+        # Get the shared ProveIt instance for the network
+        prover = _get_prover(network)
         
         # Verify the hash
-        result = prover.verify_hash(file_hash)
+        with rpc_deadline(current_app.config['RPC_REQUEST_DEADLINE']):
+            result = prover.verify_hash(file_hash)
+    except (RPCOverloadedError, RPCDeadlineExceededError) as e:
+        return _rpc_error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    # Return the result
+    if result.is_registered:
+        return _cached_json({
+            'is_registered': True,
+            'hash': result.hash,
+            'owner': result.owner,
+            'timestamp': result.timestamp.isoformat(),
+            'network': result.network.value,
+            'metadata': result.metadata
+        }, current_app.config['VERIFY_POSITIVE_MAX_AGE'], immutable=True)
+    else:
+        return _cached_json({
+            'is_registered': False,
+            'hash': result.hash
+        }, current_app.config['VERIFY_NEGATIVE_MAX_AGE'])
+
+
+def _cached_json(payload, max_age, immutable=False):
+    """
+    Create a JSON response that can be cached by browsers and CDNs.
+    
+    The response gets an ETag and a public Cache-Control header, and is turned
+    into a 304 Not Modified response when the request's conditional headers
+    match.
+    
+    Args:
+        payload: Data to serialize
+        max_age: Number of seconds the response may be cached
+        immutable: Whether the response will never change
+    
+    Returns:
+        Flask response
+    """
+    response = jsonify(payload)
+    response.add_etag()
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    
+    if immutable:
+        response.cache_control.immutable = True
+    
+    return response.make_conditional(request)
+
+
+@bp.route('/api/verify/batch', methods=['POST'])
+def verify_batch():
+    """
+    Verify many hashes on the blockchain.
+    
+    This endpoint accepts either a JSON object with a list of hashes or NDJSON
+    with one hash per line, and returns the verification results in the same
+    order. Results are streamed as NDJSON when the request body is NDJSON or
+    the client accepts NDJSON.
+    """
+    network = request.args.get('network', 'polygon')
+    ndjson_input = request.mimetype in NDJSON_MIMETYPES
+    
+    if ndjson_input:
+        hashes = []
+        for line in request.get_data(as_text=True).splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                entry = line
+            hashes.append(entry.get('hash') if isinstance(entry, dict) else entry)
+    else:
+        data = request.get_json(silent=True)
         
-        # Return the result
-        if result.is_registered:
-            return jsonify({
-                'is_registered': True,
-                'hash': result.hash,
-                'owner': result.owner,
-                'timestamp': result.timestamp.isoformat(),
-                'network': result.network.value,
-                'metadata': result.metadata
-            })
+        if isinstance(data, list):
+            hashes = data
+        elif isinstance(data, dict) and isinstance(data.get('hashes'), list):
+            hashes = data['hashes']
+            network = data.get('network', network)
         else:
-            return jsonify({
-                'is_registered': False,
-                'hash': result.hash
-            })
+            return jsonify({'error': 'No hashes provided'}), 400
+    
+    max_hashes = current_app.config['VERIFY_BATCH_MAX_HASHES']
+    if len(hashes) > max_hashes:
+        return jsonify({'error': f'Too many hashes (maximum is {max_hashes})'}), 413
+    
+    ndjson_output = ndjson_input or request.accept_mimetypes.best_match(
+        ['application/json', 'application/x-ndjson']
+    ) == 'application/x-ndjson'
+    
+    try:
+        # Get the shared ProveIt instance for the network
+        prover = _get_prover(network)
+        
+        if not ndjson_output:
+            with rpc_deadline(current_app.config['RPC_REQUEST_DEADLINE']):
+                return jsonify({'results': _verify_entries(prover, hashes)})
+    except (RPCOverloadedError, RPCDeadlineExceededError) as e:
+        return _rpc_error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+    
+    chunk_size = current_app.config['VERIFY_BATCH_CHUNK_SIZE']
+    deadline = current_app.config['RPC_REQUEST_DEADLINE']
+    
+    def generate():
+        # Stream the results of each chunk as soon as it has been verified
+        try:
+            for start in range(0, len(hashes), chunk_size):
+                with rpc_deadline(deadline):
+                    results = _verify_entries(prover, hashes[start:start + chunk_size])
+                for result in results:
+                    yield json.dumps(result) + '\n'
+        except Exception as e:
+            yield json.dumps({'error': str(e)}) + '\n'
+    
+    return Response(generate(), mimetype='application/x-ndjson')
 
 
 @bp.route('/api/certificate', methods=['POST'])
@@ -166,47 +413,137 @@ def generate_certificate():
     """
     Generate a certificate for a registered hash.
     
-    This endpoint accepts a hash and generates a certificate for it.
+    This endpoint accepts a hash, as JSON or as form fields, and generates a
+    certificate for it. Certificates are rendered in memory and cached, since
+    the registration they describe can never change.
     """
     # Get the request data
-    data = request.json
+    data = request.get_json(silent=True) or request.form.to_dict()
     
     if not data or 'hash' not in data:
         return jsonify({'error': 'No hash provided'}), 400
     
-    file_hash = data['hash']
     network = data.get('network', 'polygon')
-    file_name = data.get('filename')
-    format_type = data.get('format', 'pdf')
+    file_name = data.get('filename') or None
+    format_type = data.get('format', 'pdf').lower()
+    
+    if format_type not in ('pdf', 'json'):
+        return jsonify({'error': f'Unsupported certificate format: {format_type}'}), 400
     
     try:
-        # Initialize ProveIt
-        prover = ProveIt(network=network)
-        
-        # Generate the certificate
-        certificate = prover.generate_certificate(file_hash)
-        
-        if file_name:
-            certificate.file_name = file_name
-        
-        # Create a temporary file for the certificate
-        temp_dir = tempfile.mkdtemp()
-        temp_path = os.path.join(temp_dir, f"certificate.{format_type.lower()}")
+        file_hash = Hash32.from_hex(normalize_hash(data['hash']))
+    except (ValueError, AttributeError):
+        return jsonify({'error': 'Invalid hash'}), 400
+    
+    cache = current_app.extensions['proveit_certificate_cache']
+    cache_key = (network, file_hash, file_name, format_type)
+    
+    try:
+        content = cache.get(cache_key)
         
-        # Save the certificate
-        certificate.save(temp_path)
+        if content is None:
+            # Get the shared ProveIt instance for the network
+            prover = _get_prover(network)
+            
+            # Generate the certificate
+            with rpc_deadline(current_app.config['RPC_REQUEST_DEADLINE']):
+                certificate = prover.generate_certificate(file_hash)
+            
+            if file_name:
+                certificate.file_name = file_name
+            
+            # Render the certificate in memory
+            content = render_certificate(certificate, format_type)
+            
+            # Keep looking for the transaction next time if it could not be found
+            if certificate.tx_hash:
+                cache.put(cache_key, content)
         
-        # Send the file
+        # Send the certificate
         return send_file(
-            temp_path,
+            io.BytesIO(content),
             as_attachment=True,
-            download_name=f"proveit_certificate_{file_hash[:8]}.{format_type.lower()}",
-            mimetype='application/pdf' if format_type.lower() == 'pdf' else 'application/json'
+            download_name=f"proveit_certificate_{file_hash[:8]}.{format_type}",
+            mimetype='application/pdf' if format_type == 'pdf' else 'application/json'
         )
+    except (RPCOverloadedError, RPCDeadlineExceededError) as e:
+        return _rpc_error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@bp.route('/api/certificates', methods=['POST'])
+def generate_certificates():
+    """
+    Generate certificates for many registered hashes as a zip archive.
+    
+    This endpoint accepts a JSON object with either a list of hashes or a list
+    of {"hash", "filename"} objects. The certificates are rendered by a pool of
+    processes and streamed into the archive as they complete. Hashes that are
+    not registered are left out of the archive.
+    """
+    data = request.get_json(silent=True)
+    
+    if not isinstance(data, dict):
+        return jsonify({'error': 'No hashes provided'}), 400
+    
+    if isinstance(data.get('certificates'), list):
+        entries = [
+            (entry.get('hash'), entry.get('filename')) if isinstance(entry, dict) else (entry, None)
+            for entry in data['certificates']
+        ]
+    elif isinstance(data.get('hashes'), list):
+        entries = [(file_hash, None) for file_hash in data['hashes']]
+    else:
+        return jsonify({'error': 'No hashes provided'}), 400
+    
+    network = data.get('network', 'polygon')
+    format_type = str(data.get('format', 'pdf')).lower()
+    
+    if format_type not in ('pdf', 'json'):
+        return jsonify({'error': f'Unsupported certificate format: {format_type}'}), 400
+    
+    max_certificates = current_app.config['CERTIFICATE_BATCH_MAX']
+    if len(entries) > max_certificates:
+        return jsonify({'error': f'Too many certificates (maximum is {max_certificates})'}), 413
+    
+    try:
+        entries = [(normalize_hash(file_hash), file_name) for file_hash, file_name in entries]
+    except (ValueError, AttributeError):
+        return jsonify({'error': 'Invalid hash'}), 400
+    
+    try:
+        # Get the shared ProveIt instance for the network
+        prover = _get_prover(network)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    deadline = current_app.config['RPC_REQUEST_DEADLINE']
+    batch_size = current_app.config['VERIFY_BATCH_CHUNK_SIZE']
+    
+    def registered_certificates():
+        # Look up the registrations one batch at a time, each with its own deadline
+        for start in range(0, len(entries), batch_size):
+            with rpc_deadline(deadline):
+                batch = list(prover.generate_certificates(entries[start:start + batch_size], batch_size))
+            for _, certificate in batch:
+                if certificate is not None:
+                    yield certificate
+    
+    archive = iter_certificates_zip(
+        registered_certificates(),
+        format_type,
+        workers=current_app.config['CERTIFICATE_BATCH_WORKERS'],
+        executor=_get_render_pool()
+    )
+    
+    return Response(
+        archive,
+        mimetype='application/zip',
+        headers={'Content-Disposition': 'attachment; filename=proveit_certificates.zip'}
+    )
+
+
 @bp.route('/api/networks', methods=['GET'])
 def get_networks():
     """
@@ -215,4 +552,4 @@ def get_networks():
     This endpoint returns the list of available networks.
     """
     networks = [network.value for network in NetworkType]
-    return jsonify(networks)
+    return _cached_json(networks, current_app.config['NETWORKS_MAX_AGE'])
@@ -0,0 +1,150 @@
+"""
+Production server for the ProveIt web interface.
+
+This module runs the Flask application under gunicorn, a pure-Python
+pre-forking WSGI server, instead of the single-process Werkzeug development
+server used by `proveit serve`.
+"""
+
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..blockchain import parse_network
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:
+    GUNICORN_AVAILABLE = False
+
+
+def default_workers() -> int:
+    """
+    Get the default number of worker processes.
+    
+    Returns:
+        Twice the number of CPUs plus one, as recommended by gunicorn
+    """
+    return (os.cpu_count() or 1) * 2 + 1
+
+
+def warm_up(app, networks: Iterable[str]) -> None:
+    """
+    Create and connect the shared ProveIt instances for the given networks.
+    
+    This is run in every worker right after it has been forked, so the first
+    requests do not pay for building blockchain connectors or opening the
+    connection to the RPC endpoint.
+    
+    Args:
+        app: Flask application
+        networks: Networks to warm up
+    """
+    from .routes import _get_prover
+    
+    with app.app_context():
+        for network in networks:
+            prover = _get_prover(network)
+            # Open a keep-alive connection to the RPC endpoint
+            prover.blockchain.web3.is_connected()
+
+
+def run_production_server(app, bind: List[str], **options: Any) -> None:
+    """
+    Serve the application with gunicorn.
+    
+    The application is loaded once in the master process and forked into the
+    workers. Sending SIGHUP to the master reloads the workers gracefully and
+    SIGTERM shuts the server down after in-flight requests have completed.
+    
+    Args:
+        app: Flask application to serve
+        bind: Sockets to bind to, e.g. "0.0.0.0:8000" or "unix:/run/proveit.sock"
+        **options: Server settings, see build_production_server
+    
+    Raises:
+        ImportError: If gunicorn is not installed
+        ValueError: If one of the networks to warm up is not a known network
+    """
+    build_production_server(app, bind, **options).run()
+
+
+def build_production_server(
+    app,
+    bind: List[str],
+    workers: Optional[int] = None,
+    threads: int = 4,
+    keep_alive: int = 5,
+    timeout: int = 30,
+    graceful_timeout: int = 30,
+    warm_networks: Iterable[str] = (),
+    max_requests: int = 0
+) -> 'BaseApplication':
+    """
+    Configure a gunicorn application serving the Flask application.
+    
+    Args:
+        app: Flask application to serve
+        bind: Sockets to bind to, e.g. "0.0.0.0:8000" or "unix:/run/proveit.sock"
+        workers: Number of worker processes (default: twice the number of CPUs plus one)
+        threads: Number of threads per worker (default: 4)
+        keep_alive: Seconds to keep idle client connections open (default: 5)
+        timeout: Seconds a silent worker may take before it is restarted (default: 30)
+        graceful_timeout: Seconds workers get to finish requests on reload or shutdown (default: 30)
+        warm_networks: Networks whose connectors are created in each worker at startup
+        max_requests: Restart a worker after this many requests, 0 to disable (default: 0)
+    
+    Returns:
+        The gunicorn application, ready to run
+    
+    Raises:
+        ImportError: If gunicorn is not installed
+        ValueError: If one of the networks to warm up is not a known network
+    """
+    if not GUNICORN_AVAILABLE:
+        raise ImportError(
+            "gunicorn is required for the production server. "
+            "Install it with: pip install proveit[server]"
+        )
+    
+    # Fail once here rather than in every worker, which gunicorn would restart forever
+    warm_networks = list(warm_networks)
+    for network in warm_networks:
+        parse_network(network)
+    
+    def post_worker_init(worker):
+        warm_up(app, warm_networks)
+    
+    options = {
+        "bind": bind,
+        "workers": workers or default_workers(),
+        "threads": threads,
+        "worker_class": "gthread" if threads > 1 else "sync",
+        "keepalive": keep_alive,
+        "timeout": timeout,
+        "graceful_timeout": graceful_timeout,
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests // 10,
+        "preload_app": True,
+        "post_worker_init": post_worker_init,
+        "accesslog": "-",
+    }
+    
+    return _GunicornApplication(app, options)
+
+
+if GUNICORN_AVAILABLE:
+    class _GunicornApplication(BaseApplication):
+        """Gunicorn application serving an already created Flask application."""
+        
+        def __init__(self, app, options: Dict[str, Any]):
+            self.application = app
+            self.options = options
+            super().__init__()
+        
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return self.application
@@ -0,0 +1,99 @@
+/**
+ * ProveIt client-side file hashing.
+ *
+ * Files are hashed in the browser so they never have to be uploaded:
+ *   - small files are hashed in one call with WebCrypto,
+ *   - large files are hashed in chunks by a Web Worker (sha256-worker.js),
+ *   - only if neither is available is the file sent to /api/hash.
+ *
+ * Usage:
+ *   ProveItHashing.hashFile(file, (loaded, total) => { ... }).then(hash => { ... });
+ */
+
+(function() {
+    // Largest file hashed with a single WebCrypto call (it needs the whole file in memory)
+    const WEBCRYPTO_MAX_SIZE = 64 * 1024 * 1024;
+
+    // Largest file that may be uploaded to the server-side fallback
+    const UPLOAD_MAX_SIZE = 100 * 1024 * 1024;
+
+    const workerUrl = document.currentScript.dataset.workerUrl;
+
+    function toHex(buffer) {
+        return '0x' + Array.from(new Uint8Array(buffer))
+            .map(byte => byte.toString(16).padStart(2, '0'))
+            .join('');
+    }
+
+    function hashWithWebCrypto(file, onProgress) {
+        return file.arrayBuffer()
+            .then(buffer => crypto.subtle.digest('SHA-256', buffer))
+            .then(digest => {
+                onProgress(file.size, file.size);
+                return toHex(digest);
+            });
+    }
+
+    function hashWithWorker(file, onProgress) {
+        return new Promise((resolve, reject) => {
+            const worker = new Worker(workerUrl);
+
+            worker.onmessage = function(e) {
+                if (e.data.type === 'progress') {
+                    onProgress(e.data.loaded, e.data.total);
+                } else if (e.data.type === 'done') {
+                    worker.terminate();
+                    resolve(e.data.hash);
+                } else {
+                    worker.terminate();
+                    reject(new Error(e.data.message));
+                }
+            };
+            worker.onerror = function(e) {
+                worker.terminate();
+                reject(new Error(e.message || 'Hashing worker failed'));
+            };
+
+            worker.postMessage({ file: file });
+        });
+    }
+
+    function hashOnServer(file, onProgress) {
+        if (file.size > UPLOAD_MAX_SIZE) {
+            return Promise.reject(new Error('File is too large. Maximum size is 100MB.'));
+        }
+
+        const formData = new FormData();
+        formData.append('file', file);
+
+        return fetch('/api/hash', {
+            method: 'POST',
+            body: formData
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                throw new Error(data.error);
+            }
+            onProgress(file.size, file.size);
+            return data.hash;
+        });
+    }
+
+    function hashFile(file, onProgress) {
+        onProgress = onProgress || function() {};
+
+        const webCryptoAvailable = window.crypto && window.crypto.subtle && file.arrayBuffer;
+        const workerAvailable = window.Worker && workerUrl && file.arrayBuffer;
+
+        if (webCryptoAvailable && file.size <= WEBCRYPTO_MAX_SIZE) {
+            return hashWithWebCrypto(file, onProgress);
+        }
+        if (workerAvailable) {
+            return hashWithWorker(file, onProgress);
+        }
+        return hashOnServer(file, onProgress);
+    }
+
+    window.ProveItHashing = { hashFile: hashFile };
+})();
@@ -37,9 +37,15 @@ setup(
         "flask>=2.0.0",
         "requests>=2.27.0",
     ],
+    extras_require={
+        "server": [
+            "gunicorn>=20.1.0",
+            "brotli>=1.0.9",
+        ],
+    },
     entry_points={
         "console_scripts": [
-            "proveit=proveit.cli:main",
+            "proveit=proveit.daemon:run_cli",
         ],
     },
     include_package_data=True,